@@ -1,5 +1,4 @@
 import os
-import requests
 from io import BytesIO
 from pptx import Presentation
 from pptx.util import Inches, Pt
@@ -8,6 +7,7 @@ from pptx.dml.color import RGBColor
 
 from utils.logger import get_logger
 from utils.config import Config
+from tools.image_download import download_images
 
 logger = get_logger(__name__)
 
@@ -15,9 +15,14 @@ def create_presentation_service(slides_data, font_name="Calibri", output_path="o
     """
     Create a PowerPoint presentation from slide data.
     Refactored from utils/ppt_utils.py into this service.
+
+    All slide images are fetched concurrently up front (tools/image_download.py;
+    local image store first), so the slide loop itself does no network I/O.
     """
     logger.info(f"Creating presentation at {output_path} with {len(slides_data)} slides.")
-    
+
+    images = download_images(slide_data.get('image_url') for slide_data in slides_data)
+
     prs = Presentation()
 
     # Helper to set font
@@ -113,17 +118,16 @@ def create_presentation_service(slides_data, font_name="Calibri", output_path="o
             # Image
             if image_url:
                 try:
-                    # Add User-Agent to avoid 403 Forbidden
-                    headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'}
-                    response = requests.get(image_url, headers=headers, timeout=10)
-                    
-                    if response.status_code == 200:
-                        image_stream = BytesIO(response.content)
+                    image_data = images.get(image_url)
+                    if image_data:
+                        # Stored images come back as read-only mmaps, already file-like
+                        image_stream = BytesIO(image_data) if isinstance(image_data, bytes) else image_data
+                        image_stream.seek(0)
                         # Position: Left=5.8 inches, Top=1.8 inches, Width=3.8 inches
                         shapes.add_picture(image_stream, Inches(5.8), Inches(1.8), width=Inches(3.8))
                         logger.debug(f"Added image to slide: {slide_data['title']}")
                     else:
-                        logger.warning(f"Image download failed code {response.status_code} for {image_url}")
+                        logger.warning(f"No image downloaded for {image_url}")
                 except Exception as e:
                     logger.error(f"Failed to add image to slide: {e}")
         
@@ -137,3 +141,7 @@ def create_presentation_service(slides_data, font_name="Calibri", output_path="o
     except Exception as e:
         logger.error(f"Failed to save PPTX file: {e}", exc_info=True)
         return ""
+    finally:
+        for image_data in images.values():
+            if not isinstance(image_data, bytes):
+                image_data.close()
@@ -1,9 +1,48 @@
+from typing import Any, Dict, List
 from state import AgentState
-from agents.image.service import fetch_image_url, generate_image_keyword
+from agents.image.service import find_image_url, suggest_image_keyword
+from tools.image_download import store_image
+from tools.concurrency import run_concurrently
 from utils.logger import get_logger
+from utils.config import Config
 
 logger = get_logger(__name__)
 
+
+def _source_image(slide: Dict[str, Any]) -> Dict[str, Any]:
+    """Keyword → image URL for one slide; returns an updated copy."""
+    # Generate Keyword
+    keyword = suggest_image_keyword(slide['title'], slide['content'])
+    logger.info(f"Generated Keyword for '{slide['title']}': {keyword}")
+
+    # Fetch Image
+    url = find_image_url(keyword)
+
+    # Download it into the local image store now, overlapping with other slides'
+    # keyword calls, so the builder reads it from disk (no-op when already stored)
+    store_image(url)
+
+    # Update Slide
+    new_slide = slide.copy()
+    new_slide['image_keyword'] = keyword
+    new_slide['image_url'] = url
+    return new_slide
+
+
+def _source_images(slides: List[Dict[str, Any]], max_workers: int, timeout: float) -> List[Dict[str, Any]]:
+    """
+    Run _source_image for every slide concurrently, keeping slide order.
+
+    Each slide gets `timeout` seconds from the moment its work starts; slides
+    that fail or time out are returned unchanged.
+    """
+    sourced = run_concurrently(
+        {i: (lambda slide=slide: _source_image(slide)) for i, slide in enumerate(slides)},
+        max_workers=max_workers, timeout=timeout,
+        name="Image Agent", label=lambda i: slides[i].get('title'), thread_name_prefix="image",
+    )
+    return [sourced.get(i, slide) for i, slide in enumerate(slides)]
+
 def image_agent(state: AgentState):
     """
     Image Agent
@@ -20,6 +59,11 @@ def image_agent(state: AgentState):
     
     Input: AgentState (slide_content)
     Output: AgentState (slide_content with image_url)
+
+    Slides are processed concurrently (Config.IMAGE_MAX_WORKERS), each
+    bounded by Config.IMAGE_SLIDE_TIMEOUT, so the agent takes about as long
+    as the slowest slide. Output order matches input order. Images are
+    downloaded into the local image store as they are found.
     """
     logger.info("--- IMAGE AGENT STARTED ---")
     
@@ -29,25 +73,10 @@ def image_agent(state: AgentState):
         logger.warning("No slides to process in Image Agent.")
         return {"slide_content": []}
     
-    updated_slides = []
-    
-    for slide in slides:
-        try:
-            # Generate Keyword
-            keyword = generate_image_keyword(slide['title'], slide['content'])
-            logger.info(f"Generated Keyword for '{slide['title']}': {keyword}")
-            
-            # Fetch Image
-            url = fetch_image_url(keyword)
-            
-            # Update Slide
-            new_slide = slide.copy()
-            new_slide['image_keyword'] = keyword
-            new_slide['image_url'] = url
-            updated_slides.append(new_slide)
-            
-        except Exception as e:
-            logger.error(f"Image Agent Error for slide {slide.get('title')}: {e}", exc_info=True)
-            updated_slides.append(slide)
+    updated_slides = _source_images(
+        slides,
+        max_workers=min(Config.IMAGE_MAX_WORKERS, len(slides)),
+        timeout=Config.IMAGE_SLIDE_TIMEOUT,
+    )
 
     return {"slide_content": updated_slides}
@@ -1,4 +1,5 @@
 import requests
+from typing import Optional
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_groq import ChatGroq
 from langchain_core.output_parsers import StrOutputParser
@@ -7,49 +8,65 @@ from utils.logger import get_logger
 from utils.config import Config
 from tools.cache import disk_cache
 from tools.retry import api_retry
+from tools.circuit_breaker import get_breaker
+from tools.hedging import hedged
 
 logger = get_logger(__name__)
 
+
+def placeholder_image_url(query: str) -> str:
+    """Placeholder image showing `query`, used when no stock image is available."""
+    return f"https://dummyimage.com/600x400/cccccc/000000&text={query.replace(' ', '+')}"
+
+
 @disk_cache
 @api_retry
-def fetch_image_url(query: str) -> str:
+def fetch_image_url(query: str) -> Optional[str]:
     """
     Fetches an image URL from Unsplash based on the query.
-    Returns a placeholder image if API fails or no key provided.
-    Cached to prevent duplicate expensive calls.
+    Returns None if Unsplash has no match; raises on API errors.
+    Cached to prevent duplicate expensive calls (errors are not cached).
     """
     api_key = Config.UNSPLASH_ACCESS_KEY
     if not api_key:
-        logger.warning(f"No Unsplash API Key found. Returning placeholder for '{query}'.")
-        return f"https://dummyimage.com/600x400/cccccc/000000&text={query.replace(' ', '+')}"
+        raise ValueError("UNSPLASH_ACCESS_KEY is not set")
 
     url = f"https://api.unsplash.com/search/photos?page=1&query={query}&client_id={api_key}"
-    
+
+    with get_breaker("unsplash"):
+        response = hedged("unsplash", requests.get, url, timeout=5)
+        response.raise_for_status()
+
+    data = response.json()
+    if not data['results']:
+        logger.warning(f"No results found for '{query}'.")
+        return None
+    image_url = data['results'][0]['urls']['regular']
+    logger.info(f"Fetched image for '{query}': {image_url}")
+    return image_url
+
+
+def find_image_url(query: str) -> str:
+    """
+    Image URL for `query`, or a placeholder image if no API key is set,
+    Unsplash has no match, or the lookup fails. Placeholders are never cached.
+    """
+    if not Config.UNSPLASH_ACCESS_KEY:
+        logger.warning(f"No Unsplash API Key found. Returning placeholder for '{query}'.")
+        return placeholder_image_url(query)
     try:
-        response = requests.get(url, timeout=5)
-        if response.status_code == 200:
-            data = response.json()
-            if data['results']:
-                image_url = data['results'][0]['urls']['regular']
-                logger.info(f"Fetched image for '{query}': {image_url}")
-                return image_url
-            else:
-                logger.warning(f"No results found for '{query}'.")
-        else:
-             logger.warning(f"Unsplash API Error: {response.status_code} - {response.text}")
-             
+        return fetch_image_url(query) or placeholder_image_url(query)
     except Exception as e:
         logger.error(f"Error fetching image: {e}")
+        return placeholder_image_url(query)
 
-    # Fallback
-    return f"https://dummyimage.com/600x400/cccccc/000000&text={query.replace(' ', '+')}"
 
 @disk_cache
 @api_retry
 def generate_image_keyword(title: str, content: str) -> str:
     """
     Uses LLM to generate a search keyword for the slide.
-    Cached.
+    Cached; errors are raised, not cached.
     """
     llm = ChatGroq(model=Config.LLM_MODEL, temperature=0.5)
 
@@ -63,12 +80,18 @@ def generate_image_keyword(title: str, content: str) -> str:
         Slide Content: {content}
         """
     )
-    
+
     chain = prompt | llm | StrOutputParser()
-    
-    try:
+
+    with get_breaker("groq"):
         keyword = chain.invoke({"title": title, "content": content})
-        return keyword.strip()
+    return keyword.strip()
+
+
+def suggest_image_keyword(title: str, content: str) -> str:
+    """Image search keyword for a slide, falling back to its title if generation fails."""
+    try:
+        return generate_image_keyword(title, content)
     except Exception as e:
         logger.error(f"Error generating keyword: {e}")
         return title # Fallback to title
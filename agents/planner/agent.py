@@ -1,5 +1,5 @@
 from state import AgentState
-from agents.planner.service import generate_outline_service
+from agents.planner.service import plan_outline_service
 from utils.logger import get_logger
 from utils.config import Config
 
@@ -31,6 +31,6 @@ def planner_agent(state: AgentState):
         logger.error("No topic provided.")
         return {"presentation_outline": []}
 
-    outline = generate_outline_service(topic, count, depth)
+    outline = plan_outline_service(topic, count, depth)
     
     return {"presentation_outline": outline}
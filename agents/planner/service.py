@@ -7,6 +7,9 @@ from utils.logger import get_logger
 from utils.config import Config
 from tools.cache import disk_cache
 from tools.retry import api_retry
+from tools.circuit_breaker import get_breaker
+from tools.llm_cache import discard_on_error
+from agents.planner.topic_index import get_topic_index
 
 logger = get_logger(__name__)
 
@@ -16,6 +19,9 @@ def generate_outline_service(topic: str, count: int, depth: str):
     """
     Core logic to generate a presentation outline using LLM.
     Uses caching and automatic retries for resilience.
+
+    Errors are raised, not cached: `plan_outline_service` turns them into
+    the Error outline, so a failed call is retried on the next request.
     """
     logger.info(f"Generating outline for topic: '{topic}' with {count} slides.")
     
@@ -37,22 +43,45 @@ def generate_outline_service(topic: str, count: int, depth: str):
 
     chain = prompt | llm | parser
 
-    try:
+    with get_breaker("groq"), discard_on_error():
         response = chain.invoke({
             "topic": topic,
             "count": count,
             "depth": depth,
             "format_instructions": parser.get_format_instructions()
         })
-        
-        # Normalize output if nested
-        outline = response.get('outline', response) if isinstance(response, dict) else response
-        logger.info(f"Successfully generated {len(outline)} slides.")
-        return outline
 
+    # Normalize output if nested
+    outline = response.get('outline', response) if isinstance(response, dict) else response
+    logger.info(f"Successfully generated {len(outline)} slides.")
+    return outline
+
+
+def plan_outline_service(topic: str, count: int, depth: str):
+    """
+    Generate an outline, reusing the cached outline of an equivalent topic.
+
+    The topic is first resolved through the topic index (normalized match,
+    plus near-duplicate match when TOPIC_SIMILARITY_ENABLED), so variants of
+    an already-planned topic hit `generate_outline_service`'s cache.
+
+    If generation fails (after retries, or with the circuit open), a
+    single-slide Error outline is returned; it is never cached.
+    """
+    index = get_topic_index()
+    cached_topic = index.lookup(topic, count, depth)
+    if cached_topic and cached_topic != topic:
+        logger.info(f"Reusing cached outline for '{cached_topic}' (requested '{topic}').")
+
+    try:
+        outline = generate_outline_service(cached_topic or topic, count, depth)
     except Exception as e:
         logger.error(f"Planner Service Error: {e}", exc_info=True)
         # Return structured error fallback
         return [
             {"title": "Error", "description": "Failed to generate outline due to an internal error."}
         ]
+
+    if outline and not cached_topic:
+        index.add(topic, count, depth)
+    return outline
@@ -0,0 +1,119 @@
+"""
+Topic Index
+-----------
+Maps incoming topics onto topics that already have a cached outline, so
+"AI in Healthcare", "ai in healthcare " and "Artificial Intelligence in
+Healthcare" reuse one `generate_outline_service` cache entry instead of
+each paying for an LLM call.
+
+Two lookups, in order:
+  1. Exact match on the normalized topic (case folding, acronym expansion,
+     stop-word stripping, stemming) — always on.
+  2. TF-IDF cosine similarity over all cached topics with the same slide
+     count and depth — only when Config.TOPIC_SIMILARITY_ENABLED, and only
+     above Config.TOPIC_SIMILARITY_THRESHOLD.
+
+Known topics are appended to `<CACHE_DIR>/topic_index.jsonl`, so the index
+is shared by every process using the same cache directory.
+"""
+import os
+import json
+import threading
+from typing import Dict, List, Optional
+from utils.logger import get_logger
+from utils.config import Config
+from tools.text_similarity import tokenize, TfidfIndex
+
+logger = get_logger(__name__)
+
+INDEX_FILENAME = "topic_index.jsonl"
+
+
+class TopicIndex:
+    """File-backed index of topics with cached outlines."""
+
+    def __init__(self, path: str = None):
+        self.path = path or os.path.join(Config.CACHE_DIR, INDEX_FILENAME)
+        self._lock = threading.Lock()
+        self._entries: List[Dict] = []
+        self._by_normalized: Dict[tuple, str] = {}
+        self._tfidf: Optional[TfidfIndex] = None
+        self._mtime = None
+
+    def _reload(self) -> None:
+        """Re-read the index file if another process has appended to it."""
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return
+        if mtime == self._mtime:
+            return
+        entries = []
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    continue  # partially written line from a concurrent append
+        self._entries = entries
+        self._by_normalized = {}
+        for e in entries:
+            self._by_normalized.setdefault((e["normalized"], e["count"], e["depth"]), e["topic"])
+        self._tfidf = None
+        self._mtime = mtime
+
+    def lookup(self, topic: str, count: int, depth: str, similarity: bool = None) -> Optional[str]:
+        """
+        Return the cached topic equivalent to `topic`, or None.
+
+        Args:
+            similarity: Allow near matches (default: Config.TOPIC_SIMILARITY_ENABLED).
+        """
+        similarity = Config.TOPIC_SIMILARITY_ENABLED if similarity is None else similarity
+        tokens = tokenize(topic)
+        if not tokens:
+            return None
+        with self._lock:
+            self._reload()
+            exact = self._by_normalized.get((" ".join(tokens), count, depth))
+            if exact is not None or not similarity or not self._entries:
+                return exact
+
+            if self._tfidf is None:
+                self._tfidf = TfidfIndex(e["normalized"].split() for e in self._entries)
+            scores = self._tfidf.similarities(tokens)
+            for i, e in enumerate(self._entries):
+                if e["count"] != count or e["depth"] != depth:
+                    scores[i] = -1.0
+            best = int(scores.argmax())
+            if scores[best] >= Config.TOPIC_SIMILARITY_THRESHOLD:
+                match = self._entries[best]["topic"]
+                logger.info(f"Topic '{topic}' matched cached topic '{match}' (similarity {scores[best]:.2f}).")
+                return match
+        return None
+
+    def add(self, topic: str, count: int, depth: str) -> None:
+        """Record that an outline for `topic` is now cached."""
+        normalized = " ".join(tokenize(topic))
+        if not normalized:
+            return
+        with self._lock:
+            self._reload()
+            if (normalized, count, depth) in self._by_normalized:
+                return
+            entry = {"topic": topic, "normalized": normalized, "count": count, "depth": depth}
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            # One short O_APPEND write per line keeps concurrent appends intact
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+
+
+_index = None
+
+
+def get_topic_index() -> TopicIndex:
+    """Return the process-wide topic index."""
+    global _index
+    if _index is None:
+        _index = TopicIndex()
+    return _index
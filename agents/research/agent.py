@@ -11,12 +11,17 @@ Does NOT:
 - Fetch images.
 - Build PPT files.
 
-Input: AgentState (presentation_outline)
+Input: AgentState (presentation_outline, topic_research)
 Output: AgentState (research_notes)
+
+`topic_prefetch_agent` runs in parallel with PlannerAgent in the
+speculative graph (Config.SPECULATIVE_RESEARCH): it needs only the topic,
+and its topic-level results (topic_research) are reused by research_agent.
 """
 from state import AgentState
-from agents.research.service import research_slides_service
+from agents.research.service import research_slides_service, prefetch_topic_research
 from utils.logger import get_logger
+from utils.config import Config
 from utils.error_handler import handle_agent_error
 
 logger = get_logger(__name__)
@@ -32,7 +37,7 @@ def research_agent(state: AgentState):
         return {"research_notes": {}}
 
     try:
-        notes = research_slides_service(outline)
+        notes = research_slides_service(outline, topic=state.get("topic"), prefetched=state.get("topic_research"))
         logger.info(f"ResearchAgent: Completed research for {len(notes)} slides.")
         return {"research_notes": notes}
     except Exception as exc:
@@ -41,3 +46,22 @@ def research_agent(state: AgentState):
             exc=exc,
             fallback_state={"research_notes": {}},
         )
+
+
+def topic_prefetch_agent(state: AgentState):
+    logger.info("--- TOPIC PREFETCH STARTED ---")
+
+    topic = state.get("topic", "")
+    if not topic or Config.RESEARCH_STRATEGY != "pooled":
+        return {"topic_research": None}
+
+    try:
+        found = prefetch_topic_research(topic)
+        logger.info(f"TopicPrefetch: {sum(len(s) for s in found.values())} snippets ready for ResearchAgent.")
+        return {"topic_research": found}
+    except Exception as exc:
+        return handle_agent_error(
+            agent_name="TopicPrefetch",
+            exc=exc,
+            fallback_state={"topic_research": None},
+        )
@@ -0,0 +1,90 @@
+"""
+Research Snippet Ranking
+------------------------
+Turns the raw search candidates for every slide into compact research
+notes:
+
+  1. Score each slide's candidates against its title + description with
+     BM25 (tools.text_similarity.bm25_scores); candidates with no overlap
+     are dropped when the slide has relevant ones.
+  2. Walk all candidates of the deck from most to least relevant, skipping
+     any whose TF-IDF cosine similarity to an already kept snippet (on any
+     slide) reaches Config.RESEARCH_DUPLICATE_THRESHOLD.
+  3. Keep the best Config.RESEARCH_SNIPPETS_PER_SLIDE per slide.
+
+Everything is a handful of NumPy matrix operations over a few dozen short
+snippets, so the cost is negligible next to the searches themselves.
+"""
+from typing import Dict, List
+from utils.config import Config
+from tools.text_similarity import tokenize, bm25_scores, TfidfIndex
+
+
+def coverage(queries: Dict[str, str], pool: List[str], min_similarity: float = None) -> Dict[str, int]:
+    """
+    Count, for each slide, the pooled snippets whose TF-IDF cosine similarity
+    to the slide's query is at least `min_similarity`
+    (default: Config.RESEARCH_COVERAGE_THRESHOLD).
+    """
+    threshold = Config.RESEARCH_COVERAGE_THRESHOLD if min_similarity is None else min_similarity
+    if not pool:
+        return {title: 0 for title in queries}
+    index = TfidfIndex(tokenize(s) for s in pool)
+    return {title: int((index.similarities(tokenize(query)) >= threshold).sum())
+            for title, query in queries.items()}
+
+
+def rank_snippets(
+    queries: Dict[str, str],
+    candidates: Dict[str, List[str]],
+    per_slide: int = None,
+    duplicate_threshold: float = None,
+) -> Dict[str, List[str]]:
+    """
+    Select the most relevant, non-duplicate snippets for each slide.
+
+    Args:
+        queries: {slide title: search query (title + description)}.
+        candidates: {slide title: raw snippets, in search-engine order}.
+        per_slide: Snippets kept per slide (default: Config.RESEARCH_SNIPPETS_PER_SLIDE).
+        duplicate_threshold: Cosine similarity at which two snippets count as
+            duplicates (default: Config.RESEARCH_DUPLICATE_THRESHOLD).
+
+    Returns:
+        {slide title: selected snippets, most relevant first} for every title in `queries`.
+    """
+    per_slide = per_slide or Config.RESEARCH_SNIPPETS_PER_SLIDE
+    threshold = Config.RESEARCH_DUPLICATE_THRESHOLD if duplicate_threshold is None else duplicate_threshold
+
+    # (relevance, slide order, engine rank, title, snippet) for every candidate in the deck
+    scored = []
+    for slide_pos, (title, query) in enumerate(queries.items()):
+        snippets = list(dict.fromkeys(s.strip() for s in candidates.get(title, []) if s and s.strip()))
+        if not snippets:
+            continue
+        scores = bm25_scores(tokenize(query), [tokenize(s) for s in snippets])
+        best = float(scores.max())
+        for rank, (snippet, score) in enumerate(zip(snippets, scores)):
+            if best > 0 and score <= 0:
+                continue  # irrelevant to this slide
+            # Normalize per slide so slides with short queries are not starved
+            relevance = float(score) / best if best > 0 else 0.0
+            scored.append((relevance, slide_pos, rank, title, snippet))
+
+    selected: Dict[str, List[str]] = {title: [] for title in queries}
+    if not scored:
+        return selected
+
+    scored.sort(key=lambda c: (-c[0], c[2], c[1]))
+    index = TfidfIndex(tokenize(c[4]) for c in scored)
+    similarity = index.pairwise()
+
+    kept: List[int] = []
+    for i, (_, _, _, title, _) in enumerate(scored):
+        if len(selected[title]) >= per_slide:
+            continue
+        if kept and similarity[i, kept].max() >= threshold:
+            continue
+        kept.append(i)
+        selected[title].append(scored[i][4])
+    return selected
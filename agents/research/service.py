@@ -3,28 +3,184 @@ Research Agent Service
 -----------------------
 Uses the web_search_tool to gather factual information about each slide topic.
 Result is a dict: {slide_title: "fact1\nfact2\n..."}
+
+Slide searches run concurrently (Config.RESEARCH_MAX_WORKERS) and each one
+is bounded by Config.WEB_SEARCH_TIMEOUT, so research takes roughly as long
+as one query. Slides whose search times out get empty notes. Each batch of
+searches also has one overall deadline (tools/concurrency.py), so searches
+queued behind hung ones cannot block the run.
+
+Each search fetches Config.RESEARCH_CANDIDATES snippets; agents/research/
+ranking.py keeps the most relevant, non-duplicate ones per slide.
+
+With the "pooled" strategy (Config.RESEARCH_STRATEGY, needs the deck topic)
+a few broad topic-level searches build a shared snippet pool, and only
+slides the pool covers thinly get a targeted search of their own — so a
+deck costs a small constant number of searches instead of one per slide.
+The pool is then distributed to slides by relevance; a slide only gets the
+pooled snippets that share terms with it. If the topic-level searches fail
+or find nothing, every slide gets its own search, as with "per_slide". The topic-level
+searches need nothing but the topic, so the speculative graph
+(Config.SPECULATIVE_RESEARCH) runs them via prefetch_topic_research()
+while the planner is still writing the outline, and passes the results in
+as `prefetched`.
+
+With Config.RESEARCH_FETCH_PAGES the top Config.RESEARCH_PAGES_PER_QUERY
+result pages of every search are also downloaded concurrently
+(tools/page_fetcher.py) within one search timeout, and their
+Config.RESEARCH_PASSAGES_PER_PAGE most relevant passages join the candidates, so slides get real paragraphs
+instead of one-line teasers.
 """
-from typing import List, Dict, Any
+from typing import Callable, List, Dict, Any
 from utils.logger import get_logger
-from tools.web_search_tool import web_search_formatted
+from utils.config import Config
+from tools.web_search_tool import web_search, web_search_results
+from tools.page_fetcher import fetch_pages
+from tools.local_corpus import split_passages
+from tools.concurrency import run_concurrently
+from tools.text_similarity import tokenize, bm25_scores
+from agents.research.ranking import rank_snippets, coverage
 
 logger = get_logger(__name__)
 
+# Broad searches run once per deck by the pooled strategy
+TOPIC_QUERY_TEMPLATES = ("{topic}", "{topic} key facts and statistics")
+
+
+def _run_searches(queries: Dict[str, str], max_workers: int, timeout: float,
+                  search_fn: Callable = None) -> Dict[str, List[Any]]:
+    """
+    Run `search_fn` (default: web_search) for each {title: query} concurrently.
+
+    Each search gets `timeout` seconds from the moment it starts, and the
+    batch timeout x ceil(len(queries) / max_workers) seconds overall;
+    searches still running (or queued) after that are abandoned and left
+    out of the result.
+    """
+    search = search_fn or web_search
+    return run_concurrently(
+        {title: (lambda q=query: search(q, max_results=Config.RESEARCH_CANDIDATES))
+         for title, query in queries.items()},
+        max_workers=max_workers, timeout=timeout,
+        name="ResearchAgent: Search", thread_name_prefix="research",
+    )
+
 
-def research_slides_service(outline: List[Dict[str, Any]]) -> Dict[str, str]:
+def _best_passages(query: str, text: str, k: int) -> List[str]:
+    """The `k` passages of a fetched page with the highest BM25 score for `query`."""
+    passages = split_passages(text, max_chars=Config.RESEARCH_PASSAGE_CHARS)
+    if not passages:
+        return []
+    scores = bm25_scores(tokenize(query), [tokenize(p) for p in passages])
+    best = sorted(range(len(passages)), key=lambda i: -scores[i])[:k]
+    return [passages[i] for i in best if scores[i] > 0]
+
+
+def _search(queries: Dict[str, str], max_workers: int, timeout: float) -> Dict[str, List[str]]:
+    """
+    Candidate snippets for each {title: query}; in deep mode
+    (Config.RESEARCH_FETCH_PAGES) followed by passages from the top result pages.
+    """
+    if not Config.RESEARCH_FETCH_PAGES:
+        return _run_searches(queries, max_workers, timeout)
+
+    hits = _run_searches(queries, max_workers, timeout, search_fn=web_search_results)
+    top_urls = {title: [h["href"] for h in results if h.get("href")][:Config.RESEARCH_PAGES_PER_QUERY]
+                for title, results in hits.items()}
+    pages = fetch_pages([url for urls in top_urls.values() for url in urls], deadline=timeout)
+    logger.info(f"ResearchAgent: Fetched {sum(1 for t in pages.values() if t)}/{len(pages)} result pages.")
+
+    found: Dict[str, List[str]] = {}
+    for title, results in hits.items():
+        found[title] = [h["body"] for h in results]
+        for url in top_urls[title]:
+            found[title].extend(_best_passages(queries[title], pages.get(url, ""), Config.RESEARCH_PASSAGES_PER_PAGE))
+    return found
+
+
+def prefetch_topic_research(topic: str, max_workers: int = None, timeout: float = None) -> Dict[str, List[str]]:
     """
-    For each slide in the outline, perform a web search and collect
-    relevant factual snippets.
+    Run the pooled strategy's topic-level searches (TOPIC_QUERY_TEMPLATES).
+
+    Needs only the topic, so it can run before the outline exists.
+
+    Returns:
+        {query: candidate snippets} for the searches that completed.
+    """
+    max_workers = max_workers or Config.RESEARCH_MAX_WORKERS
+    timeout = Config.WEB_SEARCH_TIMEOUT if timeout is None else timeout
+    topic_queries = {t.format(topic=topic): t.format(topic=topic) for t in TOPIC_QUERY_TEMPLATES}
+    return _search(topic_queries, min(max_workers, len(topic_queries)), timeout)
+
+
+def _relevant(query: str, snippets: List[str]) -> List[str]:
+    """The snippets with a positive BM25 score for `query`."""
+    if not snippets:
+        return []
+    scores = bm25_scores(tokenize(query), [tokenize(s) for s in snippets])
+    return [s for s, score in zip(snippets, scores) if score > 0]
+
+
+def _pooled_candidates(topic: str, queries: Dict[str, str], max_workers: int, timeout: float,
+                       prefetched: Dict[str, List[str]] = None) -> Dict[str, List[str]]:
+    """
+    Topic-level searches plus targeted searches for thinly covered slides.
+
+    `prefetched` (from prefetch_topic_research) replaces the topic-level searches.
+
+    Returns:
+        {slide title: candidate snippets} — the pooled snippets relevant to
+        the slide, followed by its own targeted results when it had any. If
+        the pool is empty (the topic-level searches failed or found
+        nothing), every slide's own search results instead.
+    """
+    if prefetched is None:
+        found = prefetch_topic_research(topic, max_workers, timeout)
+        topic_searches = len(TOPIC_QUERY_TEMPLATES)
+    else:
+        found, topic_searches = prefetched, 0
+    pool = list(dict.fromkeys(s for snippets in found.values() for s in snippets))
+    if not pool:
+        logger.warning("ResearchAgent: Topic-level searches found nothing; searching every slide.")
+        return _search(queries, min(max_workers, len(queries)), timeout)
+
+    counts = coverage(queries, pool)
+    thin = sorted((t for t in queries if counts[t] < Config.RESEARCH_MIN_COVERAGE), key=lambda t: counts[t])
+    targeted_queries = {t: queries[t] for t in thin[:Config.RESEARCH_MAX_TARGETED_SEARCHES]}
+    targeted = {}
+    if targeted_queries:
+        logger.info(f"ResearchAgent: Targeted searches for thinly covered slides: {list(targeted_queries)}")
+        targeted = _search(targeted_queries, min(max_workers, len(targeted_queries)), timeout)
+
+    logger.info(
+        f"ResearchAgent: {topic_searches + len(targeted_queries)} searches for {len(queries)} slides "
+        f"(pool of {len(pool)} snippets{', prefetched' if prefetched is not None else ''})."
+    )
+    return {title: _relevant(query, pool) + targeted.get(title, []) for title, query in queries.items()}
+
+
+def research_slides_service(outline: List[Dict[str, Any]], topic: str = None, max_workers: int = None,
+                            timeout: float = None, prefetched: Dict[str, List[str]] = None) -> Dict[str, str]:
+    """
+    Collect relevant factual snippets for each slide in the outline.
 
     Args:
         outline: List of dicts with 'title' and 'description' keys.
+        topic: Deck topic; enables the pooled strategy when Config.RESEARCH_STRATEGY
+            is "pooled". Without it every slide gets its own search.
+        max_workers: Concurrent searches (default: Config.RESEARCH_MAX_WORKERS).
+        timeout: Seconds allowed per search (default: Config.WEB_SEARCH_TIMEOUT).
+        prefetched: Results of prefetch_topic_research(topic), reused instead of
+            repeating the topic-level searches (pooled strategy only).
 
     Returns:
         Dict mapping slide title → newline-separated fact strings.
-        Empty string value if search returned no results for that slide.
+        Empty string value if search returned no results (or timed out) for that slide.
     """
-    research_notes: Dict[str, str] = {}
+    max_workers = max_workers or Config.RESEARCH_MAX_WORKERS
+    timeout = Config.WEB_SEARCH_TIMEOUT if timeout is None else timeout
 
+    queries: Dict[str, str] = {}
     for slide in outline:
         title = slide.get("title", "")
         description = slide.get("description", "")
@@ -32,10 +188,22 @@ def research_slides_service(outline: List[Dict[str, Any]]) -> Dict[str, str]:
 
         if not query:
             continue
+        queries[title] = query
 
-        logger.info(f"ResearchAgent: Searching for '{query}'")
-        facts = web_search_formatted(query, max_results=3)
+    if not queries:
+        return {}
 
+    if topic and Config.RESEARCH_STRATEGY == "pooled":
+        found = _pooled_candidates(topic, queries, max_workers, timeout, prefetched)
+    else:
+        for query in queries.values():
+            logger.info(f"ResearchAgent: Searching for '{query}'")
+        found = _search(queries, min(max_workers, len(queries)), timeout)
+    selected = rank_snippets(queries, found)
+
+    research_notes: Dict[str, str] = {}
+    for title in queries:
+        facts = "\n".join(f"- {s}" for s in selected[title])
         if facts:
             research_notes[title] = facts
             logger.info(f"ResearchAgent: Found {len(facts.splitlines())} snippets for '{title}'")
@@ -31,6 +31,10 @@ def writer_agent(state: AgentState):
         logger.warning("No outline provided to Writer Agent.")
         return {"slide_content": []}
 
-    slides = write_content_service(outline, depth, research_notes)
+    try:
+        slides = write_content_service(outline, depth, research_notes)
+    except Exception as e:
+        logger.error(f"Writer Service Error: {e}", exc_info=True)
+        slides = []
 
     return {"slide_content": slides}
@@ -8,6 +8,8 @@ from utils.logger import get_logger
 from utils.config import Config
 from tools.cache import disk_cache
 from tools.retry import api_retry
+from tools.circuit_breaker import get_breaker
+from tools.llm_cache import discard_on_error
 
 logger = get_logger(__name__)
 
@@ -23,6 +25,8 @@ def write_content_service(
     If research_notes are provided, they are injected into the prompt
     so the LLM can reference real-world facts rather than relying solely
     on its training data.
+
+    Errors are raised, not cached; `writer_agent` falls back to no slides.
     """
     logger.info("Writing content for slides...")
 
@@ -58,7 +62,7 @@ def write_content_service(
             research_lines.append(f"[{title}]\n{facts}")
     research_context = "\n\n".join(research_lines) if research_lines else "No additional research available."
 
-    try:
+    with get_breaker("groq"), discard_on_error():
         response = chain.invoke({
             "outline": str(outline),
             "depth": depth,
@@ -66,21 +70,17 @@ def write_content_service(
             "format_instructions": parser.get_format_instructions()
         })
 
-        slides = response.get('slides', response) if isinstance(response, dict) else response
-
-        # Convert to internal state format (add missing fields for next steps)
-        final_slides = []
-        for s in slides:
-            final_slides.append({
-                "title": s['title'],
-                "content": s['content'],
-                "image_keyword": None,
-                "image_url": None
-            })
+    slides = response.get('slides', response) if isinstance(response, dict) else response
 
-        logger.info(f"Successfully wrote content for {len(final_slides)} slides.")
-        return final_slides
+    # Convert to internal state format (add missing fields for next steps)
+    final_slides = []
+    for s in slides:
+        final_slides.append({
+            "title": s['title'],
+            "content": s['content'],
+            "image_keyword": None,
+            "image_url": None
+        })
 
-    except Exception as e:
-        logger.error(f"Writer Service Error: {e}", exc_info=True)
-        return []
+    logger.info(f"Successfully wrote content for {len(final_slides)} slides.")
+    return final_slides
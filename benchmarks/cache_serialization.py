@@ -0,0 +1,90 @@
+"""
+Benchmark — cache serialization formats
+---------------------------------------
+Compares entry size and load time of the legacy raw-pickle cache format
+against JSON / msgpack with zlib / zstd compression, using payloads shaped
+like real cache entries (outline, writer output, image URL).
+
+Usage:
+    python benchmarks/cache_serialization.py
+    python benchmarks/cache_serialization.py --slides 20 --repeat 2000
+"""
+import argparse
+import os
+import pickle
+import sys
+import timeit
+from unittest.mock import patch
+
+# Allow running from project root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools import cache_serialization
+from tools.cache_serialization import encode_value, decode_value
+
+
+def sample_payloads(slides: int) -> dict:
+    outline = [
+        {"title": f"Slide {i}: Impact of AI on Clinical Diagnostics",
+         "description": "Explain how machine learning models assist radiologists and pathologists."}
+        for i in range(slides)
+    ]
+    writer_output = [
+        {"title": s["title"],
+         "content": "\n".join(
+             f"- Point {j}: AI-assisted triage reduces waiting times and improves accuracy in imaging workflows."
+             for j in range(6)
+         ),
+         "image_keyword": None,
+         "image_url": None}
+        for s in outline
+    ]
+    return {
+        "outline": outline,
+        "writer_output": writer_output,
+        "image_url": "https://images.unsplash.com/photo-1576091160550-2173dba999ef?w=1080",
+    }
+
+
+def formats():
+    yield "pickle (legacy)", None, None
+    for serializer in ("json", "msgpack"):
+        if serializer == "msgpack" and cache_serialization.msgpack is None:
+            continue
+        for compression in ("none", "zlib", "zstd"):
+            if compression == "zstd" and cache_serialization.zstandard is None:
+                continue
+            yield f"{serializer}+{compression}", serializer, compression
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cache serialization formats.")
+    parser.add_argument("--slides", type=int, default=10, help="Slides per sample deck (default: 10).")
+    parser.add_argument("--repeat", type=int, default=1000, help="Loads per measurement (default: 1000).")
+    args = parser.parse_args()
+
+    payloads = sample_payloads(args.slides)
+    print(f"{'payload':<15}{'format':<18}{'bytes':>9}{'vs pickle':>11}{'load µs':>10}")
+    print("-" * 63)
+    for name, value in payloads.items():
+        baseline = None
+        for label, serializer, compression in formats():
+            if serializer is None:
+                data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+                load = lambda: pickle.loads(data)
+            else:
+                with patch.object(cache_serialization.Config, "CACHE_SERIALIZER", serializer), \
+                     patch.object(cache_serialization.Config, "CACHE_COMPRESSION", compression):
+                    data = encode_value(value)
+                load = lambda: decode_value(data)
+            seconds = timeit.timeit(load, number=args.repeat)
+            baseline = baseline or len(data)
+            print(
+                f"{name:<15}{label:<18}{len(data):>9}{len(data) / baseline:>10.0%}"
+                f"{seconds / args.repeat * 1e6:>10.1f}"
+            )
+        print()
+
+
+if __name__ == "__main__":
+    main()
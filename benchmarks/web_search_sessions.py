@@ -0,0 +1,91 @@
+"""
+Benchmark — DDGS session reuse
+------------------------------
+Per-query latency of a fresh `DDGS()` client per query (the previous
+behaviour of tools/web_search_tool.py) against clients checked out of the
+shared SessionPool, which keep their HTTP sessions and TLS connections warm.
+
+Needs network access to DuckDuckGo's backends. Use --simulated to run
+offline with a stub client that charges a fixed setup cost per new session.
+
+Usage:
+    python benchmarks/web_search_sessions.py --queries 10
+    python benchmarks/web_search_sessions.py --simulated --setup-ms 150
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+# Allow running from project root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.session_pool import SessionPool
+
+QUERIES = [
+    "renewable energy storage", "machine learning in radiology", "history of the printing press",
+    "quantum computing basics", "electric vehicle batteries", "coral reef bleaching",
+    "supply chain resilience", "urban vertical farming", "cybersecurity zero trust", "space debris tracking",
+]
+
+
+class SimulatedDDGS:
+    """Stand-in client: `setup` seconds on first use (handshake), `query` seconds per search."""
+
+    def __init__(self, setup: float, query: float):
+        self.setup, self.query, self.warm = setup, query, False
+
+    def text(self, query, max_results=3):
+        time.sleep(self.query + (0 if self.warm else self.setup))
+        self.warm = True
+        return [{"body": query}] * max_results
+
+
+def run(label: str, search, queries) -> list:
+    latencies = []
+    for q in queries:
+        start = time.perf_counter()
+        search(q)
+        latencies.append(time.perf_counter() - start)
+    print(f"{label:<22} mean {1000 * statistics.mean(latencies):8.1f} ms   "
+          f"median {1000 * statistics.median(latencies):8.1f} ms   "
+          f"max {1000 * max(latencies):8.1f} ms")
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", type=int, default=10, help="Queries per variant (default: 10).")
+    parser.add_argument("--max-results", type=int, default=3)
+    parser.add_argument("--simulated", action="store_true", help="Use a stub client instead of the network.")
+    parser.add_argument("--setup-ms", type=float, default=150, help="Simulated session setup cost.")
+    parser.add_argument("--query-ms", type=float, default=80, help="Simulated per-query cost.")
+    args = parser.parse_args()
+
+    queries = [QUERIES[i % len(QUERIES)] for i in range(args.queries)]
+    if args.simulated:
+        def factory():
+            return SimulatedDDGS(args.setup_ms / 1000, args.query_ms / 1000)
+    else:
+        from ddgs import DDGS
+
+        def factory():
+            return DDGS(timeout=10)
+
+    print(f"\n{len(queries)} queries, max_results={args.max_results}"
+          f"{' (simulated)' if args.simulated else ''}\n")
+    fresh = run("new client per query", lambda q: factory().text(q, max_results=args.max_results), queries)
+    pool = SessionPool("benchmark", factory, size=1)
+
+    def pooled_search(q):
+        with pool.session() as client:
+            return client.text(q, max_results=args.max_results)
+
+    pooled = run("pooled session", pooled_search, queries)
+    print(f"\nPooled sessions: {100 * (1 - statistics.mean(pooled) / statistics.mean(fresh)):.0f}% "
+          f"lower mean per-query latency.\n")
+
+
+if __name__ == "__main__":
+    main()
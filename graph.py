@@ -1,13 +1,23 @@
-from langgraph.graph import StateGraph, END
+from langgraph.graph import StateGraph, START, END
 from state import AgentState
+from utils.config import Config
 from agents.planner.agent import planner_agent
-from agents.research.agent import research_agent
+from agents.research.agent import research_agent, topic_prefetch_agent
 from agents.writer.agent import writer_agent
 from agents.image.agent import image_agent
 from agents.builder.agent import builder_agent
 
 
-def build_graph():
+def build_graph(speculative_research: bool = None):
+    """
+    Compile the 5-agent pipeline.
+
+    With `speculative_research` (default: Config.SPECULATIVE_RESEARCH) the
+    topic-level research searches start alongside the planner instead of
+    after it; research waits for both and reuses the prefetched results.
+    """
+    if speculative_research is None:
+        speculative_research = Config.SPECULATIVE_RESEARCH
     workflow = StateGraph(AgentState)
 
     # Add Nodes
@@ -18,8 +28,14 @@ def build_graph():
     workflow.add_node("ppt_builder", builder_agent)
 
     # Add Edges — 5-agent pipeline
-    workflow.set_entry_point("planner")
-    workflow.add_edge("planner", "research")
+    if speculative_research:
+        workflow.add_node("topic_prefetch", topic_prefetch_agent)
+        workflow.add_edge(START, "planner")
+        workflow.add_edge(START, "topic_prefetch")
+        workflow.add_edge(["planner", "topic_prefetch"], "research")
+    else:
+        workflow.set_entry_point("planner")
+        workflow.add_edge("planner", "research")
     workflow.add_edge("research", "writer")
     workflow.add_edge("writer", "image_agent")
     workflow.add_edge("image_agent", "ppt_builder")
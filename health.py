@@ -0,0 +1,124 @@
+"""
+Health Check Endpoint
+---------------------
+Lightweight health report for the PPT Builder, including the state of the
+per-provider circuit breakers (tools/circuit_breaker.py). Can be run as a
+standalone FastAPI server or imported as a module.
+
+Breakers live in the pipeline processes (app.py, main.py, workers), which
+publish their transitions to `<CACHE_DIR>/circuit_state.json`; this report
+reads that file, so it needs the same CACHE_DIR as the pipeline.
+
+Endpoints:
+    GET /health   — Returns system health status
+
+Usage (standalone):
+    python health.py
+
+Usage (import):
+    from health import check_health
+    status = check_health()
+"""
+import os
+from datetime import datetime, timezone
+from typing import Dict, Any
+
+from utils.config import Config
+from utils.logger import get_logger
+from tools.circuit_breaker import breaker_states, shared_breaker_states, OPEN
+
+logger = get_logger(__name__)
+
+
+def check_health() -> Dict[str, Any]:
+    """
+    Check API keys, the output directory and the provider circuit breakers.
+
+    Returns:
+        dict: Health status report::
+
+            {
+                "status": "healthy" | "degraded" | "unhealthy",
+                "timestamp": "ISO 8601 timestamp",
+                "checks": {
+                    "api_keys": {"status": "ok", "details": "..."},
+                    "output_dir": {"status": "ok", "details": "..."},
+                    "circuits": {"status": "ok", "details": "...",
+                                 "breakers": {"groq": {"state": "closed", "failures": 0}, ...}},
+                }
+            }
+    """
+    checks = {}
+    overall_status = "healthy"
+
+    # ── Check 1: API Keys ────────────────────────────────────────────
+    if Config.GROQ_API_KEY:
+        checks["api_keys"] = {"status": "ok", "details": "GROQ_API_KEY is configured"}
+    else:
+        checks["api_keys"] = {"status": "warning", "details": "GROQ_API_KEY not set"}
+        overall_status = "degraded"
+
+    # ── Check 2: Output Directory ────────────────────────────────────
+    try:
+        os.makedirs(Config.OUTPUT_DIR, exist_ok=True)
+        test_file = os.path.join(Config.OUTPUT_DIR, ".health_check")
+        with open(test_file, "w") as f:
+            f.write("ok")
+        os.remove(test_file)
+        checks["output_dir"] = {"status": "ok", "details": f"{Config.OUTPUT_DIR} is writable"}
+    except Exception as e:
+        checks["output_dir"] = {"status": "error", "details": f"Output dir not writable: {e}"}
+        overall_status = "unhealthy"
+
+    # ── Check 3: Circuit Breakers ────────────────────────────────────
+    # Published by the pipeline processes; breakers of this process take precedence
+    breakers = {**shared_breaker_states(), **breaker_states()}
+    open_circuits = sorted(name for name, b in breakers.items() if b["state"] == OPEN)
+    if open_circuits:
+        checks["circuits"] = {
+            "status": "warning",
+            "details": f"Using fallbacks for: {', '.join(open_circuits)}",
+            "breakers": breakers,
+        }
+        if overall_status == "healthy":
+            overall_status = "degraded"
+    else:
+        checks["circuits"] = {"status": "ok", "details": "No open circuits", "breakers": breakers}
+
+    return {
+        "status": overall_status,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "checks": checks,
+    }
+
+
+# ── FastAPI Application ─────────────────────────────────────────────────
+
+try:
+    from fastapi import FastAPI
+    from fastapi.responses import JSONResponse
+
+    app = FastAPI(title="Agentic PPT Builder — Health")
+
+    @app.get("/health")
+    async def health_endpoint():
+        """Health check endpoint returning system and circuit-breaker status."""
+        result = check_health()
+        status_code = 200 if result["status"] == "healthy" else 503
+        return JSONResponse(content=result, status_code=status_code)
+
+except ImportError:
+    # FastAPI not installed — health check still works via check_health()
+    app = None
+
+
+# ── Standalone Runner ────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    if app:
+        import uvicorn
+        print("🏥 Starting Health Check Server → http://localhost:8080/health")
+        uvicorn.run(app, host="0.0.0.0", port=8080)
+    else:
+        import json
+        print(json.dumps(check_health(), indent=2))
@@ -6,10 +6,15 @@ Run the Agentic AI PPT Builder from the command line.
 Usage:
     python main.py --topic "Artificial Intelligence in Healthcare"
     python main.py --topic "Climate Change" --slides 8 --font Arial --depth Detailed
+    python main.py warm-cache --topics-file topics.txt --concurrency 4
+    python main.py cache stats
+    python main.py cache inspect generate_outline_service
+    python main.py index-corpus --corpus docs/
 """
 import argparse
 import os
 import sys
+import time
 
 # Allow running from project root
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -21,7 +26,7 @@ from orchestrator.agent_controller import run_pipeline
 logger = get_logger(__name__)
 
 
-def parse_args():
+def parse_args(argv=None):
     parser = argparse.ArgumentParser(
         description="🤖 Agentic AI PowerPoint Builder — CLI",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -29,6 +34,7 @@ def parse_args():
 Examples:
   python main.py --topic "Artificial Intelligence in Healthcare"
   python main.py --topic "Climate Change" --slides 8 --font Arial --depth Detailed
+  python main.py warm-cache --topics-file topics.txt
         """
     )
     parser.add_argument(
@@ -57,10 +63,243 @@ Examples:
         choices=["Minimal", "Concise", "Detailed"],
         help="Content depth per slide (default: Concise)."
     )
-    return parser.parse_args()
+    return parser.parse_args(argv)
+
+
+def parse_warm_cache_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="main.py warm-cache",
+        description="Pre-populate the cached planner, writer, keyword and image results for popular topics.",
+    )
+    parser.add_argument(
+        "--topics-file",
+        type=str,
+        required=True,
+        help="Text file with one topic per line ('#' starts a comment)."
+    )
+    parser.add_argument(
+        "--slides", "-s",
+        type=int,
+        default=Config.DEFAULT_SLIDE_COUNT,
+        help=f"Slides per outline; must match real requests to hit (default: {Config.DEFAULT_SLIDE_COUNT})."
+    )
+    parser.add_argument(
+        "--depth", "-d",
+        type=str,
+        default="Concise",
+        choices=["Minimal", "Concise", "Detailed"],
+        help="Content depth; must match real requests to hit (default: Concise)."
+    )
+    parser.add_argument(
+        "--concurrency", "-c",
+        type=int,
+        default=2,
+        help="Topics warmed in parallel (default: 2)."
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=30,
+        help="Maximum service calls per minute across all workers, 0 = unlimited (default: 30)."
+    )
+    parser.add_argument(
+        "--progress-file",
+        type=str,
+        default=None,
+        help="Progress file used to resume interrupted runs (default: <CACHE_DIR>/warm_progress.jsonl)."
+    )
+    return parser.parse_args(argv)
+
+
+def warm_cache_main(argv):
+    from orchestrator.cache_warmer import warm_topics, read_topics, DEFAULT_PROGRESS_FILE
+
+    args = parse_warm_cache_args(argv)
+
+    if not Config.GROQ_API_KEY:
+        print("❌ Error: GROQ_API_KEY is not set. Please add it to your .env file.")
+        sys.exit(1)
+
+    try:
+        topics = read_topics(args.topics_file)
+    except OSError as exc:
+        print(f"❌ Could not read topics file: {exc}\n")
+        sys.exit(1)
+
+    print(f"\n🔥 Warming cache for {len(topics)} topic(s) "
+          f"(slides={args.slides}, depth={args.depth}, concurrency={args.concurrency})\n")
+
+    report = warm_topics(
+        topics,
+        slide_count=args.slides,
+        depth=args.depth,
+        concurrency=args.concurrency,
+        requests_per_minute=args.rate,
+        progress_file=args.progress_file or DEFAULT_PROGRESS_FILE,
+    )
+
+    for entry in report["warmed"]:
+        print(f"  ✅ {entry['topic']} — {entry['slides']} slides, {entry['images']} images ({entry['seconds']}s)")
+    for topic in report["skipped"]:
+        print(f"  ⏭️  {topic} — already warmed")
+    for failure in report["failed"]:
+        print(f"  ❌ {failure['topic']} — {failure['error']}")
+    print(f"\nWarmed {len(report['warmed'])}, skipped {len(report['skipped'])}, "
+          f"failed {len(report['failed'])} in {report['seconds']}s.\n")
+
+    if report["failed"]:
+        sys.exit(1)
+
+
+def parse_cache_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="main.py cache",
+        description="Inspect cache usage: hit/miss/latency counters and stored entries.",
+    )
+    sub = parser.add_subparsers(dest="action", required=True)
+    stats_parser = sub.add_parser("stats", help="Per-function counters and storage totals.")
+    stats_parser.add_argument("--json", action="store_true", help="Print raw JSON.")
+    inspect_parser = sub.add_parser("inspect", help="Counters and stored entries for one function.")
+    inspect_parser.add_argument("func", type=str, help="Cached function name, e.g. generate_outline_service.")
+    inspect_parser.add_argument("--limit", type=int, default=20, help="Entries to list (default: 20).")
+    inspect_parser.add_argument("--json", action="store_true", help="Print raw JSON.")
+    llm_parser = sub.add_parser("llm", help="Tokens, dollars and latency saved by the LLM response cache.")
+    llm_parser.add_argument("--json", action="store_true", help="Print raw JSON.")
+    llm_parser.add_argument("--clear", action="store_true", help="Delete every stored LLM response.")
+    return parser.parse_args(argv)
+
+
+def cache_main(argv):
+    import json
+    from tools.cache import get_backend
+    from tools.cache_stats import load_persisted, summarize
+
+    args = parse_cache_args(argv)
+    if args.action == "llm":
+        from tools.llm_cache import PromptCache
+        llm_cache = PromptCache()
+        if args.clear:
+            entries = llm_cache.savings()["entries"]
+            llm_cache.clear()
+            print(f"Cleared {entries} LLM responses.")
+            return
+        savings = llm_cache.savings()
+        if args.json:
+            print(json.dumps(savings, indent=2))
+            return
+        print(f"\n🧠 LLM response cache: {savings['entries']} prompts stored, {savings['hits']} hits")
+        print(f"   Saved {savings['input_tokens_saved']} input + {savings['output_tokens_saved']} output tokens "
+              f"(~${savings['dollars_saved']:.4f}), {savings['seconds_saved']:.1f}s of model latency\n")
+        return
+
+    backend = get_backend()
+    counters = {name: summarize(c) for name, c in load_persisted().items()}
+    try:
+        storage = backend.stats()
+    except NotImplementedError:
+        storage = None
+
+    if args.action == "stats":
+        if args.json:
+            print(json.dumps({"backend": backend.name, "functions": counters, "storage": storage}, indent=2))
+            return
+        print(f"\n📦 Cache backend: {backend.name}")
+        if storage:
+            print(f"   Stored: {storage['entries']} entries, {storage['bytes'] / 1024:.1f} KiB")
+        if not counters:
+            print("\nNo cache traffic recorded yet.\n")
+            return
+        print(f"\n{'function':<32}{'hits':>7}{'misses':>8}{'errors':>8}{'hit%':>7}"
+              f"{'read KiB':>10}{'write KiB':>11}{'load ms':>9}{'store ms':>10}")
+        for name, c in sorted(counters.items()):
+            print(f"{name:<32}{c['hits']:>7}{c['misses']:>8}{c['errors']:>8}{c['hit_rate']:>7.0%}"
+                  f"{c['bytes_read'] / 1024:>10.1f}{c['bytes_written'] / 1024:>11.1f}"
+                  f"{c['avg_load_ms']:>9.1f}{c['avg_store_ms']:>10.1f}")
+        print()
+        return
+
+    # inspect
+    func_counters = counters.get(args.func)
+    func_storage = (storage or {}).get("functions", {}).get(args.func)
+    entries = backend.entries(args.func, args.limit) if hasattr(backend, "entries") else None
+    if args.json:
+        print(json.dumps({"function": args.func, "counters": func_counters,
+                          "storage": func_storage, "entries": entries}, indent=2))
+        return
+    print(f"\n🔍 {args.func} ({backend.name} backend)")
+    if func_counters:
+        c = func_counters
+        print(f"   Hits {c['hits']}, misses {c['misses']}, errors {c['errors']} "
+              f"(hit rate {c['hit_rate']:.0%})")
+        print(f"   Read {c['bytes_read'] / 1024:.1f} KiB, wrote {c['bytes_written'] / 1024:.1f} KiB; "
+              f"avg load {c['avg_load_ms']:.1f} ms, avg store {c['avg_store_ms']:.1f} ms")
+    else:
+        print("   No cache traffic recorded for this function.")
+    if func_storage:
+        print(f"   Stored: {func_storage['entries']} entries, {func_storage['bytes'] / 1024:.1f} KiB")
+    if entries is None:
+        print("   (Per-entry details need CACHE_BACKEND=sqlite.)")
+    for e in entries or []:
+        print(f"   - {e['key']}  {e['size']:>8} B  last used {time.strftime('%Y-%m-%d %H:%M', time.localtime(e['accessed_at']))}")
+    print()
+
+
+def parse_index_corpus_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="main.py index-corpus",
+        description="Build or incrementally update the local research corpus index (SEARCH_PROVIDER=local).",
+    )
+    parser.add_argument(
+        "--corpus",
+        type=str,
+        default=Config.LOCAL_CORPUS_DIR,
+        help=f"Directory of Markdown/text documents (default: {Config.LOCAL_CORPUS_DIR})."
+    )
+    parser.add_argument(
+        "--query", "-q",
+        type=str,
+        default=None,
+        help="Run a test query against the index after updating it."
+    )
+    return parser.parse_args(argv)
+
+
+def index_corpus_main(argv):
+    from tools.local_corpus import CorpusIndex
+
+    args = parse_index_corpus_args(argv)
+    if not os.path.isdir(args.corpus):
+        print(f"❌ Corpus directory not found: {args.corpus}\n")
+        sys.exit(1)
+
+    index = CorpusIndex()
+    start = time.perf_counter()
+    summary = index.update(args.corpus)
+    print(f"\n📚 Indexed {summary['files']} files, {summary['passages']} passages "
+          f"({summary['reindexed']} re-read, {summary['removed']} removed) "
+          f"in {time.perf_counter() - start:.2f}s → {index.index_dir}")
+
+    if args.query:
+        start = time.perf_counter()
+        hits = index.search(args.query, max_results=5)
+        print(f"\n🔎 '{args.query}': {len(hits)} hits in {(time.perf_counter() - start) * 1000:.1f} ms")
+        for hit in hits:
+            print(f"   [{hit['score']:.2f}] {hit['title']}: {hit['body'][:100]}")
+    print()
+
+
+COMMANDS = {
+    "warm-cache": warm_cache_main,
+    "cache": cache_main,
+    "index-corpus": index_corpus_main,
+}
 
 
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] in COMMANDS:
+        COMMANDS[sys.argv[1]](sys.argv[2:])
+        return
+
     args = parse_args()
 
     print(f"\n🤖 Agentic AI PowerPoint Builder")
@@ -13,7 +13,7 @@ import os
 from typing import Optional
 from utils.logger import get_logger
 from utils.config import Config
-from utils.error_handler import safe_run
+from utils.error_handler import safe_run, retry_budget
 
 logger = get_logger(__name__)
 
@@ -60,6 +60,9 @@ def run_pipeline(
 
     # --- Build & Invoke Graph ---
     from graph import build_graph
+    from tools.llm_cache import install_llm_cache
+
+    install_llm_cache()
 
     app = build_graph()
 
@@ -70,11 +73,15 @@ def run_pipeline(
         "depth": depth,
         "presentation_outline": [],
         "research_notes": {},
+        "topic_research": None,
         "slide_content": [],
         "final_ppt_path": "",
     }
 
-    final_state = app.invoke(initial_state)
+    with retry_budget() as budget:
+        final_state = app.invoke(initial_state)
+    if budget.retries or budget.denied:
+        logger.info(f"[Orchestrator] Retry budget used: {budget.snapshot()}")
 
     # --- Post-processing Logging ---
     ppt_path = final_state.get("final_ppt_path", "")
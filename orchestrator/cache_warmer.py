@@ -0,0 +1,191 @@
+"""
+Cache Warmer
+------------
+Pre-populates the cached planner, writer, keyword and image results for a
+list of popular topics, so the first real request of the day is served
+from cache instead of paying for cold LLM calls.
+
+Topics are warmed through the same services the pipeline uses (so cache
+keys match real runs), at a bounded concurrency and request rate; the
+rate covers the research stage's web searches too. Finished
+topics are appended to a progress file, so an interrupted run resumes
+where it left off.
+"""
+import os
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Any
+from utils.logger import get_logger
+from utils.config import Config
+from utils.error_handler import retry_budget
+
+logger = get_logger(__name__)
+
+DEFAULT_PROGRESS_FILE = os.path.join(Config.CACHE_DIR, "warm_progress.jsonl")
+
+
+class RateLimiter:
+    """Thread-safe limiter spacing calls evenly at `per_minute` calls per minute."""
+
+    def __init__(self, per_minute: float):
+        self.interval = 60.0 / per_minute if per_minute and per_minute > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until the next call slot is available."""
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def read_topics(path: str) -> List[str]:
+    """Read one topic per line, skipping blanks, '#' comments and duplicates."""
+    topics = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            topic = line.strip()
+            if topic and not topic.startswith("#") and topic not in topics:
+                topics.append(topic)
+    return topics
+
+
+def _job_id(topic: str, slide_count: int, depth: str) -> str:
+    return f"{topic}|{slide_count}|{depth}"
+
+
+def _load_progress(path: str) -> set:
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                done.add(json.loads(line)["job"])
+            except (ValueError, KeyError):
+                continue  # partially written last line from an interrupted run
+    return done
+
+
+def warm_topic(topic: str, slide_count: int, depth: str, limiter: RateLimiter = None) -> Dict[str, Any]:
+    """
+    Run the cacheable pipeline stages for one topic, under its own retry budget.
+
+    Returns:
+        {"slides": int, "images": int} — counts of warmed slide entries.
+    """
+    from agents.planner.service import plan_outline_service
+    from agents.research.service import research_slides_service
+    from agents.writer.service import write_content_service
+    from agents.image.service import generate_image_keyword, fetch_image_url
+    from tools.web_search_tool import throttled_searches
+
+    limiter = limiter or RateLimiter(0)
+
+    with retry_budget():
+        limiter.acquire()
+        outline = plan_outline_service(topic, slide_count, depth)
+        if not outline or outline[0].get("title") == "Error":
+            raise RuntimeError("planner failed to generate an outline")
+        # Each web search the research stage makes takes a slot of its own
+        with throttled_searches(limiter.acquire):
+            notes = research_slides_service(outline, topic=topic)
+
+        limiter.acquire()
+        slides = write_content_service(outline, depth, notes)
+        if not slides:
+            raise RuntimeError("writer returned no slides")
+
+        images = 0
+        for slide in slides:
+            limiter.acquire()
+            keyword = generate_image_keyword(slide["title"], slide["content"])
+            if not Config.UNSPLASH_ACCESS_KEY:
+                continue  # placeholder images are not cached
+            limiter.acquire()
+            if fetch_image_url(keyword):
+                images += 1
+    return {"slides": len(slides), "images": images}
+
+
+def warm_topics(
+    topics: List[str],
+    slide_count: int = None,
+    depth: str = "Concise",
+    concurrency: int = 2,
+    requests_per_minute: float = 30,
+    progress_file: str = DEFAULT_PROGRESS_FILE,
+) -> Dict[str, Any]:
+    """
+    Warm the cache for every topic not already recorded in `progress_file`.
+
+    Args:
+        topics: Topics to warm.
+        slide_count: Slides per outline (must match real requests to hit). Defaults to Config.DEFAULT_SLIDE_COUNT.
+        depth: Content depth (must match real requests to hit).
+        concurrency: Topics warmed in parallel.
+        requests_per_minute: Cap on service calls per minute across all workers (0 = unlimited).
+        progress_file: JSON-lines file of finished topics, used to resume.
+
+    Returns:
+        Report dict: {"warmed": [...], "skipped": [...], "failed": [...], "seconds": float}
+    """
+    from tools.llm_cache import install_llm_cache
+
+    install_llm_cache()
+    slide_count = slide_count or Config.DEFAULT_SLIDE_COUNT
+    done = _load_progress(progress_file)
+    report = {"warmed": [], "skipped": [], "failed": [], "seconds": 0.0}
+    pending = []
+    for topic in topics:
+        if _job_id(topic, slide_count, depth) in done:
+            report["skipped"].append(topic)
+        else:
+            pending.append(topic)
+
+    if report["skipped"]:
+        logger.info(f"[CacheWarmer] Resuming — {len(report['skipped'])} topic(s) already warmed.")
+
+    limiter = RateLimiter(requests_per_minute)
+    progress_lock = threading.Lock()
+    if os.path.dirname(progress_file):
+        os.makedirs(os.path.dirname(progress_file), exist_ok=True)
+    started = time.monotonic()
+
+    def run(topic: str) -> Dict[str, Any]:
+        topic_started = time.monotonic()
+        counts = warm_topic(topic, slide_count, depth, limiter)
+        entry = {
+            "job": _job_id(topic, slide_count, depth),
+            "topic": topic,
+            "seconds": round(time.monotonic() - topic_started, 2),
+            **counts,
+        }
+        with progress_lock, open(progress_file, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+        return entry
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        futures = {pool.submit(run, topic): topic for topic in pending}
+        for future in as_completed(futures):
+            topic = futures[future]
+            try:
+                entry = future.result()
+                report["warmed"].append(entry)
+                logger.info(
+                    f"[CacheWarmer] Warmed '{topic}' — {entry['slides']} slides, "
+                    f"{entry['images']} images in {entry['seconds']}s"
+                )
+            except Exception as exc:
+                logger.error(f"[CacheWarmer] Failed to warm '{topic}': {type(exc).__name__}: {exc}")
+                report["failed"].append({"topic": topic, "error": str(exc)})
+
+    report["seconds"] = round(time.monotonic() - started, 2)
+    return report
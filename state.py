@@ -13,5 +13,6 @@ class AgentState(TypedDict):
     depth: str
     presentation_outline: List[Dict[str, str]]  # List of {"title": "Slide Title", "description": "Brief description"}
     research_notes: Optional[Dict[str, str]]    # Per-slide web research snippets from ResearchAgent
+    topic_research: Optional[Dict[str, List[str]]]  # Topic-level search results prefetched alongside the planner
     slide_content: List[SlideContent]           # Final content structure
     final_ppt_path: str
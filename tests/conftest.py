@@ -1,7 +1,40 @@
 
 import pytest
-from unittest.mock import MagicMock
-from state import AgentState
+from unittest.mock import patch
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path_factory):
+    """Keep disk_cache reads and writes out of the project's .cache directory."""
+    from langchain_core.globals import set_llm_cache
+    from tools.cache_backends import DiskBackend
+    from tools.cache_stats import stats
+    from agents.planner.topic_index import TopicIndex
+    from tools.image_store import ImageStore
+    cache_dir = tmp_path_factory.mktemp("cache")
+    with patch("tools.cache._backend", DiskBackend(str(cache_dir))), \
+         patch("agents.planner.topic_index._index", TopicIndex(str(cache_dir / "topic_index.jsonl"))), \
+         patch("tools.image_store._store", ImageStore(str(cache_dir / "images"))), \
+         patch("tools.llm_cache.Config.LLM_CACHE_ENABLED", False), \
+         patch("utils.config.Config.CACHE_DIR", str(cache_dir)):
+        yield
+    set_llm_cache(None)
+    stats.reset()  # nothing left for the atexit flush to write into .cache
+
+
+@pytest.fixture(autouse=True)
+def fresh_provider_state():
+    """Start every test with closed circuits, no hedging history and no pooled sessions."""
+    from tools.circuit_breaker import reset_breakers
+    from tools.hedging import reset_hedgers
+    from tools.session_pool import reset_pools
+    reset_breakers()
+    reset_hedgers()
+    reset_pools()
+    yield
+    reset_breakers()
+    reset_hedgers()
+    reset_pools()
 
 @pytest.fixture
 def mock_agent_state():
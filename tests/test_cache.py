@@ -0,0 +1,416 @@
+"""
+Tests for tools/cache.py
+"""
+import os
+import time
+import asyncio
+import multiprocessing
+import pytest
+from unittest.mock import MagicMock, patch
+
+import tools.cache_backends as cache_backends
+from tools.cache import disk_cache, clear_cache, set_backend
+from tools.cache_serialization import encode_value, decode_value, UnsupportedValueError
+from tools.cache_backends import DiskBackend, SQLiteBackend, RedisBackend
+
+
+@pytest.fixture(autouse=True)
+def tmp_cache_dir(tmp_path):
+    """Point the cache at a throwaway directory for every test."""
+    with patch("tools.cache._backend", DiskBackend(str(tmp_path))):
+        yield tmp_path
+
+
+class TestDiskCache:
+    def test_second_call_is_served_from_cache(self):
+        calls = {"n": 0}
+
+        @disk_cache
+        def compute(x):
+            calls["n"] += 1
+            return {"value": x * 2}
+
+        assert compute(3) == {"value": 6}
+        assert compute(3) == {"value": 6}
+        assert calls["n"] == 1
+
+    def test_write_leaves_no_temp_files(self, tmp_cache_dir):
+        @disk_cache
+        def compute(x):
+            return [x] * 100
+
+        compute(1)
+        leftovers = [f for f in os.listdir(tmp_cache_dir) if f.endswith(".tmp")]
+        pkl_files = [f for f in os.listdir(tmp_cache_dir) if f.endswith(".pkl")]
+        assert leftovers == []
+        assert len(pkl_files) == 1
+
+    def test_corrupt_entry_is_recomputed(self, tmp_cache_dir):
+        calls = {"n": 0}
+
+        @disk_cache
+        def compute(x):
+            calls["n"] += 1
+            return x
+
+        compute(5)
+        for name in os.listdir(tmp_cache_dir):
+            if name.endswith(".pkl"):
+                with open(tmp_cache_dir / name, "wb") as f:
+                    f.write(b"\x80torn")
+        assert compute(5) == 5
+        assert calls["n"] == 2
+
+    def test_clear_cache_removes_entries(self, tmp_cache_dir):
+        @disk_cache
+        def compute(x):
+            return x
+
+        compute(1)
+        clear_cache()
+        assert not any(f.endswith(".pkl") for f in os.listdir(tmp_cache_dir))
+
+    def test_clear_cache_keeps_other_stores(self, tmp_cache_dir):
+        @disk_cache
+        def compute(x):
+            return x
+
+        compute(1)
+        others = ["llm_cache.sqlite3", "llm_cache.sqlite3-wal", "llm_cache.sqlite3-shm", "topic_index.jsonl",
+                  "cache_stats.json", "warm_progress.jsonl", "cache.sqlite3"]
+        for name in others:
+            (tmp_cache_dir / name).write_text("keep")
+        clear_cache()
+        assert sorted(f for f in os.listdir(tmp_cache_dir) if os.path.isfile(tmp_cache_dir / f)) == sorted(others)
+
+
+
+class TestAsyncDiskCache:
+    def test_coroutine_result_is_cached_not_the_coroutine(self):
+        calls = {"n": 0}
+
+        @disk_cache
+        async def fetch(x):
+            calls["n"] += 1
+            await asyncio.sleep(0)
+            return {"url": f"https://example.com/{x}"}
+
+        assert asyncio.run(fetch("a")) == {"url": "https://example.com/a"}
+        assert asyncio.run(fetch("a")) == {"url": "https://example.com/a"}
+        assert calls["n"] == 1
+
+    def test_concurrent_coroutines_share_one_call(self):
+        calls = {"n": 0}
+
+        @disk_cache
+        async def fetch(x):
+            calls["n"] += 1
+            await asyncio.sleep(0.05)
+            return x * 2
+
+        async def run():
+            return await asyncio.gather(*(fetch(21) for _ in range(5)))
+
+        assert asyncio.run(run()) == [42] * 5
+        assert calls["n"] == 1
+
+    def test_exception_propagates_to_all_waiters(self):
+        @disk_cache
+        async def fail(x):
+            await asyncio.sleep(0.01)
+            raise RuntimeError("upstream down")
+
+        async def run():
+            return await asyncio.gather(fail(1), fail(1), return_exceptions=True)
+
+        results = asyncio.run(run())
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+    def test_cancelled_lock_wait_releases_the_lock(self, tmp_cache_dir):
+        import threading
+        from tools.cache import get_backend, _cache_key
+
+        @disk_cache
+        async def fetch(x):
+            return x
+
+        backend = get_backend()
+        key = _cache_key(fetch.__wrapped__, (1,), {})
+        held, release = threading.Event(), threading.Event()
+
+        def hold():
+            with backend.lock(key, 5):
+                held.set()
+                release.wait(5)
+
+        holder = threading.Thread(target=hold)
+        holder.start()
+        held.wait(5)
+
+        async def cancelled_then_retry():
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(fetch(1), timeout=0.1)
+            release.set()  # the abandoned wait now takes the lock and must hand it back
+            await asyncio.sleep(0.3)
+            with backend.lock(key, 0) as acquired:
+                assert acquired
+            return await asyncio.wait_for(fetch(1), timeout=2)
+
+        assert asyncio.run(cancelled_then_retry()) == 1
+        holder.join()
+
+    def test_cancelling_the_caller_fails_joined_waiters(self):
+        @disk_cache
+        async def slow(x):
+            await asyncio.sleep(1)
+            return x
+
+        async def run():
+            first = asyncio.ensure_future(slow(1))
+            await asyncio.sleep(0.05)
+            second = asyncio.ensure_future(slow(1))
+            await asyncio.sleep(0.05)
+            first.cancel()
+            return await asyncio.gather(first, second, return_exceptions=True)
+
+        first, second = asyncio.run(run())
+        assert isinstance(first, asyncio.CancelledError)
+        assert isinstance(second, RuntimeError)
+
+def _slow_counted(counter_file, x):
+    with open(counter_file, "a") as f:
+        f.write("x")
+    time.sleep(0.3)
+    return x * 10
+
+
+@pytest.mark.skipif(cache_backends.fcntl is None, reason="advisory locks unavailable on this platform")
+def test_concurrent_processes_compute_once(tmp_cache_dir):
+    """N processes missing the same key must run the wrapped function only once."""
+    counter_file = str(tmp_cache_dir / "calls.txt")
+    cached = disk_cache(_slow_counted)
+    ctx = multiprocessing.get_context("fork")
+    procs = [ctx.Process(target=cached, args=(counter_file, 7)) for _ in range(4)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(timeout=10)
+
+    with open(counter_file) as f:
+        assert f.read() == "x"
+    assert cached(counter_file, 7) == 70
+
+
+class TestBackends:
+    @pytest.fixture(params=["disk", "sqlite", "redis"])
+    def backend(self, request, tmp_path):
+        if request.param == "disk":
+            return DiskBackend(str(tmp_path))
+        if request.param == "sqlite":
+            return SQLiteBackend(str(tmp_path))
+        fakeredis = pytest.importorskip("fakeredis")
+        return RedisBackend(client=fakeredis.FakeRedis())
+
+    def test_set_get_delete(self, backend):
+        assert backend.get("k") is None
+        backend.set("k", b"value", func_name="f")
+        assert backend.get("k") == b"value"
+        backend.delete("k")
+        assert backend.get("k") is None
+
+    def test_clear(self, backend):
+        backend.set("a", b"1")
+        backend.set("b", b"2")
+        backend.clear()
+        assert backend.get("a") is None
+        assert backend.get("b") is None
+
+    def test_clear_keeps_held_locks(self, backend):
+        with backend.lock("k", timeout=1) as held:
+            assert held is True
+            backend.clear()
+            with backend.lock("k", timeout=0.1) as again:
+                assert again is False
+
+    def test_unavailable_redis_lock_logs_one_warning(self):
+        client = MagicMock()
+        client.lock.return_value.acquire.side_effect = ConnectionError("refused")
+        with patch("tools.cache_backends.logger") as logger:
+            with RedisBackend(client=client).lock("k", timeout=1) as acquired:
+                assert acquired is False
+        assert logger.warning.call_count == 1
+        assert "unavailable" in logger.warning.call_args.args[0]
+
+    def test_lock_is_acquired(self, backend):
+        with backend.lock("k", timeout=1) as acquired:
+            assert acquired is True
+
+    def test_disk_cache_uses_backend(self, backend):
+        calls = {"n": 0}
+
+        @disk_cache
+        def compute(x):
+            calls["n"] += 1
+            return x + 1
+
+        set_backend(backend)
+        try:
+            assert compute(1) == 2
+            assert compute(1) == 2
+        finally:
+            set_backend(None)
+        assert calls["n"] == 1
+
+
+class TestSQLiteBackend:
+    def test_uses_wal_journal(self, tmp_path):
+        backend = SQLiteBackend(str(tmp_path))
+        mode = backend._connect().execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode.lower() == "wal"
+
+    def test_stats_group_by_function(self, tmp_path):
+        backend = SQLiteBackend(str(tmp_path))
+        backend.set("a", b"12345", func_name="outline")
+        backend.set("b", b"123", func_name="outline")
+        backend.set("c", b"1", func_name="keyword")
+        stats = backend.stats()
+        assert stats["entries"] == 3
+        assert stats["bytes"] == 9
+        assert stats["functions"]["outline"]["entries"] == 2
+        assert stats["functions"]["keyword"]["bytes"] == 1
+
+    def test_invalidate_by_function(self, tmp_path):
+        backend = SQLiteBackend(str(tmp_path))
+        backend.set("a", b"1", func_name="outline")
+        backend.set("b", b"2", func_name="keyword")
+        assert backend.invalidate("outline") == 1
+        assert backend.get("a") is None
+        assert backend.get("b") == b"2"
+
+    def test_evict_least_recently_used(self, tmp_path):
+        backend = SQLiteBackend(str(tmp_path))
+        for key in ("old", "mid", "new"):
+            backend.set(key, b"x" * 10)
+            time.sleep(0.01)
+        backend.get("old")  # touch — now most recently used
+        assert backend.evict(max_bytes=20) == 1
+        assert backend.get("mid") is None
+        assert backend.get("old") is not None
+
+    def test_import_directory(self, tmp_path):
+        disk = DiskBackend(str(tmp_path / "disk"))
+        disk.set("k1", encode_value(["v1"]))
+        backend = SQLiteBackend(str(tmp_path / "db"))
+        assert backend.import_directory(disk.directory) == {"imported": 1, "skipped": 0}
+        assert decode_value(backend.get("k1")) == ["v1"]
+
+    def test_import_directory_reencodes_legacy_pickles_only_when_allowed(self, tmp_path):
+        import pickle
+        disk = DiskBackend(str(tmp_path / "disk"))
+        disk.set("legacy", pickle.dumps([{"title": "Intro"}]))
+
+        backend = SQLiteBackend(str(tmp_path / "db"))
+        assert backend.import_directory(disk.directory) == {"imported": 0, "skipped": 1}
+        assert backend.get("legacy") is None
+
+        assert backend.import_directory(disk.directory, allow_pickle=True) == {"imported": 1, "skipped": 0}
+        assert decode_value(backend.get("legacy")) == [{"title": "Intro"}]  # readable with pickle off
+
+
+class TestSerialization:
+    OUTLINE = [{"title": f"Slide {i}", "description": "Intro to the topic " * 5} for i in range(20)]
+
+    @pytest.mark.parametrize("compression", ["none", "zlib", "zstd"])
+    @pytest.mark.parametrize("serializer", ["json", "msgpack"])
+    def test_plain_data_round_trips(self, serializer, compression):
+        with patch("tools.cache_serialization.Config.CACHE_SERIALIZER", serializer), \
+             patch("tools.cache_serialization.Config.CACHE_COMPRESSION", compression):
+            assert decode_value(encode_value(self.OUTLINE)) == self.OUTLINE
+            assert decode_value(encode_value("https://example.com/a.jpg")) == "https://example.com/a.jpg"
+
+    def test_compressed_entry_is_smaller_than_pickle(self):
+        import pickle
+        with patch("tools.cache_serialization.Config.CACHE_COMPRESSION", "zlib"):
+            assert len(encode_value(self.OUTLINE)) < len(pickle.dumps(self.OUTLINE))
+
+    def test_non_plain_value_needs_pickle_opt_in(self):
+        with patch("tools.cache_serialization.Config.CACHE_ALLOW_PICKLE", False):
+            with pytest.raises(UnsupportedValueError):
+                encode_value(("a", "tuple"))
+        with patch("tools.cache_serialization.Config.CACHE_ALLOW_PICKLE", True):
+            assert decode_value(encode_value(("a", "tuple"))) == ("a", "tuple")
+
+    def test_legacy_pickle_entries_only_load_when_allowed(self):
+        import pickle
+        legacy = pickle.dumps({"a": 1})
+        with patch("tools.cache_serialization.Config.CACHE_ALLOW_PICKLE", False):
+            with pytest.raises(ValueError):
+                decode_value(legacy)
+        with patch("tools.cache_serialization.Config.CACHE_ALLOW_PICKLE", True):
+            assert decode_value(legacy) == {"a": 1}
+
+
+class TestCacheStats:
+    def test_disk_cache_records_hits_misses_and_bytes(self):
+        from tools.cache import get_cache_stats
+
+        @disk_cache
+        def counted_service(x):
+            return {"title": x}
+
+        counted_service("a")
+        counted_service("a")
+        counted_service("b")
+        s = get_cache_stats()["counted_service"]
+        assert s["hits"] == 1
+        assert s["misses"] >= 2
+        assert s["stores"] == 2
+        assert s["bytes_written"] > 0
+        assert s["bytes_read"] > 0
+
+    def test_read_errors_are_counted(self, tmp_cache_dir):
+        from tools.cache import get_cache_stats
+
+        @disk_cache
+        def flaky_entry(x):
+            return x
+
+        flaky_entry(1)
+        for name in os.listdir(tmp_cache_dir):
+            if name.endswith(".pkl"):
+                (tmp_cache_dir / name).write_bytes(b"PPC\x09\x00junk")
+        flaky_entry(1)
+        assert get_cache_stats()["flaky_entry"]["errors"] >= 1
+
+    def test_expired_ttl_entries_count_as_misses(self):
+        from tools.cache import ttl_cache, get_cache_stats
+        calls = []
+
+        @ttl_cache(ttl=60)
+        def ttl_lookup(x):
+            calls.append(x)
+            return [x]
+
+        ttl_lookup("q")
+        ttl_lookup("q")
+        with patch("tools.cache.time.time", return_value=time.time() + 120):
+            ttl_lookup("q")
+        s = get_cache_stats()["ttl_lookup"]
+        assert len(calls) == 2
+        assert s["hits"] == 1
+        assert s["misses"] == 2
+
+    def test_flush_merges_into_shared_file(self, tmp_path):
+        from tools.cache_stats import CacheStats, load_persisted
+        path = str(tmp_path / "cache_stats.json")
+        first, second = CacheStats(), CacheStats()
+        first.record_hit("f", 10, 0.001)
+        second.record_hit("f", 5, 0.001)
+        second.record_miss("f", 0.002)
+        first.flush(path)
+        second.flush(path)
+        second.flush(path)  # nothing pending — must not double count
+        merged = load_persisted(path)["f"]
+        assert merged["hits"] == 2
+        assert merged["misses"] == 1
+        assert merged["bytes_read"] == 15
@@ -0,0 +1,103 @@
+"""
+Tests for orchestrator/cache_warmer.py
+"""
+import json
+import pytest
+from unittest.mock import patch
+
+from orchestrator.cache_warmer import warm_topics, read_topics
+
+
+@pytest.fixture
+def mock_services():
+    outline = [{"title": "Intro", "description": "d"}, {"title": "Impact", "description": "d"}]
+    slides = [{"title": s["title"], "content": "- c", "image_keyword": None, "image_url": None} for s in outline]
+    with patch("agents.planner.service.generate_outline_service", return_value=outline) as planner, \
+         patch("agents.research.service.research_slides_service", return_value={}) as research, \
+         patch("agents.writer.service.write_content_service", return_value=slides) as writer, \
+         patch("agents.image.service.generate_image_keyword", return_value="kw") as keyword, \
+         patch("agents.image.service.fetch_image_url", return_value="http://img") as fetch, \
+         patch("orchestrator.cache_warmer.Config.UNSPLASH_ACCESS_KEY", "key"):
+        yield {"planner": planner, "research": research, "writer": writer, "keyword": keyword, "fetch": fetch}
+
+
+def test_read_topics_skips_comments_and_duplicates(tmp_path):
+    path = tmp_path / "topics.txt"
+    path.write_text("# popular\nAI in Healthcare\n\nClimate Change\nAI in Healthcare\n")
+    assert read_topics(str(path)) == ["AI in Healthcare", "Climate Change"]
+
+
+def test_warms_each_topic_through_services(tmp_path, mock_services):
+    progress = str(tmp_path / "progress.jsonl")
+    report = warm_topics(["A", "B"], slide_count=2, requests_per_minute=0, progress_file=progress)
+
+    assert sorted(e["topic"] for e in report["warmed"]) == ["A", "B"]
+    assert report["warmed"][0]["slides"] == 2
+    assert report["warmed"][0]["images"] == 2
+    mock_services["planner"].assert_any_call("A", 2, "Concise")
+    assert mock_services["keyword"].call_count == 4
+
+
+def test_resumes_from_progress_file(tmp_path, mock_services):
+    progress = str(tmp_path / "progress.jsonl")
+    warm_topics(["A"], slide_count=2, requests_per_minute=0, progress_file=progress)
+    mock_services["planner"].reset_mock()
+
+    report = warm_topics(["A", "B"], slide_count=2, requests_per_minute=0, progress_file=progress)
+
+    assert report["skipped"] == ["A"]
+    assert [e["topic"] for e in report["warmed"]] == ["B"]
+    mock_services["planner"].assert_called_once_with("B", 2, "Concise")
+    with open(progress) as f:
+        assert len([json.loads(line) for line in f]) == 2
+
+
+def test_failed_topic_is_reported_and_not_recorded(tmp_path, mock_services):
+    progress = str(tmp_path / "progress.jsonl")
+    mock_services["writer"].return_value = []
+
+    report = warm_topics(["A"], requests_per_minute=0, progress_file=progress)
+
+    assert report["warmed"] == []
+    assert report["failed"][0]["topic"] == "A"
+    assert not (tmp_path / "progress.jsonl").exists()
+
+
+def test_planner_error_outline_is_reported_and_not_recorded(tmp_path, mock_services):
+    progress = str(tmp_path / "progress.jsonl")
+    mock_services["planner"].side_effect = RuntimeError("rate limited")
+
+    report = warm_topics(["A"], requests_per_minute=0, progress_file=progress)
+
+    assert report["warmed"] == []
+    assert report["failed"] == [{"topic": "A", "error": "planner failed to generate an outline"}]
+    mock_services["writer"].assert_not_called()
+    assert not (tmp_path / "progress.jsonl").exists()
+
+
+def test_research_searches_count_against_the_rate(mock_services):
+    from orchestrator.cache_warmer import RateLimiter, warm_topic
+    from tools.concurrency import run_concurrently
+    from tools.web_search_tool import web_search
+
+    class Provider:
+        name = "fake"
+
+        def search(self, query, max_results):
+            return [{"body": f"fact about {query}"}]
+
+    def research(outline, topic=None):
+        web_search(topic)
+        # Worker threads count too; the repeated topic search is a cache hit and does not
+        run_concurrently({q: (lambda q=q: web_search(q)) for q in (f"{topic} statistics", topic)},
+                         max_workers=2, timeout=5)
+        return {}
+
+    limiter = RateLimiter(0)
+    with patch.object(limiter, "acquire", wraps=limiter.acquire) as acquire, \
+         patch("tools.web_search_tool.get_providers", return_value=[Provider()]):
+        mock_services["research"].side_effect = research
+        warm_topic("Solar", 2, "Concise", limiter)
+
+    # planner + 2 live searches + writer + 2 x (keyword + image)
+    assert acquire.call_count == 1 + 2 + 1 + 4
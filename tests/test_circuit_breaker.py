@@ -0,0 +1,119 @@
+"""
+Tests for tools/circuit_breaker.py and the /health report
+"""
+import pytest
+import requests
+from unittest.mock import patch, MagicMock
+
+from tools.circuit_breaker import CircuitBreaker, CircuitOpenError, get_breaker, CLOSED, OPEN, HALF_OPEN
+
+
+def _fail(breaker, exc=None):
+    with pytest.raises(type(exc or requests.ConnectionError())):
+        with breaker:
+            raise exc or requests.ConnectionError("down")
+
+
+class TestCircuitBreaker:
+    def test_opens_after_threshold(self):
+        breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=60)
+        _fail(breaker)
+        assert breaker.state == CLOSED
+        _fail(breaker)
+        assert breaker.state == OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.call(lambda: "never called")
+
+    def test_deterministic_errors_do_not_count(self):
+        breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=60)
+        _fail(breaker, ValueError("bad json"))
+        assert breaker.state == CLOSED
+
+    def test_success_resets_failure_count(self):
+        breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=60)
+        _fail(breaker)
+        breaker.call(lambda: "ok")
+        _fail(breaker)
+        assert breaker.state == CLOSED
+
+    def test_half_open_probe_closes_on_success(self):
+        breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0)
+        _fail(breaker)
+        assert breaker.state == HALF_OPEN
+        assert breaker.allow()
+        assert not breaker.allow()  # only one probe at a time
+        breaker.record_success()
+        assert breaker.state == CLOSED
+
+    def test_half_open_probe_reopens_on_failure(self):
+        breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=60)
+        _fail(breaker)
+        breaker._opened_at -= 60  # timeout elapsed
+        assert breaker.state == HALF_OPEN
+        _fail(breaker)
+        assert breaker.state == OPEN
+
+
+class TestProviderFallbacks:
+    def test_open_ddgs_circuit_skips_search(self):
+        from tools.web_search_tool import web_search
+        breaker = get_breaker("ddgs")
+        for _ in range(breaker.failure_threshold):
+            breaker.record_failure()
+        with patch("ddgs.DDGS") as ddgs_cls:
+            assert web_search("anything") == []
+        ddgs_cls.assert_not_called()
+
+    def test_unsplash_outage_opens_circuit(self):
+        from tools.image_generation_tool import _fetch_unsplash_image
+        down = MagicMock(status_code=503)
+        down.raise_for_status.side_effect = requests.HTTPError("503", response=down)
+        with patch("tools.image_generation_tool.Config.UNSPLASH_ACCESS_KEY", "key"), \
+             patch("tools.image_generation_tool.requests.get", return_value=down) as get:
+            for _ in range(get_breaker("unsplash").failure_threshold + 2):
+                with pytest.raises((requests.HTTPError, CircuitOpenError)):
+                    _fetch_unsplash_image("solar panels")
+        assert get_breaker("unsplash").state == OPEN
+        assert get.call_count == get_breaker("unsplash").failure_threshold
+
+
+class TestHealth:
+    def test_open_circuit_degrades_health(self):
+        from health import check_health
+        with patch("health.Config.GROQ_API_KEY", "key"):
+            assert check_health()["status"] == "healthy"
+            breaker = get_breaker("unsplash")
+            for _ in range(breaker.failure_threshold):
+                breaker.record_failure()
+            result = check_health()
+        assert result["status"] == "degraded"
+        assert result["checks"]["circuits"]["breakers"]["unsplash"]["state"] == OPEN
+
+    def test_reports_circuits_opened_by_another_process(self, tmp_path):
+        """/health runs in its own process; it must see breakers opened by the pipeline."""
+        import os
+        import subprocess
+        import sys
+        from health import check_health
+        from tools.circuit_breaker import breaker_states
+        opener = ("from tools.circuit_breaker import get_breaker\n"
+                  "b = get_breaker('groq')\n"
+                  "for _ in range(b.failure_threshold): b.record_failure()\n")
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        subprocess.run([sys.executable, "-c", opener], cwd=root, check=True,
+                       env={**os.environ, "CACHE_DIR": str(tmp_path)})
+
+        with patch("health.Config.CACHE_DIR", str(tmp_path)), patch("health.Config.GROQ_API_KEY", "key"):
+            result = check_health()
+        assert result["status"] == "degraded"
+        assert result["checks"]["circuits"]["breakers"]["groq"]["state"] == OPEN
+        assert "groq" not in breaker_states()  # reported from the other process's file
+
+    def test_recovery_is_published(self):
+        from tools.circuit_breaker import shared_breaker_states
+        breaker = get_breaker("ddgs")
+        for _ in range(breaker.failure_threshold):
+            breaker.record_failure()
+        assert shared_breaker_states()["ddgs"]["state"] == OPEN
+        breaker.record_success()
+        assert shared_breaker_states()["ddgs"]["state"] == CLOSED
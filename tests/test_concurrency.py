@@ -0,0 +1,54 @@
+"""
+Tests for tools/concurrency.py
+"""
+import time
+from tools.concurrency import run_concurrently
+from utils.error_handler import retry_budget, current_retry_budget
+
+
+class TestRunConcurrently:
+    def test_runs_tasks_in_parallel(self):
+        tasks = {i: (lambda i=i: time.sleep(0.1) or i * i) for i in range(5)}
+        start = time.monotonic()
+        results = run_concurrently(tasks, max_workers=5, timeout=5)
+        assert results == {i: i * i for i in range(5)}
+        assert time.monotonic() - start < 0.3
+
+    def test_failed_and_timed_out_tasks_are_left_out(self):
+        def boom():
+            raise RuntimeError("boom")
+
+        tasks = {"ok": lambda: "ok", "boom": boom, "slow": lambda: time.sleep(1.0) or "late"}
+        start = time.monotonic()
+        results = run_concurrently(tasks, max_workers=3, timeout=0.2)
+        assert results == {"ok": "ok"}
+        assert time.monotonic() - start < 0.6
+
+    def test_timeout_counts_from_task_start(self):
+        # Two waves on one worker: the second task starts at ~0.15s and still gets its full timeout
+        tasks = {i: (lambda: time.sleep(0.15) or "done") for i in range(2)}
+        assert run_concurrently(tasks, max_workers=1, timeout=0.25) == {0: "done", 1: "done"}
+
+    def test_workers_share_the_callers_retry_budget(self):
+        with retry_budget() as budget:
+            results = run_concurrently({"a": current_retry_budget}, max_workers=1, timeout=5)
+        assert results["a"] is budget
+
+    def test_batch_deadline_bounds_tasks_queued_behind_hung_ones(self):
+        import threading
+        release = threading.Event()
+        tasks = {"hung": lambda: release.wait(5) and "late", "queued 1": lambda: "q1", "queued 2": lambda: "q2"}
+        try:
+            start = time.monotonic()
+            results = run_concurrently(tasks, max_workers=1, timeout=0.1)
+            elapsed = time.monotonic() - start
+        finally:
+            release.set()
+        assert results == {}  # the queued tasks never got a worker
+        assert elapsed < 0.5  # default deadline: 0.1s x 3 waves
+
+    def test_task_starting_during_a_wait_gets_its_full_timeout(self):
+        # "slow" is abandoned at 0.2s but holds the only worker until 0.3s; "next"
+        # then starts mid-wait and needs 0.15s of its 0.2s timeout
+        tasks = {"slow": lambda: time.sleep(0.3) or "late", "next": lambda: time.sleep(0.15) or "done"}
+        assert run_concurrently(tasks, max_workers=1, timeout=0.2, deadline=5) == {"next": "done"}
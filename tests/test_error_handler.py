@@ -58,6 +58,20 @@ class TestWithRetry:
         with pytest.raises(RuntimeError, match="always fails"):
             always_fails()
 
+    def test_exhausted_run_budget_fails_fast(self):
+        from utils.error_handler import retry_budget
+        call_count = {"n": 0}
+
+        @with_retry(retries=3, delay=0)
+        def always_fails():
+            call_count["n"] += 1
+            raise RuntimeError("down")
+
+        with retry_budget(max_retries=1, max_backoff_seconds=60):
+            with pytest.raises(RuntimeError):
+                always_fails()
+        assert call_count["n"] == 2
+
 
 class TestHandleAgentError:
     def test_returns_fallback_state(self):
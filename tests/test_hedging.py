@@ -0,0 +1,137 @@
+"""
+Tests for tools/hedging.py
+"""
+import time
+import threading
+import pytest
+from unittest.mock import patch
+
+from tools.hedging import Hedger, hedged, get_hedger
+from utils.config import Config
+
+
+def _warm(hedger, seconds=0.01, n=20):
+    for _ in range(n):
+        hedger.record_latency(seconds)
+
+
+class TestHedger:
+    def test_no_hedge_before_min_samples(self):
+        hedger = Hedger("test", min_samples=5, max_extra_load=1.0)
+        assert hedger.hedge_delay() is None
+        assert hedger.call(lambda: "ok") == "ok"
+        assert hedger.hedges == 0
+
+    def test_slow_call_is_hedged_and_fast_duplicate_wins(self):
+        hedger = Hedger("test", min_samples=5, max_extra_load=1.0)
+        _warm(hedger)
+        calls = []
+        lock = threading.Lock()
+
+        def lookup():
+            with lock:
+                calls.append(1)
+                first = len(calls) == 1
+            time.sleep(1.0 if first else 0.01)
+            return "slow" if first else "fast"
+
+        start = time.monotonic()
+        assert hedger.call(lookup) == "fast"
+        assert time.monotonic() - start < 0.5
+        assert hedger.hedges == 1 and hedger.hedge_wins == 1
+
+    def test_budget_caps_extra_load(self):
+        hedger = Hedger("test", min_samples=5, max_extra_load=0.25)
+        _warm(hedger, seconds=0.001)
+        for _ in range(8):
+            hedger.call(time.sleep, 0.02)
+        assert hedger.hedges <= 0.25 * hedger.calls
+
+    def test_failed_call_falls_back_to_other(self):
+        hedger = Hedger("test", min_samples=5, max_extra_load=1.0)
+        _warm(hedger)
+        calls = []
+
+        def flaky():
+            calls.append(1)
+            if len(calls) == 1:
+                time.sleep(0.05)
+                raise ConnectionError("reset")
+            time.sleep(0.1)
+            return "ok"
+
+        assert hedger.call(flaky) == "ok"
+
+    def test_both_failing_raises(self):
+        hedger = Hedger("test", min_samples=5, max_extra_load=1.0)
+        _warm(hedger)
+
+        def broken():
+            time.sleep(0.05)
+            raise ConnectionError("down")
+
+        with pytest.raises(ConnectionError):
+            hedger.call(broken)
+
+
+class TestSaturatedExecutor:
+    @pytest.fixture
+    def occupy(self):
+        """Block `n` workers of the shared hedge executor until `release` is set."""
+        from tools.hedging import _submit
+        release = threading.Event()
+
+        def block(n):
+            for _ in range(n):
+                _submit(release.wait, 5)
+            return release
+        yield block
+        release.set()
+
+    def test_saturated_executor_runs_the_call_inline(self, occupy):
+        hedger = Hedger("test", min_samples=5, max_extra_load=1.0)
+        _warm(hedger, seconds=0.01)
+        occupy(Config.HEDGE_MAX_WORKERS)
+
+        start = time.monotonic()
+        assert hedger.call(lambda: threading.current_thread().name) == threading.current_thread().name
+        assert time.monotonic() - start < 1.0
+        assert hedger.hedges == 0
+
+    def test_queued_primary_is_withdrawn_and_run_inline(self, occupy):
+        hedger = Hedger("test", min_samples=5, max_extra_load=1.0)
+        _warm(hedger, seconds=0.05)
+        occupy(Config.HEDGE_MAX_WORKERS)
+        calls = []
+
+        def lookup():
+            calls.append(threading.current_thread().name)
+            return "fast"
+
+        # The pool fills between the idle check and the submit
+        with patch("tools.hedging._has_idle_worker", return_value=True):
+            start = time.monotonic()
+            assert hedger.call(lookup) == "fast"
+        assert time.monotonic() - start < 1.0
+        assert calls == [threading.current_thread().name]
+        assert hedger.hedges == 0
+
+    def test_no_hedge_without_an_idle_worker(self, occupy):
+        hedger = Hedger("test", min_samples=5, max_extra_load=1.0)
+        _warm(hedger, seconds=0.01)
+        occupy(Config.HEDGE_MAX_WORKERS - 1)
+
+        assert hedger.call(lambda: time.sleep(0.1) or "slow") == "slow"
+        assert hedger.hedges == 0
+
+
+class TestHedgedHelper:
+    def test_disabled_is_plain_call(self):
+        with patch("tools.hedging.Config.HEDGING_ENABLED", False):
+            assert hedged("ddgs", lambda x: x * 2, 21) == 42
+        assert get_hedger("ddgs").calls == 0
+
+    def test_enabled_tracks_provider(self):
+        with patch("tools.hedging.Config.HEDGING_ENABLED", True):
+            hedged("unsplash", lambda: None)
+        assert get_hedger("unsplash").calls == 1
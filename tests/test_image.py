@@ -8,6 +8,12 @@ def mock_retry_settings():
     with patch('agents.image.service.api_retry', lambda x: x):
         yield
 
+@pytest.fixture(autouse=True)
+def no_image_downloads():
+    """Keep the image agent from downloading the (fake) image URLs."""
+    with patch('agents.image.agent.store_image', return_value=False) as store:
+        yield store
+
 def test_image_agent_no_slides(mock_agent_state):
     result = image_agent(mock_agent_state)
     assert result['slide_content'] == []
@@ -16,7 +22,7 @@ def test_image_agent_success(mock_agent_state, mock_slides):
     mock_agent_state['slide_content'] = mock_slides
     
     with patch('agents.image.service.ChatGroq') as MockLLM, \
-         patch('agents.image.agent.fetch_image_url') as MockFetch:
+         patch('agents.image.agent.find_image_url') as MockFetch:
         
         # Mock keyword generation logic (chain invoke)
         # Since chain is buried, let's rely on the loop structure.
@@ -52,3 +58,84 @@ def test_image_agent_success(mock_agent_state, mock_slides):
             assert len(slides) == 2
             assert slides[0]['image_keyword'] == "test_keyword"
             assert slides[0]['image_url'] == "http://mocked-url.com/img.jpg"
+
+
+def _slides(n):
+    return [{"title": f"Slide {i}", "content": f"- Point {i}", "image_keyword": None, "image_url": None}
+            for i in range(n)]
+
+
+def test_image_agent_sources_slides_concurrently_in_order(mock_agent_state):
+    import time
+    mock_agent_state['slide_content'] = _slides(8)
+
+    def slow_keyword(title, content):
+        time.sleep(0.2 if title == "Slide 0" else 0.05)
+        return f"kw {title}"
+
+    with patch('agents.image.agent.suggest_image_keyword', side_effect=slow_keyword), \
+         patch('agents.image.agent.find_image_url', side_effect=lambda kw: f"http://img/{kw}"), \
+         patch('agents.image.agent.Config.IMAGE_MAX_WORKERS', 8):
+        start = time.monotonic()
+        slides = image_agent(mock_agent_state)['slide_content']
+        elapsed = time.monotonic() - start
+
+    assert [s['image_url'] for s in slides] == [f"http://img/kw Slide {i}" for i in range(8)]
+    assert elapsed < 0.4  # about the slowest slide, not the sum (0.55s)
+
+
+def test_image_agent_keeps_failed_and_timed_out_slides(mock_agent_state):
+    import threading
+    slides_in = _slides(3)
+    mock_agent_state['slide_content'] = slides_in
+    release = threading.Event()
+
+    def keyword(title, content):
+        if title == "Slide 1":
+            raise RuntimeError("boom")
+        if title == "Slide 2":
+            release.wait(5)
+            raise RuntimeError("abandoned")  # never reach the unpatched services
+        return "kw"
+
+    try:
+        with patch('agents.image.agent.suggest_image_keyword', side_effect=keyword), \
+             patch('agents.image.agent.find_image_url', return_value="http://img/kw"), \
+             patch('agents.image.agent.Config.IMAGE_SLIDE_TIMEOUT', 0.1):
+            slides = image_agent(mock_agent_state)['slide_content']
+    finally:
+        release.set()
+
+    assert slides[0]['image_url'] == "http://img/kw"
+    assert slides[1] == slides_in[1]
+    assert slides[2] == slides_in[2]
+
+
+def test_unsplash_rate_limit_is_retried():
+    import requests
+    from agents.image.service import find_image_url
+    limited = requests.Response()
+    limited.status_code = 429
+    ok = MagicMock(status_code=200)
+    ok.json.return_value = {"results": [{"urls": {"regular": "http://unsplash/solar.jpg"}}]}
+
+    with patch('agents.image.service.Config.UNSPLASH_ACCESS_KEY', "key"), \
+         patch('agents.image.service.requests.get', side_effect=[limited, ok]) as get, \
+         patch('tenacity.nap.time.sleep'):
+        assert find_image_url("solar panels") == "http://unsplash/solar.jpg"
+    assert get.call_count == 2
+
+
+def test_unsplash_failure_placeholder_is_not_cached():
+    import requests
+    from agents.image.service import find_image_url
+    denied = requests.Response()
+    denied.status_code = 403
+    ok = MagicMock(status_code=200)
+    ok.json.return_value = {"results": [{"urls": {"regular": "http://unsplash/wind.jpg"}}]}
+
+    with patch('agents.image.service.Config.UNSPLASH_ACCESS_KEY', "key"), \
+         patch('agents.image.service.requests.get', side_effect=[denied, ok]) as get:
+        assert find_image_url("wind farm").startswith("https://dummyimage.com/")
+        assert find_image_url("wind farm") == "http://unsplash/wind.jpg"
+    assert get.call_count == 2
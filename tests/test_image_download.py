@@ -0,0 +1,136 @@
+"""
+Tests for tools/image_download.py and the builder's image prefetch
+"""
+import io
+import time
+import threading
+import pytest
+import sqlite3
+from unittest.mock import MagicMock, patch
+from tools.image_download import download_images
+
+
+class FakeResponse:
+    def __init__(self, body=b"img", status=200, delay=0.0):
+        self.body, self.status_code, self.delay = body, status, delay
+
+    def iter_content(self, chunk_size=65536):
+        time.sleep(self.delay)
+        for i in range(0, len(self.body), 1000):
+            yield self.body[i:i + 1000]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+@pytest.fixture
+def serve():
+    """Route pooled image sessions to `responder(url) -> FakeResponse`; records sessions created."""
+    created = []
+
+    def install(responder):
+        class Session:
+            headers = {}
+
+            def __init__(self):
+                created.append(self)
+
+            def get(self, url, **kwargs):
+                return responder(url)
+
+        return patch("tools.image_download._new_session", side_effect=Session)
+
+    install.created = created
+    return install
+
+
+class TestDownloadImages:
+    def test_downloads_concurrently_with_pooled_sessions(self, serve):
+        urls = [f"https://img{i % 3}.com/{i}.jpg" for i in range(9)]
+        with serve(lambda url: FakeResponse(url.encode(), delay=0.1)):
+            start = time.monotonic()
+            images = download_images(urls + [urls[0], None, ""], max_workers=9)
+            elapsed = time.monotonic() - start
+            again = download_images(urls[:3], max_workers=3)
+        assert images == {u: u.encode() for u in urls}
+        assert len(again) == 3
+        assert elapsed < 0.5  # 9 x 0.1s serially
+        assert len(serve.created) <= 9  # second batch reused the pooled sessions
+
+    def test_per_host_limit(self, serve):
+        active, peak, lock = [0], [0], threading.Lock()
+
+        def responder(url):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.05)
+            with lock:
+                active[0] -= 1
+            return FakeResponse()
+
+        with serve(responder), patch("tools.image_download.Config.IMAGE_DOWNLOAD_PER_HOST", 2):
+            images = download_images([f"https://cdn.com/{i}.jpg" for i in range(6)], max_workers=6)
+        assert len(images) == 6
+        assert peak[0] == 2
+
+    def test_overall_deadline_drops_slow_images(self, serve):
+        def responder(url):
+            return FakeResponse(delay=1.0 if "slow" in url else 0.0)
+
+        with serve(responder):
+            start = time.monotonic()
+            images = download_images(["https://a.com/fast.jpg", "https://b.com/slow.jpg"], deadline=0.2)
+            elapsed = time.monotonic() - start
+        assert list(images) == ["https://a.com/fast.jpg"]
+        assert elapsed < 0.5
+
+    def test_http_errors_and_oversized_images_are_skipped(self, serve):
+        def responder(url):
+            if "missing" in url:
+                return FakeResponse(status=404)
+            return FakeResponse(b"x" * 5000)
+
+        with serve(responder), patch("tools.image_download.Config.IMAGE_MAX_BYTES", 4000):
+            assert download_images(["https://a.com/missing.jpg", "https://a.com/huge.jpg"]) == {}
+
+    def test_image_store_errors_count_as_misses(self, serve):
+        store = MagicMock()
+        store.get.side_effect = sqlite3.OperationalError("database is locked")
+        store.put.side_effect = sqlite3.OperationalError("database is locked")
+        with serve(lambda url: FakeResponse(b"img")), \
+             patch("tools.image_download.get_image_store", return_value=store):
+            assert download_images(["https://a.com/1.jpg"]) == {"https://a.com/1.jpg": b"img"}
+
+    def test_failed_fetch_only_drops_its_image(self):
+        def fetch(url, deadline):
+            if "bad" in url:
+                raise ValueError("corrupt blob")
+            return b"img"
+
+        with patch("tools.image_download.fetch_image", side_effect=fetch):
+            images = download_images(["https://a.com/bad.jpg", "https://a.com/good.jpg"])
+        assert images == {"https://a.com/good.jpg": b"img"}
+
+class TestBuilderPrefetch:
+    def test_images_are_embedded_from_prefetch(self, tmp_path):
+        from PIL import Image
+        from pptx import Presentation
+        from agents.builder.service import create_presentation_service
+
+        png = io.BytesIO()
+        Image.new("RGB", (4, 4), "red").save(png, format="PNG")
+        slides = [{"title": "A", "content": "- a", "image_url": "https://img.com/a.png"},
+                  {"title": "B", "content": "- b", "image_url": "https://img.com/missing.png"}]
+
+        with patch("agents.builder.service.download_images",
+                   return_value={"https://img.com/a.png": png.getvalue()}) as prefetch:
+            path = create_presentation_service(slides, output_path=str(tmp_path / "deck.pptx"))
+
+        assert list(prefetch.call_args[0][0]) == ["https://img.com/a.png", "https://img.com/missing.png"]
+        deck = Presentation(path)
+        pictures = [[s.shape_type for s in slide.shapes].count(13) for slide in deck.slides]
+        assert pictures == [0, 1, 0]  # title slide, slide A with its image, slide B without
@@ -0,0 +1,95 @@
+"""
+Tests for tools/image_store.py and its use by image downloads
+"""
+import os
+import mmap
+import pytest
+from unittest.mock import patch
+from tools.image_store import ImageStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ImageStore(str(tmp_path / "images"), max_bytes=0)
+
+
+class TestImageStore:
+    def test_put_and_mmap_read(self, store):
+        digest = store.put("https://a.com/1.jpg", b"jpeg-bytes")
+        view = store.get("https://a.com/1.jpg")
+        assert isinstance(view, mmap.mmap)
+        assert view.read() == b"jpeg-bytes"
+        view.close()
+        assert os.path.basename(store._blob_path(digest)) == digest
+        assert store.get("https://a.com/other.jpg") is None
+
+    def test_identical_content_is_stored_once(self, store):
+        store.put("https://a.com/1.jpg", b"same")
+        store.put("https://mirror.com/1.jpg", b"same")
+        assert store.stats() == {"urls": 2, "blobs": 1, "bytes": 4}
+        blob_files = [f for _, _, files in os.walk(store.blob_dir) for f in files]
+        assert len(blob_files) == 1  # no temp files left behind
+
+    def test_shared_between_instances(self, store):
+        store.put("https://a.com/1.jpg", b"data")
+        other = ImageStore(store.directory)
+        assert other.get("https://a.com/1.jpg").read() == b"data"
+
+    def test_lru_eviction(self, tmp_path):
+        store = ImageStore(str(tmp_path / "images"), max_bytes=10)
+        store.put("https://a.com/old.jpg", b"aaaa")
+        store.put("https://a.com/used.jpg", b"bbbb")
+        with patch("tools.image_store.time.time", return_value=9e9):
+            store.get("https://a.com/used.jpg").close()  # most recently used
+        store.put("https://a.com/new.jpg", b"cccc")
+        assert store.get("https://a.com/old.jpg") is None
+        assert store.get("https://a.com/used.jpg") is not None
+        assert store.stats()["bytes"] <= 10
+
+    def test_missing_blob_is_a_miss(self, store):
+        digest = store.put("https://a.com/1.jpg", b"data")
+        os.unlink(store._blob_path(digest))
+        assert store.get("https://a.com/1.jpg") is None
+
+
+class TestStoreBackedDownloads:
+    def test_repeat_decks_do_no_network_io(self):
+        from tools.image_download import download_images
+        with patch("tools.image_download.download_image", side_effect=lambda url, deadline: url.encode()) as net:
+            first = download_images(["https://a.com/1.jpg", "https://b.com/2.jpg"])
+            second = download_images(["https://a.com/1.jpg", "https://b.com/2.jpg"])
+        assert net.call_count == 2
+        assert {u: bytes(v) for u, v in first.items()} == {u: bytes(v[:]) for u, v in second.items()}
+        assert all(isinstance(v, mmap.mmap) for v in second.values())
+
+    def test_image_agent_warms_store_for_builder(self):
+        from tools.image_download import store_image, download_images
+        with patch("tools.image_download.download_image", return_value=b"img") as net:
+            assert store_image("https://a.com/1.jpg")
+            assert store_image("https://a.com/1.jpg")
+            assert bytes(download_images(["https://a.com/1.jpg"])["https://a.com/1.jpg"][:]) == b"img"
+        assert net.call_count == 1
+
+    def test_disabled_store_always_downloads(self):
+        from tools.image_download import download_images, store_image
+        with patch("tools.image_download.Config.IMAGE_STORE_ENABLED", False), \
+             patch("tools.image_download.download_image", return_value=b"img") as net:
+            download_images(["https://a.com/1.jpg"])
+            download_images(["https://a.com/1.jpg"])
+            assert not store_image("https://a.com/1.jpg")
+        assert net.call_count == 2
+
+    def test_builder_embeds_stored_images(self, tmp_path):
+        import io
+        from PIL import Image
+        from pptx import Presentation
+        from agents.builder.service import create_presentation_service
+
+        png = io.BytesIO()
+        Image.new("RGB", (4, 4), "blue").save(png, format="PNG")
+        slides = [{"title": "A", "content": "- a", "image_url": "https://img.com/a.png"}]
+        with patch("tools.image_download.download_image", return_value=png.getvalue()) as net:
+            for i in range(2):
+                path = create_presentation_service(slides, output_path=str(tmp_path / f"deck{i}.pptx"))
+                assert [s.shape_type for s in Presentation(path).slides[1].shapes].count(13) == 1
+        assert net.call_count == 1
@@ -1,6 +1,5 @@
 
-import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 from graph import build_graph
 
 def test_full_pipeline_mocked():
@@ -41,3 +40,95 @@ def test_full_pipeline_mocked():
         mock_writer.assert_called()
         mock_image.assert_called()
         mock_builder.assert_called()
+
+
+def test_speculative_research_overlaps_planner():
+    """Topic-level searches run while the planner works, and research reuses them."""
+    import time
+    outline = [{"title": "Solar Growth", "description": "growth of solar power capacity"}]
+    calls = []
+
+    def slow_planner(state):
+        time.sleep(0.3)
+        return {"presentation_outline": outline}
+
+    def slow_search(query, max_results=8):
+        calls.append(query)
+        time.sleep(0.3)
+        return ["Solar power capacity grew by a record 400 GW in 2023.",
+                "Solar power growth is driven by falling panel prices."]
+
+    with patch('graph.planner_agent', side_effect=slow_planner), \
+         patch('agents.research.service.web_search', side_effect=slow_search), \
+         patch('graph.writer_agent', return_value={}), \
+         patch('graph.image_agent', return_value={}), \
+         patch('graph.builder_agent', return_value={"final_ppt_path": "output.pptx"}):
+        app = build_graph(speculative_research=True)
+        start = time.monotonic()
+        result = app.invoke({"topic": "Solar Energy", "slide_count": 1, "font": "Arial", "depth": "Concise",
+                             "presentation_outline": [], "slide_content": [], "final_ppt_path": ""})
+        elapsed = time.monotonic() - start
+
+    assert len(calls) == 2  # topic-level searches only; the pool covers the slide
+    assert "400 GW" in result["research_notes"]["Solar Growth"]
+    assert elapsed < 0.55  # planner and searches overlapped (serial would be >= 0.6s)
+
+
+def test_pipeline_retries_stop_at_the_run_budget():
+    """Rate-limited planner, writer and keyword calls all draw on one per-run retry budget."""
+    from contextlib import contextmanager
+    from langchain_core.runnables import RunnableLambda
+    from orchestrator.agent_controller import run_pipeline
+    from utils.error_handler import retry_budget
+
+    def _rate_limited(retry_after):
+        import requests
+        from requests.structures import CaseInsensitiveDict
+        response = requests.Response()
+        response.status_code = 429
+        response.headers = CaseInsensitiveDict({"Retry-After": retry_after})
+        return requests.HTTPError("429 Too Many Requests", response=response)
+
+    def llm(*replies):
+        calls = []
+
+        def respond(prompt):
+            reply = replies[min(len(calls), len(replies) - 1)]
+            calls.append(prompt)
+            if isinstance(reply, Exception):
+                raise reply
+            return reply
+        fake = RunnableLambda(respond)
+        fake.calls = calls
+        return fake
+
+    planner = llm(_rate_limited("0"), _rate_limited("0"),
+                  '{"outline": [{"title": "Intro", "description": "d"}, {"title": "Impact", "description": "d"}]}')
+    writer = llm(_rate_limited("0"), _rate_limited("0"),
+                 '{"slides": [{"title": "Intro", "content": "- a"}, {"title": "Impact", "content": "- b"}]}')
+    keyword = llm(_rate_limited("0"))
+    budgets = []
+
+    @contextmanager
+    def recorded_budget():
+        with retry_budget() as budget:
+            budgets.append(budget)
+            yield budget
+
+    with patch('agents.planner.service.ChatGroq', return_value=planner), \
+         patch('agents.writer.service.ChatGroq', return_value=writer), \
+         patch('agents.image.service.ChatGroq', return_value=keyword), \
+         patch('agents.research.service.web_search', return_value=[]), \
+         patch('agents.image.agent.store_image', return_value=False), \
+         patch('graph.builder_agent', return_value={"final_ppt_path": "output.pptx"}), \
+         patch('orchestrator.agent_controller.retry_budget', recorded_budget), \
+         patch('utils.error_handler.Config.RETRY_BUDGET_MAX_RETRIES', 5), \
+         patch('tenacity.nap.time.sleep'):
+        result = run_pipeline("Budget Test", slide_count=2)
+
+    budget = budgets[0]
+    assert budget.retries == 5  # planner 2 + writer 2 + one keyword retry, then the cap
+    assert budget.denied >= 1
+    assert len(planner.calls) == 3 and len(writer.calls) == 3
+    assert len(keyword.calls) == 3  # two slides, only one of them retried
+    assert [s["image_keyword"] for s in result["slide_content"]] == ["Intro", "Impact"]  # title fallback
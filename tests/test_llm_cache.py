@@ -0,0 +1,93 @@
+"""
+Tests for tools/llm_cache.py
+"""
+import pytest
+from unittest.mock import patch
+
+from langchain_core.globals import get_llm_cache, set_llm_cache
+from langchain_core.output_parsers import JsonOutputParser
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+
+from tools.llm_cache import PromptCache, discard_on_error, install_llm_cache
+
+
+def _model(cache, responses):
+    messages = iter(
+        AIMessage(content=text, usage_metadata={"input_tokens": 100, "output_tokens": 20, "total_tokens": 120})
+        for text in responses
+    )
+    return GenericFakeChatModel(messages=messages, cache=cache)
+
+
+class TestPromptCache:
+    def test_repeat_prompt_is_served_from_cache(self, tmp_path):
+        cache = PromptCache(str(tmp_path / "llm.sqlite3"))
+        model = _model(cache, ["first", "second"])
+        assert model.invoke("Outline AI in Healthcare").content == "first"
+        assert model.invoke("Outline AI in Healthcare").content == "first"
+        assert model.invoke("Outline Climate Change").content == "second"
+
+    def test_savings_count_tokens_of_hits(self, tmp_path):
+        cache = PromptCache(str(tmp_path / "llm.sqlite3"))
+        model = _model(cache, ["answer"])
+        for _ in range(3):
+            model.invoke("Same prompt")
+        savings = cache.savings()
+        assert savings["entries"] == 1
+        assert savings["hits"] == 2
+        assert savings["input_tokens_saved"] == 200
+        assert savings["output_tokens_saved"] == 40
+        assert savings["dollars_saved"] > 0
+
+    def test_entries_shared_between_instances(self, tmp_path):
+        path = str(tmp_path / "llm.sqlite3")
+        _model(PromptCache(path), ["stored"]).invoke("Prompt")
+        assert _model(PromptCache(path), ["fresh"]).invoke("Prompt").content == "stored"
+
+    def test_clear(self, tmp_path):
+        cache = PromptCache(str(tmp_path / "llm.sqlite3"))
+        _model(cache, ["a"]).invoke("Prompt")
+        cache.clear()
+        assert cache.savings()["entries"] == 0
+
+
+class TestDiscardOnError:
+    @pytest.fixture
+    def cache(self, tmp_path):
+        cache = PromptCache(str(tmp_path / "llm.sqlite3"))
+        set_llm_cache(cache)
+        yield cache
+        set_llm_cache(None)
+
+    def test_unparseable_reply_is_not_replayed(self, cache):
+        chain = _model(None, ["not json", '{"ok": true}']) | JsonOutputParser()
+        with pytest.raises(ValueError):
+            with discard_on_error():
+                chain.invoke("Outline AI")
+        assert cache.savings()["entries"] == 0
+
+        with discard_on_error():
+            assert chain.invoke("Outline AI") == {"ok": True}
+        assert cache.savings()["entries"] == 1
+
+    def test_parsed_reply_stays_cached(self, cache):
+        chain = _model(None, ['{"ok": true}']) | JsonOutputParser()
+        with discard_on_error():
+            chain.invoke("Outline AI")
+        with discard_on_error():
+            assert chain.invoke("Outline AI") == {"ok": True}
+        assert cache.savings()["hits"] == 1
+
+
+class TestInstall:
+    def test_install_respects_config(self):
+        assert install_llm_cache() is None  # disabled by the conftest fixture
+        assert get_llm_cache() is None
+
+    def test_install_is_idempotent(self, tmp_path):
+        with patch("tools.llm_cache.Config.LLM_CACHE_ENABLED", True), \
+             patch("tools.llm_cache.Config.CACHE_DIR", str(tmp_path)):
+            first = install_llm_cache()
+            assert install_llm_cache() is first
+            assert get_llm_cache() is first
@@ -0,0 +1,89 @@
+"""
+Tests for tools/local_corpus.py
+"""
+import os
+import numpy as np
+import pytest
+from unittest.mock import patch
+from tools.local_corpus import CorpusIndex, split_passages
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "solar.md").write_text(
+        "# Solar power\n\nSolar panels convert sunlight into electricity using photovoltaic cells.\n\n"
+        "Panel efficiency has risen above 22 percent for commercial modules."
+    )
+    (docs / "wind.txt").write_text("Wind turbines generate electricity from moving air on land and offshore.")
+    (docs / "notes.csv").write_text("solar,ignored")
+    return docs
+
+
+@pytest.fixture
+def index(tmp_path):
+    return CorpusIndex(str(tmp_path / "index"))
+
+
+class TestSplitPassages:
+    def test_merges_short_paragraphs_and_strips_headings(self):
+        assert split_passages("# Title\n\nFirst.\n\nSecond.") == ["Title First. Second."]
+
+    def test_long_text_is_split_on_word_boundaries(self):
+        passages = split_passages("word " * 100, max_chars=50)
+        assert all(len(p) <= 50 for p in passages)
+        assert " ".join(passages).split() == ["word"] * 100
+
+
+class TestCorpusIndex:
+    def test_search_ranks_matching_passages(self, corpus, index):
+        summary = index.update(str(corpus))
+        assert summary == {"files": 2, "passages": 2, "reindexed": 2, "removed": 0}
+        hits = index.search("photovoltaic solar panels")
+        assert hits[0]["title"] == "solar.md"
+        assert "photovoltaic" in hits[0]["body"]
+        assert index.search("electricity", max_results=1)[0]["score"] > 0
+        assert index.search("quantum chromodynamics") == []
+
+    def test_postings_are_memory_mapped(self, corpus, index):
+        index.update(str(corpus))
+        index.search("solar")
+        assert isinstance(index._postings, np.memmap)
+
+    def test_search_without_index_returns_empty(self, index):
+        assert index.search("solar") == []
+
+    def test_update_only_rereads_changed_files(self, corpus, index):
+        index.update(str(corpus))
+        assert index.update(str(corpus))["reindexed"] == 0
+
+        (corpus / "wind.txt").write_text("Offshore wind farms now supply hydrogen electrolysers.")
+        os.utime(corpus / "wind.txt", ns=(1, 1))
+        (corpus / "solar.md").unlink()
+        summary = index.update(str(corpus))
+        assert summary["reindexed"] == 1 and summary["removed"] == 1
+        assert index.search("hydrogen")[0]["title"] == "wind.txt"
+        assert index.search("photovoltaic") == []
+
+    def test_unchanged_files_keep_their_passages(self, corpus, index):
+        index.update(str(corpus))
+        (corpus / "hydro.md").write_text("Hydroelectric dams store energy in reservoirs.")
+        with patch("tools.local_corpus.split_passages", wraps=split_passages) as splitter:
+            index.update(str(corpus))
+        assert splitter.call_count == 1
+        assert index.search("photovoltaic")[0]["title"] == "solar.md"
+
+    def test_rebuilds_switch_versions_atomically(self, corpus, index):
+        index.update(str(corpus))
+        reader = CorpusIndex(index.index_dir)
+        assert reader.search("photovoltaic")[0]["title"] == "solar.md"
+
+        for i in range(3):
+            (corpus / f"extra{i}.md").write_text(f"Geothermal plant number {i} taps hot rock.")
+            index.update(str(corpus))
+        versions = sorted(d for d in os.listdir(index.index_dir) if d.startswith("v"))
+        assert len(versions) == 2  # the live build and the one before it
+        with open(os.path.join(index.index_dir, "CURRENT")) as f:
+            assert f.read() == versions[-1]
+        assert reader.search("geothermal")[0]["title"].startswith("extra")
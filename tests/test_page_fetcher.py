@@ -0,0 +1,182 @@
+"""
+Tests for tools/page_fetcher.py
+"""
+import time
+import threading
+import pytest
+import requests
+from unittest.mock import patch
+from tools.page_fetcher import extract_main_text, fetch_page_text, fetch_pages
+from tools.session_pool import reset_pools
+
+ARTICLE = """
+<html><head><title>Solar</title><script>var tracking = "do not index this script text at all";</script></head>
+<body>
+  <nav><a href="/">Home</a> <a href="/about">About us and other navigation links here</a></nav>
+  <div>Subscribe to our newsletter for weekly updates on energy and climate news today!</div>
+  <article>
+    <h1>Solar power</h1>
+    <p>Solar panels convert sunlight into electricity using photovoltaic cells made of silicon.</p>
+    <p>Commercial panel efficiency now exceeds <b>22 percent</b> for the best mass-produced modules.</p>
+    <p>Share</p>
+  </article>
+  <footer>Copyright 2024 Example Media Group, all rights reserved worldwide forever.</footer>
+</body></html>
+"""
+
+
+class FakeResponse:
+    def __init__(self, body: bytes, content_type="text/html; charset=utf-8", status=200, chunk=1024):
+        self.body, self.status_code, self.chunk = body, status, chunk
+        self.headers = {"Content-Type": content_type}
+        self.bytes_read = 0
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code}", response=self)
+
+    def iter_content(self, chunk_size=1024):
+        for i in range(0, len(self.body), self.chunk):
+            self.bytes_read += self.chunk
+            yield self.body[i:i + self.chunk]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class FakeSession:
+    def __init__(self, responder):
+        self.responder = responder
+        self.headers = {}
+        self.calls = []
+
+    def get(self, url, **kwargs):
+        self.calls.append(url)
+        return self.responder(url)
+
+
+@pytest.fixture
+def serve():
+    """Route the pooled sessions to `responder(url) -> FakeResponse`."""
+    sessions = []
+
+    def install(responder):
+        def factory():
+            sessions.append(FakeSession(responder))
+            return sessions[-1]
+        return patch("tools.page_fetcher._new_session", side_effect=factory)
+
+    install.sessions = sessions
+    return install
+
+
+class TestExtractMainText:
+    def test_keeps_article_paragraphs_only(self):
+        text = extract_main_text(ARTICLE)
+        assert text.split("\n\n") == [
+            "Solar panels convert sunlight into electricity using photovoltaic cells made of silicon.",
+            "Commercial panel efficiency now exceeds 22 percent for the best mass-produced modules.",
+        ]
+
+    def test_without_article_drops_boilerplate_and_short_blocks(self):
+        html = ("<body><header>Site title and a long tagline about nothing in particular</header>"
+                "<p>Wind turbines generate electricity from moving air, on land and offshore.</p>"
+                "<p>Read more</p><style>p { color: red; font-size: 12px; margin: 0 auto; }</style></body>")
+        assert extract_main_text(html) == "Wind turbines generate electricity from moving air, on land and offshore."
+
+
+class TestFetchPageText:
+    def test_extracts_and_caches_text(self, serve):
+        with serve(lambda url: FakeResponse(ARTICLE.encode())):
+            first = fetch_page_text("https://example.com/solar")
+            second = fetch_page_text("https://example.com/solar")
+        assert "photovoltaic" in first and first == second
+        assert sum(len(s.calls) for s in serve.sessions) == 1
+
+    def test_body_is_capped_while_streaming(self, serve):
+        response = FakeResponse(b"<p>" + b"word " * 100_000 + b"</p>", chunk=1000)
+        with serve(lambda url: response), patch("tools.page_fetcher.Config.PAGE_FETCH_MAX_BYTES", 5000):
+            text = fetch_page_text("https://example.com/huge")
+        assert response.bytes_read <= 5000
+        assert len(text) <= 5000
+
+    def test_non_text_content_is_skipped(self, serve):
+        response = FakeResponse(b"%PDF-1.7 binary", content_type="application/pdf")
+        with serve(lambda url: response):
+            assert fetch_page_text("https://example.com/report.pdf") == ""
+        assert response.bytes_read == 0
+
+    def test_plain_text_pages(self, serve):
+        with serve(lambda url: FakeResponse(b"First  paragraph.\n\n\nSecond\nparagraph.", "text/plain")):
+            assert fetch_page_text("https://example.com/a.txt") == "First paragraph.\n\nSecond paragraph."
+
+    def test_http_errors_raise_and_are_not_cached(self, serve):
+        with serve(lambda url: FakeResponse(b"", status=503)):
+            with pytest.raises(requests.HTTPError):
+                fetch_page_text("https://example.com/down")
+        reset_pools()
+        with serve(lambda url: FakeResponse(ARTICLE.encode())):
+            assert "photovoltaic" in fetch_page_text("https://example.com/down")
+
+
+class TestFetchPages:
+    def test_failures_become_empty_text(self, serve):
+        def responder(url):
+            return FakeResponse(b"", status=404) if "missing" in url else FakeResponse(ARTICLE.encode())
+
+        with serve(responder):
+            pages = fetch_pages(["https://a.com/ok", "https://a.com/missing", "https://a.com/ok", "ftp://x"])
+        assert list(pages) == ["https://a.com/ok", "https://a.com/missing"]
+        assert "photovoltaic" in pages["https://a.com/ok"] and pages["https://a.com/missing"] == ""
+
+    def test_slow_host_is_cut_off_at_the_deadline(self, serve):
+        release = threading.Event()
+
+        def responder(url):
+            if "slow" in url:
+                release.wait(5)
+                raise requests.ConnectionError("abandoned")
+            return FakeResponse(ARTICLE.encode())
+
+        try:
+            with serve(responder):
+                start = time.monotonic()
+                pages = fetch_pages(["https://fast.com/a", "https://slow.com/b"], deadline=0.3)
+                elapsed = time.monotonic() - start
+        finally:
+            release.set()
+        assert "photovoltaic" in pages["https://fast.com/a"] and pages["https://slow.com/b"] == ""
+        assert elapsed < 0.8
+
+    def test_fetches_share_the_callers_retry_budget(self):
+        from utils.error_handler import retry_budget, current_retry_budget
+        seen = []
+        with retry_budget() as budget, \
+             patch("tools.page_fetcher.fetch_page_text", side_effect=lambda url: seen.append(current_retry_budget()) or "text"):
+            fetch_pages(["https://a.com/1", "https://b.com/2"])
+        assert seen == [budget, budget]
+
+    def test_concurrency_is_bounded_per_host(self, serve):
+        active, peak, lock = {}, {}, threading.Lock()
+
+        def responder(url):
+            host = url.split("/")[2]
+            with lock:
+                active[host] = active.get(host, 0) + 1
+                peak[host] = max(peak.get(host, 0), active[host])
+            time.sleep(0.05)
+            with lock:
+                active[host] -= 1
+            return FakeResponse(ARTICLE.encode())
+
+        urls = [f"https://{host}/{i}" for host in ("a.com", "b.com") for i in range(6)]
+        with serve(responder), patch("tools.page_fetcher.Config.PAGE_FETCH_PER_HOST", 2):
+            start = time.monotonic()
+            pages = fetch_pages(urls, max_workers=8)
+            elapsed = time.monotonic() - start
+        assert all(pages.values())
+        assert peak == {"a.com": 2, "b.com": 2}
+        assert elapsed < 0.05 * 12 / 2  # both hosts fetched in parallel
@@ -106,3 +106,72 @@ def test_planner_agent_mock_run(MockLLM, mock_agent_state):
 
     # Let's fallback to verifying input validation coverage which IS testable.
     pass
+
+
+def _rate_limited(retry_after="1"):
+    import requests
+    from requests.structures import CaseInsensitiveDict
+    response = requests.Response()
+    response.status_code = 429
+    response.headers = CaseInsensitiveDict({"Retry-After": retry_after})
+    return requests.HTTPError("429 Too Many Requests", response=response)
+
+
+def _fake_llm(*replies):
+    """ChatGroq stand-in answering each call with the next reply (raised if an exception)."""
+    from langchain_core.runnables import RunnableLambda
+    calls = []
+
+    def respond(prompt):
+        reply = replies[min(len(calls), len(replies) - 1)]
+        calls.append(prompt)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+    llm = RunnableLambda(respond)
+    llm.calls = calls
+    return llm
+
+
+OUTLINE_JSON = '{"outline": [{"title": "Intro", "description": "d"}, {"title": "Impact", "description": "d"}]}'
+
+
+def test_rate_limited_outline_is_retried():
+    """A 429 from the LLM goes through api_retry (honoring Retry-After) instead of the fallback."""
+    from agents.planner.service import plan_outline_service
+    llm = _fake_llm(_rate_limited("1"), OUTLINE_JSON)
+    with patch('agents.planner.service.ChatGroq', return_value=llm), \
+         patch('tenacity.nap.time.sleep') as sleep:
+        outline = plan_outline_service("Rate Limited Topic", 2, "Concise")
+
+    assert [s["title"] for s in outline] == ["Intro", "Impact"]
+    assert len(llm.calls) == 2
+    sleep.assert_called_once_with(1.0)
+
+
+def test_error_outline_is_not_cached():
+    from agents.planner.service import plan_outline_service
+    with patch('agents.planner.service.ChatGroq', return_value=_fake_llm(RuntimeError("boom"))):
+        assert plan_outline_service("Flaky Topic", 2, "Concise")[0]["title"] == "Error"
+
+    llm = _fake_llm(OUTLINE_JSON)
+    with patch('agents.planner.service.ChatGroq', return_value=llm):
+        outline = plan_outline_service("Flaky Topic", 2, "Concise")
+    assert outline[0]["title"] == "Intro" and len(llm.calls) == 1
+
+
+
+def test_open_circuit_falls_back_without_caching():
+    from agents.planner.service import plan_outline_service
+    from tools.circuit_breaker import get_breaker
+    breaker = get_breaker("groq")
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+
+    llm = _fake_llm(OUTLINE_JSON)
+    with patch('agents.planner.service.ChatGroq', return_value=llm):
+        assert plan_outline_service("Outage Topic", 2, "Concise")[0]["title"] == "Error"
+        assert llm.calls == []
+        breaker.record_success()
+        assert plan_outline_service("Outage Topic", 2, "Concise")[0]["title"] == "Intro"
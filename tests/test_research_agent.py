@@ -6,10 +6,10 @@ from unittest.mock import patch
 
 
 class TestResearchService:
-    @patch("agents.research.service.web_search_formatted")
+    @patch("agents.research.service.web_search")
     def test_returns_notes_for_each_slide(self, mock_search):
         from agents.research.service import research_slides_service
-        mock_search.return_value = "- Fact 1\n- Fact 2"
+        mock_search.return_value = ["Fact 1", "Fact 2"]
 
         outline = [
             {"title": "Intro", "description": "Introduction to AI"},
@@ -21,7 +21,7 @@ class TestResearchService:
         assert "Impact" in notes
         assert notes["Intro"] == "- Fact 1\n- Fact 2"
 
-    @patch("agents.research.service.web_search_formatted", return_value="")
+    @patch("agents.research.service.web_search", return_value=[])
     def test_empty_research_on_no_results(self, mock_search):
         from agents.research.service import research_slides_service
         outline = [{"title": "Topic", "description": "Desc"}]
@@ -33,6 +33,236 @@ class TestResearchService:
         notes = research_slides_service([])
         assert notes == {}
 
+    def test_searches_run_concurrently(self):
+        import time
+        from agents.research.service import research_slides_service
+
+        def slow_search(query, max_results=3):
+            time.sleep(0.2)
+            return [query]
+
+        outline = [{"title": f"Slide {i}", "description": "d"} for i in range(5)]
+        with patch("agents.research.service.web_search", side_effect=slow_search):
+            start = time.monotonic()
+            notes = research_slides_service(outline, max_workers=5)
+        assert time.monotonic() - start < 0.6
+        assert list(notes) == [f"Slide {i}" for i in range(5)]
+        assert notes["Slide 3"] == "- Slide 3: d"
+
+    def test_timed_out_search_returns_partial_results(self):
+        import time
+        from agents.research.service import research_slides_service
+
+        def search(query, max_results=3):
+            if query.startswith("Slow"):
+                time.sleep(1.0)
+            return ["fact"]
+
+        outline = [{"title": "Fast", "description": "d"}, {"title": "Slow", "description": "d"}]
+        with patch("agents.research.service.web_search", side_effect=search):
+            start = time.monotonic()
+            notes = research_slides_service(outline, timeout=0.2)
+        assert time.monotonic() - start < 0.8
+        assert notes == {"Fast": "- fact", "Slow": ""}
+
+    def test_hung_searches_cannot_block_research(self):
+        import time
+        import threading
+        from agents.research.service import research_slides_service
+        release = threading.Event()
+
+        def search(query, max_results=3):
+            if query.startswith("Hung"):
+                release.wait(5)
+            return ["fact"]
+
+        outline = [{"title": "Hung", "description": "d"}] + [{"title": f"Queued {i}", "description": "d"} for i in range(3)]
+        try:
+            with patch("agents.research.service.web_search", side_effect=search):
+                start = time.monotonic()
+                notes = research_slides_service(outline, max_workers=1, timeout=0.1)
+                elapsed = time.monotonic() - start
+        finally:
+            release.set()
+        assert elapsed < 0.8  # one overall deadline (0.1s x 4 waves), not an endless wait
+        assert list(notes) == [s["title"] for s in outline] and notes["Hung"] == ""
+
+    def test_failed_search_is_empty(self):
+        from agents.research.service import research_slides_service
+        outline = [{"title": "A", "description": "d"}]
+        with patch("agents.research.service.web_search", side_effect=RuntimeError("boom")):
+            assert research_slides_service(outline) == {"A": ""}
+
+
+class TestPooledResearch:
+    OUTLINE = [
+        {"title": "Solar Growth", "description": "growth of solar power capacity"},
+        {"title": "Wind Farms", "description": "offshore wind farm installations"},
+        {"title": "Battery Storage", "description": "grid battery storage costs"},
+        {"title": "Hydrogen", "description": "green hydrogen electrolysis projects"},
+    ]
+    POOL = [
+        "Solar power capacity grew by a record 400 GW in 2023.",
+        "Solar power growth is driven by falling panel prices.",
+        "Offshore wind farm installations reached 10 GW in Europe.",
+        "Wind farm installations offshore face supply chain limits.",
+        "Grid battery storage costs fell 20% in a year.",
+        "Battery storage on the grid smooths solar output; storage costs keep falling.",
+    ]
+
+    def test_covered_slides_skip_their_own_search(self):
+        from agents.research.service import research_slides_service
+        calls = []
+
+        def search(query, max_results=8):
+            calls.append(query)
+            if query.startswith("Renewable Energy"):
+                return self.POOL
+            return ["Electrolysis projects for green hydrogen doubled."]
+
+        with patch("agents.research.service.web_search", side_effect=search):
+            notes = research_slides_service(self.OUTLINE, topic="Renewable Energy")
+
+        assert len(calls) == 3  # 2 topic-level searches + 1 targeted (Hydrogen)
+        assert sum(q.startswith("Renewable Energy") for q in calls) == 2
+        assert "Hydrogen" in calls[-1]
+        assert "400 GW" in notes["Solar Growth"]
+        assert "Offshore wind" in notes["Wind Farms"]
+        assert "Electrolysis" in notes["Hydrogen"]
+
+    def test_targeted_searches_are_capped(self):
+        from agents.research.service import research_slides_service
+        calls = []
+
+        def search(query, max_results=8):
+            calls.append(query)
+            return self.POOL if query.startswith("Anything") else []
+
+        outline = [{"title": f"Slide {i}", "description": f"subject {i}"} for i in range(10)]
+        with patch("agents.research.service.web_search", side_effect=search), \
+             patch("agents.research.service.Config.RESEARCH_MAX_TARGETED_SEARCHES", 3):
+            research_slides_service(outline, topic="Anything")
+        assert len(calls) == 2 + 3
+
+    def test_unrelated_pool_snippets_are_not_used_as_facts(self):
+        from agents.research.service import research_slides_service
+
+        def search(query, max_results=8):
+            return self.POOL if query.startswith("Renewable Energy") else []
+
+        with patch("agents.research.service.web_search", side_effect=search), \
+             patch("agents.research.service.Config.RESEARCH_MAX_TARGETED_SEARCHES", 0):
+            notes = research_slides_service(self.OUTLINE, topic="Renewable Energy")
+        assert "400 GW" in notes["Solar Growth"]
+        assert notes["Hydrogen"] == ""
+
+    def test_failed_topic_searches_fall_back_to_per_slide(self):
+        from agents.research.service import research_slides_service
+        calls = []
+
+        def search(query, max_results=8):
+            calls.append(query)
+            if query.startswith("Renewable Energy"):
+                raise RuntimeError("rate limited")
+            return [f"Fact about {query.split(':')[0]}."]
+
+        outline = [{"title": f"Slide {i}", "description": f"subject {i}"} for i in range(6)]
+        with patch("agents.research.service.web_search", side_effect=search), \
+             patch("agents.research.service.Config.RESEARCH_MAX_TARGETED_SEARCHES", 3):
+            notes = research_slides_service(outline, topic="Renewable Energy")
+        assert len(calls) == 2 + len(outline)
+        assert all(notes[s["title"]] for s in outline)
+
+    def test_prefetched_results_replace_topic_searches(self):
+        from agents.research.service import research_slides_service, prefetch_topic_research
+        with patch("agents.research.service.web_search", return_value=self.POOL) as search:
+            prefetched = prefetch_topic_research("Renewable Energy")
+        assert search.call_count == 2
+
+        with patch("agents.research.service.web_search",
+                   return_value=["Electrolysis projects for green hydrogen doubled."]) as search:
+            notes = research_slides_service(self.OUTLINE, topic="Renewable Energy", prefetched=prefetched)
+        assert [c.args[0] for c in search.call_args_list] == ["Hydrogen: green hydrogen electrolysis projects"]
+        assert "400 GW" in notes["Solar Growth"]
+        assert "Electrolysis" in notes["Hydrogen"]
+
+    def test_per_slide_strategy(self):
+        from agents.research.service import research_slides_service
+        with patch("agents.research.service.web_search", return_value=[]) as search, \
+             patch("agents.research.service.Config.RESEARCH_STRATEGY", "per_slide"):
+            research_slides_service(self.OUTLINE, topic="Renewable Energy")
+        assert search.call_count == len(self.OUTLINE)
+
+
+class TestDeepResearch:
+    OUTLINE = [{"title": "Solar Efficiency", "description": "photovoltaic panel efficiency records"}]
+    PAGE = "\n\n".join([
+        "Our newsletter covers every corner of the energy industry each week.",
+        "Record photovoltaic panel efficiency reached 47 percent in multi-junction lab cells.",
+        "Commercial solar panel efficiency now exceeds 22 percent for mass-produced modules.",
+    ])
+
+    def test_top_pages_add_relevant_passages(self):
+        from agents.research.service import research_slides_service
+        hits = [{"title": "a", "body": "Solar efficiency keeps climbing.", "href": "https://a.com/1"},
+                {"title": "b", "body": "Panels are getting better.", "href": "https://b.com/2"},
+                {"title": "c", "body": "Third result.", "href": "https://c.com/3"}]
+        with patch("agents.research.service.web_search_results", return_value=hits), \
+             patch("agents.research.service.fetch_pages", return_value={"https://a.com/1": self.PAGE}) as fetch, \
+             patch("agents.research.service.Config.RESEARCH_FETCH_PAGES", True), \
+             patch("agents.research.service.Config.RESEARCH_PAGES_PER_QUERY", 2), \
+             patch("agents.research.service.Config.RESEARCH_PASSAGE_CHARS", 100), \
+             patch("agents.research.service.Config.RESEARCH_SNIPPETS_PER_SLIDE", 5):
+            notes = research_slides_service(self.OUTLINE)
+
+        assert fetch.call_args[0][0] == ["https://a.com/1", "https://b.com/2"]
+        assert "47 percent" in notes["Solar Efficiency"]
+        assert "newsletter" not in notes["Solar Efficiency"]
+
+    def test_disabled_by_default(self):
+        from agents.research.service import research_slides_service
+        with patch("agents.research.service.web_search", return_value=["Solar panel efficiency facts."]), \
+             patch("agents.research.service.fetch_pages") as fetch:
+            research_slides_service(self.OUTLINE)
+        fetch.assert_not_called()
+
+
+class TestSnippetRanking:
+    def test_relevant_snippets_first_and_irrelevant_dropped(self):
+        from agents.research.ranking import rank_snippets
+        queries = {"Solar": "Solar Power: growth of solar panel installations"}
+        candidates = {"Solar": [
+            "The football season starts in August.",
+            "Solar panel installations grew 30% last year.",
+            "Global solar power capacity passed 1 TW.",
+        ]}
+        selected = rank_snippets(queries, candidates, per_slide=3)
+        assert selected["Solar"][0] == "Solar panel installations grew 30% last year."
+        assert "The football season starts in August." not in selected["Solar"]
+
+    def test_near_duplicates_removed_across_deck(self):
+        from agents.research.ranking import rank_snippets
+        queries = {"Intro": "Electric vehicles: introduction", "Market": "Electric vehicle market share"}
+        candidates = {
+            "Intro": ["Electric vehicles made up 18% of new car sales in 2023."],
+            "Market": ["Electric vehicles made up 18% of new car sales in 2023!",
+                       "China is the largest electric vehicle market."],
+        }
+        selected = rank_snippets(queries, candidates, per_slide=3)
+        all_kept = selected["Intro"] + selected["Market"]
+        assert sum("18%" in s for s in all_kept) == 1
+        assert "China is the largest electric vehicle market." in selected["Market"]
+
+    def test_keeps_best_k_per_slide(self):
+        from agents.research.ranking import rank_snippets
+        queries = {"AI": "artificial intelligence in hospitals"}
+        candidates = {"AI": [f"Hospital {i} uses artificial intelligence for triage case {i}." for i in range(6)]}
+        assert len(rank_snippets(queries, candidates, per_slide=2, duplicate_threshold=1.01)["AI"]) == 2
+
+    def test_slides_without_candidates_get_empty_lists(self):
+        from agents.research.ranking import rank_snippets
+        assert rank_snippets({"A": "a query"}, {}) == {"A": []}
+
 
 class TestResearchAgent:
     @patch("agents.research.agent.research_slides_service")
@@ -0,0 +1,203 @@
+"""
+Tests for tools/retry.py
+"""
+import json
+import pytest
+import requests
+from unittest.mock import patch
+from requests.structures import CaseInsensitiveDict
+from langchain_core.exceptions import OutputParserException
+
+from tools.retry import api_retry, is_retryable, retry_after_seconds, full_jitter
+
+
+def _http_error(status, headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response.headers = CaseInsensitiveDict(headers or {})
+    return requests.HTTPError(f"{status} error", response=response)
+
+
+class RateLimitError(Exception):
+    """Stand-in for a client library's rate-limit exception."""
+
+
+@pytest.fixture(autouse=True)
+def no_sleep():
+    with patch("tenacity.nap.time.sleep") as sleep:
+        yield sleep
+
+
+class TestClassifier:
+    @pytest.mark.parametrize("exc", [
+        requests.Timeout("slow"), requests.ConnectionError("reset"), TimeoutError(),
+        _http_error(429), _http_error(503), RateLimitError("too many"),
+    ])
+    def test_transient_errors_are_retryable(self, exc):
+        assert is_retryable(exc)
+
+    @pytest.mark.parametrize("exc", [
+        json.JSONDecodeError("bad", "{", 0), OutputParserException("bad json"), KeyError("title"),
+        _http_error(400), _http_error(401), RuntimeError("unknown"),
+    ])
+    def test_deterministic_errors_are_not_retryable(self, exc):
+        assert not is_retryable(exc)
+
+
+class TestRetryAfter:
+    def test_seconds_and_milliseconds(self):
+        assert retry_after_seconds(_http_error(429, {"Retry-After": "3"})) == 3
+        assert retry_after_seconds(_http_error(429, {"retry-after-ms": "1500"})) == 1.5
+
+    def test_http_date(self):
+        exc = _http_error(503, {"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})
+        assert retry_after_seconds(exc) == 0.0  # in the past
+
+    def test_missing_hint(self):
+        assert retry_after_seconds(_http_error(503)) is None
+        assert retry_after_seconds(ValueError()) is None
+
+
+class TestApiRetry:
+    def test_deterministic_failure_fails_fast(self, no_sleep):
+        calls = []
+
+        @api_retry
+        def parse():
+            calls.append(1)
+            raise OutputParserException("not json")
+
+        with pytest.raises(OutputParserException):
+            parse()
+        assert len(calls) == 1
+        no_sleep.assert_not_called()
+
+    def test_transient_failure_is_retried(self):
+        calls = []
+
+        @api_retry
+        def flaky():
+            calls.append(1)
+            if len(calls) < 3:
+                raise requests.ConnectionError("reset")
+            return "ok"
+
+        assert flaky() == "ok"
+        assert len(calls) == 3
+
+    def test_retry_after_is_honored(self, no_sleep):
+        @api_retry
+        def limited():
+            raise _http_error(429, {"Retry-After": "2"})
+
+        with pytest.raises(requests.HTTPError):
+            limited()
+        assert [c.args[0] for c in no_sleep.call_args_list] == [2.0, 2.0]
+
+    def test_long_retry_after_fails_fast(self, no_sleep):
+        @api_retry
+        def limited():
+            raise _http_error(429, {"Retry-After": "3600"})
+
+        with pytest.raises(requests.HTTPError):
+            limited()
+        no_sleep.assert_not_called()
+
+    def test_full_jitter_is_bounded(self):
+        waits = [full_jitter(4, base=1, cap=5) for _ in range(200)]
+        assert all(0 <= w <= 5 for w in waits)
+        assert max(waits) > 2.5  # spread over the whole range, not pinned to the cap
+
+
+class TestRetryBudget:
+    def test_budget_stops_api_retry(self, no_sleep):
+        from utils.error_handler import retry_budget
+        calls = []
+
+        @api_retry
+        def flaky():
+            calls.append(1)
+            raise requests.ConnectionError("reset")
+
+        with retry_budget(max_retries=1, max_backoff_seconds=60) as budget:
+            with pytest.raises(requests.ConnectionError):
+                flaky()
+            with pytest.raises(requests.ConnectionError):
+                flaky()
+        assert len(calls) == 3  # 2 attempts, then 1 attempt once the budget is spent
+        assert budget.retries == 1 and budget.denied >= 1
+
+    def test_backoff_seconds_are_budgeted(self, no_sleep):
+        from utils.error_handler import retry_budget
+
+        @api_retry
+        def limited():
+            raise _http_error(429, {"Retry-After": "5"})
+
+        with retry_budget(max_retries=10, max_backoff_seconds=8) as budget:
+            with pytest.raises(requests.HTTPError):
+                limited()
+        assert budget.backoff_seconds == 5
+        assert no_sleep.call_count == 1
+
+    def test_no_budget_outside_a_run(self):
+        from utils.error_handler import current_retry_budget, consume_retry_budget
+        assert current_retry_budget() is None
+        assert consume_retry_budget(1000)
+
+
+class TestAsyncRetry:
+    def test_async_service_is_retried_without_blocking_the_loop(self):
+        import asyncio
+        from utils.error_handler import RetryPolicy
+        from tenacity import wait_fixed
+        policy = RetryPolicy(max_attempts=3, wait=wait_fixed(0.2), retry=lambda rs: rs.outcome.failed)
+        events = []
+
+        @policy
+        async def flaky():
+            events.append("attempt")
+            if events.count("attempt") < 2:
+                raise ConnectionError("reset")
+            return "ok"
+
+        async def other_deck():
+            await asyncio.sleep(0.05)
+            events.append("other deck")
+
+        async def main():
+            return await asyncio.gather(flaky(), other_deck())
+
+        assert asyncio.run(main())[0] == "ok"
+        assert events == ["attempt", "other deck", "attempt"]
+
+    def test_api_retry_policy_wraps_coroutines(self):
+        import asyncio
+        calls = []
+
+        @api_retry
+        async def parse():
+            calls.append(1)
+            raise OutputParserException("not json")
+
+        with pytest.raises(OutputParserException):
+            asyncio.run(parse())
+        assert len(calls) == 1
+
+    def test_async_retries_respect_budget(self):
+        import asyncio
+        from utils.error_handler import retry_budget, with_retry
+        calls = []
+
+        @with_retry(retries=5, delay=0)
+        async def down():
+            calls.append(1)
+            raise ConnectionError("down")
+
+        async def main():
+            with retry_budget(max_retries=2, max_backoff_seconds=60):
+                await down()
+
+        with pytest.raises(ConnectionError):
+            asyncio.run(main())
+        assert len(calls) == 3
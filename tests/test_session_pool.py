@@ -0,0 +1,96 @@
+"""
+Tests for tools/session_pool.py
+"""
+import threading
+import pytest
+import requests
+from unittest.mock import MagicMock, patch
+
+from tools.session_pool import SessionPool
+
+
+def _pool(**kwargs):
+    factory = MagicMock(side_effect=lambda: MagicMock())
+    return SessionPool("test", factory, **{"size": 2, "max_uses": 0, "max_age": 0, "max_failures": 2, **kwargs}), factory
+
+
+class TestSessionPool:
+    def test_sessions_are_reused(self):
+        pool, factory = _pool()
+        clients = []
+        for _ in range(5):
+            with pool.session() as client:
+                clients.append(client)
+        assert all(c is clients[0] for c in clients)
+        assert factory.call_count == 1
+
+    def test_concurrent_checkouts_get_distinct_sessions(self):
+        pool, factory = _pool()
+        with pool.session() as a, pool.session() as b:
+            assert a is not b
+        assert pool.stats()["idle"] == 2
+
+    def test_size_bounds_checkouts(self):
+        pool, _ = _pool(size=1, acquire_timeout=0.05)
+        with pool.session():
+            with pytest.raises(TimeoutError):
+                with pool.session():
+                    pass
+
+    def test_recycled_after_consecutive_transient_failures(self):
+        pool, factory = _pool()
+        for _ in range(2):
+            with pytest.raises(requests.ConnectionError):
+                with pool.session():
+                    raise requests.ConnectionError("reset")
+        assert pool.stats()["recycled"] == 1
+        with pool.session():
+            pass
+        assert factory.call_count == 2
+
+    def test_deterministic_errors_keep_session(self):
+        pool, factory = _pool()
+        for _ in range(3):
+            with pytest.raises(ValueError):
+                with pool.session():
+                    raise ValueError("bad query")
+        assert pool.stats()["recycled"] == 0
+
+    def test_recycled_after_max_uses(self):
+        pool, factory = _pool(max_uses=3)
+        for _ in range(7):
+            with pool.session():
+                pass
+        assert factory.call_count == 3
+
+    def test_thread_safety(self):
+        pool, factory = _pool(size=3)
+        in_use = set()
+        clash = []
+
+        def worker():
+            for _ in range(50):
+                with pool.session() as client:
+                    if id(client) in in_use:
+                        clash.append(client)
+                    in_use.add(id(client))
+                    in_use.discard(id(client))
+
+        threads = [threading.Thread(target=worker) for _ in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert not clash
+        assert factory.call_count <= 3
+
+
+class TestWebSearchPooling:
+    def test_ddgs_client_reused_across_queries(self):
+        from tools.web_search_tool import web_search
+        client = MagicMock()
+        client.text.return_value = [{"body": "fact"}]
+        with patch("ddgs.DDGS", return_value=client) as ddgs_cls:
+            for query in ("a", "b", "c"):
+                assert web_search(query) == ["fact"]
+        assert ddgs_cls.call_count == 1
@@ -0,0 +1,80 @@
+"""
+Tests for agents/planner/topic_index.py and tools/text_similarity.py
+"""
+import pytest
+from unittest.mock import patch
+
+from tools.text_similarity import tokenize, normalize_text, TfidfIndex, bm25_scores
+from agents.planner.topic_index import TopicIndex
+
+
+class TestTextSimilarity:
+    def test_normalization_ignores_case_spacing_and_stop_words(self):
+        assert normalize_text("AI in Healthcare") == normalize_text("  ai   in healthcare ")
+
+    def test_acronyms_are_expanded(self):
+        assert normalize_text("AI in Healthcare") == normalize_text("Artificial Intelligence in Healthcare")
+
+    def test_stemming_merges_inflections(self):
+        assert tokenize("Renewable Energy Technologies") == tokenize("renewable energy technology")
+
+    def test_tfidf_ranks_closest_document_first(self):
+        docs = ["Climate Change Policy", "Machine Learning in Finance", "Quantum Computing Basics"]
+        index = TfidfIndex(tokenize(d) for d in docs)
+        scores = index.similarities(tokenize("ML for finance"))
+        assert scores.argmax() == 1
+
+    def test_extra_query_words_lower_similarity(self):
+        index = TfidfIndex([tokenize("AI in Healthcare")])
+        assert index.similarities(tokenize("AI in Healthcare"))[0] == pytest.approx(1.0)
+        assert index.similarities(tokenize("AI in Healthcare Finance Regulation"))[0] < 0.85
+
+    def test_bm25_prefers_documents_matching_rare_query_terms(self):
+        docs = [tokenize(d) for d in ["Energy policy in Europe", "Solar energy storage batteries", "Energy prices"]]
+        scores = bm25_scores(tokenize("solar energy storage"), docs)
+        assert scores.argmax() == 1
+        assert bm25_scores([], docs).tolist() == [0, 0, 0]
+
+
+class TestTopicIndex:
+    def test_exact_normalized_match(self, tmp_path):
+        index = TopicIndex(str(tmp_path / "topics.jsonl"))
+        index.add("AI in Healthcare", 7, "Concise")
+        assert index.lookup("ai in healthcare ", 7, "Concise") == "AI in Healthcare"
+        assert index.lookup("ai in healthcare", 5, "Concise") is None
+
+    def test_similarity_match_only_when_enabled(self, tmp_path):
+        index = TopicIndex(str(tmp_path / "topics.jsonl"))
+        index.add("The Future of Renewable Energy Technologies", 7, "Concise")
+        query = "Future of Renewable Energy Technology Trends"
+        assert index.lookup(query, 7, "Concise", similarity=False) is None
+        with patch("agents.planner.topic_index.Config.TOPIC_SIMILARITY_THRESHOLD", 0.7):
+            assert index.lookup(query, 7, "Concise", similarity=True) == "The Future of Renewable Energy Technologies"
+
+    def test_dissimilar_topic_misses(self, tmp_path):
+        index = TopicIndex(str(tmp_path / "topics.jsonl"))
+        index.add("AI in Healthcare", 7, "Concise")
+        assert index.lookup("Medieval European History", 7, "Concise", similarity=True) is None
+
+    def test_index_is_shared_through_file(self, tmp_path):
+        path = str(tmp_path / "topics.jsonl")
+        TopicIndex(path).add("Climate Change", 7, "Concise")
+        assert TopicIndex(path).lookup("climate change", 7, "Concise") == "Climate Change"
+
+
+class TestPlanOutlineService:
+    def test_variant_topic_reuses_cached_outline(self):
+        from agents.planner.service import plan_outline_service
+        outline = [{"title": "Intro", "description": "d"}]
+        with patch("agents.planner.service.generate_outline_service", return_value=outline) as gen:
+            plan_outline_service("AI in Healthcare", 7, "Concise")
+            plan_outline_service("Artificial Intelligence in Healthcare ", 7, "Concise")
+        assert [c.args[0] for c in gen.call_args_list] == ["AI in Healthcare", "AI in Healthcare"]
+
+    def test_error_outline_is_not_indexed(self):
+        from agents.planner.service import plan_outline_service
+        from agents.planner.topic_index import get_topic_index
+        with patch("agents.planner.service.generate_outline_service", side_effect=RuntimeError("down")):
+            outline = plan_outline_service("Quantum Computing", 7, "Concise")
+        assert outline[0]["title"] == "Error"
+        assert get_topic_index().lookup("Quantum Computing", 7, "Concise") is None
@@ -1,6 +1,7 @@
 """
 Tests for tools/web_search_tool.py
 """
+import time
 import pytest
 from unittest.mock import patch, MagicMock
 
@@ -41,3 +42,112 @@ class TestWebSearch:
         with patch("tools.web_search_tool.web_search", return_value=[]):
             result = web_search_formatted("anything")
         assert result == ""
+
+
+class TestWebSearchCache:
+    def _client(self, results):
+        client = MagicMock()
+        client.text.return_value = results
+        return client
+
+    def test_repeat_and_normalized_queries_skip_network(self):
+        from tools.web_search_tool import web_search
+        client = self._client([{"body": "Solar is growing."}])
+        with patch("ddgs.DDGS", return_value=client):
+            assert web_search("Solar Energy: Trends", max_results=3) == ["Solar is growing."]
+            assert web_search("  solar energy trends ", max_results=3) == ["Solar is growing."]
+        assert client.text.call_count == 1
+
+    def test_max_results_is_part_of_the_key(self):
+        from tools.web_search_tool import web_search
+        client = self._client([{"body": "fact"}])
+        with patch("ddgs.DDGS", return_value=client):
+            web_search("topic", max_results=3)
+            web_search("topic", max_results=5)
+        assert client.text.call_count == 2
+
+    def test_empty_results_use_negative_ttl(self):
+        from tools.web_search_tool import web_search
+        client = self._client([])
+        with patch("ddgs.DDGS", return_value=client), \
+             patch("tools.web_search_tool.Config.WEB_SEARCH_NEGATIVE_TTL", 60):
+            web_search("obscure topic")
+            web_search("obscure topic")
+            assert client.text.call_count == 1
+            with patch("tools.cache.time.time", return_value=time.time() + 120):
+                web_search("obscure topic")
+        assert client.text.call_count == 2
+
+    def test_failures_are_not_cached(self):
+        from tools.web_search_tool import web_search
+        with patch("ddgs.DDGS", side_effect=Exception("network error")):
+            assert web_search("topic") == []
+        client = self._client([{"body": "fact"}])
+        with patch("ddgs.DDGS", return_value=client):
+            assert web_search("topic") == ["fact"]
+
+    def test_ttl_zero_disables_cache(self):
+        from tools.web_search_tool import web_search
+        client = self._client([{"body": "fact"}])
+        with patch("ddgs.DDGS", return_value=client), \
+             patch("tools.web_search_tool.Config.WEB_SEARCH_CACHE_TTL", 0), \
+             patch("tools.web_search_tool.Config.WEB_SEARCH_NEGATIVE_TTL", 0):
+            web_search("topic")
+            web_search("topic")
+        assert client.text.call_count == 2
+
+
+class TestSearchProviders:
+    @pytest.fixture
+    def local_index(self, tmp_path):
+        from tools.local_corpus import CorpusIndex
+        docs = tmp_path / "docs"
+        docs.mkdir()
+        (docs / "grid.md").write_text("Battery storage smooths renewable output on the power grid.")
+        index = CorpusIndex(str(tmp_path / "index"))
+        index.update(str(docs))
+        with patch("tools.local_corpus._index", index):
+            yield index
+
+    def test_local_provider_searches_corpus_offline(self, local_index):
+        from tools.web_search_tool import web_search
+        with patch("tools.web_search_tool.Config.SEARCH_PROVIDER", "local"), \
+             patch("ddgs.DDGS", side_effect=AssertionError("network used")):
+            assert web_search("grid battery storage") == [
+                "Battery storage smooths renewable output on the power grid."]
+
+    def test_chain_falls_back_when_ddgs_fails(self, local_index):
+        from tools.web_search_tool import web_search
+        with patch("tools.web_search_tool.Config.SEARCH_PROVIDER", "ddgs,local"), \
+             patch("ddgs.DDGS", side_effect=Exception("network error")):
+            assert len(web_search("renewable grid")) == 1
+
+    def test_chain_stops_at_first_provider_with_results(self, local_index):
+        from tools.web_search_tool import web_search
+        client = MagicMock()
+        client.text.return_value = [{"body": "From the web."}]
+        with patch("tools.web_search_tool.Config.SEARCH_PROVIDER", "ddgs,local"), \
+             patch("ddgs.DDGS", return_value=client), \
+             patch.object(local_index, "search", side_effect=AssertionError("local used")):
+            assert web_search("renewable grid") == ["From the web."]
+
+    def test_registered_provider_is_selectable(self):
+        from tools.web_search_tool import SearchProvider, register_provider, web_search, _PROVIDERS
+
+        class StaticProvider(SearchProvider):
+            name = "static"
+
+            def search(self, query, max_results):
+                return [{"body": f"static: {query}"}]
+
+        register_provider(StaticProvider)
+        try:
+            with patch("tools.web_search_tool.Config.SEARCH_PROVIDER", "static"):
+                assert web_search("q") == ["static: q"]
+        finally:
+            _PROVIDERS.pop("static")
+
+    def test_unknown_provider_falls_back_to_empty(self):
+        from tools.web_search_tool import web_search
+        with patch("tools.web_search_tool.Config.SEARCH_PROVIDER", "bing"):
+            assert web_search("q") == []
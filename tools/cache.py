@@ -1,59 +1,285 @@
-import os
-import pickle
+"""
+Disk Cache Tool
+---------------
+Decorator-based caching of function results, stored as compressed JSON or
+msgpack (see tools/cache_serialization.py).
+Useful for expensive LLM calls or API requests to save time and cost.
+
+Entries live in a pluggable backend (tools/cache_backends.py) chosen via
+Config.CACHE_BACKEND — local files by default, or a SQLite file or a
+shared Redis server so horizontally scaled workers reuse each other's
+results. The cache may be shared by several processes, so on a miss the
+first caller takes a per-key lock and computes the value while the others
+wait and then read its result.
+"""
+import time
+import asyncio
 import hashlib
+import inspect
+import threading
 from functools import wraps
+from typing import Any, Callable, Dict, Tuple, Union
 from utils.logger import get_logger
 from utils.config import Config
+from tools.cache_backends import CacheBackend, create_backend
+from tools.cache_serialization import encode_value, decode_value
+from tools.cache_stats import stats, start_periodic_reporting
 
 logger = get_logger(__name__)
 
-CACHE_DIR = ".cache"
-os.makedirs(CACHE_DIR, exist_ok=True)
+CACHE_DIR = Config.CACHE_DIR
+
+_backend = None
+
+# In-flight async computations, keyed by (event loop, cache key), so
+# concurrent coroutines missing the same key await a single call.
+_async_inflight: Dict[Tuple[asyncio.AbstractEventLoop, str], asyncio.Future] = {}
+
+
+def get_backend() -> CacheBackend:
+    """Return the process-wide cache backend, creating it on first use."""
+    global _backend
+    if _backend is None:
+        _backend = create_backend(directory=CACHE_DIR)
+        start_periodic_reporting()
+    return _backend
+
+
+def set_backend(backend: CacheBackend) -> None:
+    """Replace the process-wide cache backend (e.g. with a Redis stand-in in tests)."""
+    global _backend
+    _backend = backend
+
+
+def _cache_key(func, args, kwargs) -> str:
+    """Build the cache key from the function name and its stringified arguments."""
+    key_content = f"{func.__name__}:{str(args)}:{str(kwargs)}"
+    return hashlib.md5(key_content.encode()).hexdigest()
+
+
+def _read_entry(backend: CacheBackend, cache_key: str, func_name: str = "",
+                is_fresh: Callable[[Any], bool] = None) -> Tuple[bool, Any]:
+    """
+    Load a cached value, recording hit/miss/error counters and load latency.
+
+    Args:
+        is_fresh: Optional check on the decoded value (e.g. TTL expiry);
+            entries failing it count as misses.
+
+    Returns:
+        (True, value) on a hit, (False, None) if the entry is missing, stale or unreadable.
+    """
+    started = time.perf_counter()
+    try:
+        data = backend.get(cache_key)
+        if data is None:
+            stats.record_miss(func_name, time.perf_counter() - started)
+            return False, None
+        value = decode_value(data)
+        if is_fresh is not None and not is_fresh(value):
+            stats.record_miss(func_name, time.perf_counter() - started)
+            return False, None
+        stats.record_hit(func_name, len(data), time.perf_counter() - started)
+        return True, value
+    except Exception as e:
+        stats.record_error(func_name)
+        stats.record_miss(func_name, time.perf_counter() - started)
+        logger.warning(f"Failed to read cache: {e}. Re-executing function.")
+        return False, None
+
+
+def _store_entry(backend: CacheBackend, cache_key: str, func_name: str, result: Any) -> None:
+    """Encode and save a result; failures are logged and never raised."""
+    started = time.perf_counter()
+    try:
+        data = encode_value(result)
+        backend.set(cache_key, data, func_name=func_name)
+        stats.record_store(func_name, len(data), time.perf_counter() - started)
+        logger.debug(f"Cached result for {func_name} (Key: {cache_key})")
+    except Exception as e:
+        stats.record_error(func_name)
+        logger.warning(f"Failed to save cache: {e}")
+
 
 def disk_cache(func):
     """
-    A simple decorator to cache function results to disk using pickle.
-    Useful for expensive LLM calls or API requests to save time/cost.
+    Decorator to cache function results in the configured cache backend.
+
+    A unique cache key is generated from the function name and its arguments.
+    If a cached result exists, it is returned without re-executing the function.
+    On a miss, the first caller takes a per-key lock and computes the value;
+    concurrent callers (threads, processes or other nodes) wait and reuse it.
+
+    `async def` functions get an async wrapper: backend I/O and lock waits run
+    in a worker thread so the event loop is never blocked, and coroutines on
+    the same loop missing the same key share one in-flight call.
     """
+    if inspect.iscoroutinefunction(func):
+        return _async_disk_cache(func)
+
     @wraps(func)
     def wrapper(*args, **kwargs):
-        # Create a unique cache key based on function name and arguments
-        # We stringify args and kwargs to create a hash
-        key_content = f"{func.__name__}:{str(args)}:{str(kwargs)}"
-        cache_key = hashlib.md5(key_content.encode()).hexdigest()
-        cache_file = os.path.join(CACHE_DIR, f"{cache_key}.pkl")
-        
-        # Check if cache exists
-        if os.path.exists(cache_file):
+        backend = get_backend()
+        cache_key = _cache_key(func, args, kwargs)
+
+        # Fast path — entries are written atomically, so no lock is needed to read
+        hit, value = _read_entry(backend, cache_key, func.__name__)
+        if hit:
             logger.debug(f"Cache hit for {func.__name__} (Key: {cache_key})")
-            try:
-                with open(cache_file, "rb") as f:
-                    return pickle.load(f)
-            except Exception as e:
-                logger.warning(f"Failed to read cache: {e}. Re-executing function.")
-        
-        # Execute function
-        result = func(*args, **kwargs)
-        
-        # Save to cache
-        try:
-            with open(cache_file, "wb") as f:
-                pickle.dump(result, f)
-            logger.debug(f"Cached result for {func.__name__} (Key: {cache_key})")
-        except Exception as e:
-            logger.warning(f"Failed to save cache: {e}")
-            
+            return value
+
+        with backend.lock(cache_key, Config.CACHE_LOCK_TIMEOUT):
+            # Another worker may have filled the entry while we waited
+            hit, value = _read_entry(backend, cache_key, func.__name__)
+            if hit:
+                logger.debug(f"Cache hit for {func.__name__} after lock wait (Key: {cache_key})")
+                return value
+
+            # Execute function
+            result = func(*args, **kwargs)
+
+            # Save to cache
+            _store_entry(backend, cache_key, func.__name__, result)
+
         return result
-        
+
+    return wrapper
+
+
+def _release_abandoned(lock, acquiring: asyncio.Future) -> None:
+    """Release a lock acquired for a coroutine that was cancelled while waiting for it."""
+    if acquiring.cancelled() or acquiring.exception() is not None:
+        return
+    threading.Thread(target=lock.__exit__, args=(None, None, None), daemon=True).start()
+
+
+def _async_disk_cache(func):
+    """Coroutine counterpart of `disk_cache`'s wrapper (see its docstring)."""
+
+    async def compute(backend: CacheBackend, cache_key: str, args, kwargs):
+        lock = backend.lock(cache_key, Config.CACHE_LOCK_TIMEOUT)
+        acquiring = asyncio.ensure_future(asyncio.to_thread(lock.__enter__))
+        try:
+            await asyncio.shield(acquiring)
+        except asyncio.CancelledError:
+            # The worker thread still takes the lock; release it once it has
+            acquiring.add_done_callback(lambda f: _release_abandoned(lock, f))
+            raise
+        try:
+            hit, value = await asyncio.to_thread(_read_entry, backend, cache_key, func.__name__)
+            if hit:
+                logger.debug(f"Cache hit for {func.__name__} after lock wait (Key: {cache_key})")
+                return value
+            result = await func(*args, **kwargs)
+            await asyncio.to_thread(_store_entry, backend, cache_key, func.__name__, result)
+            return result
+        finally:
+            await asyncio.to_thread(lock.__exit__, None, None, None)
+
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        backend = get_backend()
+        cache_key = _cache_key(func, args, kwargs)
+
+        hit, value = await asyncio.to_thread(_read_entry, backend, cache_key, func.__name__)
+        if hit:
+            logger.debug(f"Cache hit for {func.__name__} (Key: {cache_key})")
+            return value
+
+        loop = asyncio.get_running_loop()
+        flight_key = (loop, cache_key)
+        pending = _async_inflight.get(flight_key)
+        if pending is not None:
+            logger.debug(f"Joining in-flight call for {func.__name__} (Key: {cache_key})")
+            return await asyncio.shield(pending)
+
+        future = loop.create_future()
+        _async_inflight[flight_key] = future
+        try:
+            result = await compute(backend, cache_key, args, kwargs)
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            # Joined waiters were not cancelled themselves; fail them instead
+            future.set_exception(RuntimeError(f"{func.__name__} call was cancelled"))
+            future.exception()  # mark retrieved — there may be no waiters
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            future.exception()  # mark retrieved — there may be no waiters
+            raise
+        finally:
+            del _async_inflight[flight_key]
+
     return wrapper
 
+
+def _unexpired(entry: Any) -> bool:
+    """Whether a `ttl_cache` entry is still within its lifetime."""
+    return isinstance(entry, dict) and entry.get("expires_at", 0) > time.time()
+
+
+def ttl_cache(ttl: Union[float, Callable[[], float]], negative_ttl: Union[float, Callable[[], float]] = None,
+              key: Callable[..., Any] = None):
+    """
+    Decorator factory: cache results in the configured backend for `ttl`
+    seconds, and falsy results (e.g. no search hits) for `negative_ttl`.
+
+    Unlike `disk_cache`, entries expire, and exceptions are never cached.
+    TTLs may be callables so they are read from Config at call time; a TTL
+    of 0 disables caching for that kind of result.
+
+    Args:
+        ttl: Lifetime of truthy results, in seconds.
+        negative_ttl: Lifetime of falsy results (default: same as ttl).
+        key: Builds the cache key from the call's arguments (default: all arguments).
+
+    Example:
+        @ttl_cache(ttl=3600, negative_ttl=300, key=lambda q, n: (q.lower(), n))
+        def search(q, n): ...
+    """
+    def resolve(value):
+        return value() if callable(value) else value
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            positive = resolve(ttl) or 0
+            negative = positive if negative_ttl is None else (resolve(negative_ttl) or 0)
+            if positive <= 0 and negative <= 0:
+                return func(*args, **kwargs)
+
+            backend = get_backend()
+            key_content = f"{func.__name__}:{key(*args, **kwargs)}" if key else None
+            cache_key = (hashlib.md5(key_content.encode()).hexdigest() if key_content
+                         else _cache_key(func, args, kwargs))
+
+            hit, entry = _read_entry(backend, cache_key, func.__name__, is_fresh=_unexpired)
+            if hit:
+                logger.debug(f"Cache hit for {func.__name__} (Key: {cache_key})")
+                return entry["value"]
+
+            result = func(*args, **kwargs)
+            lifetime = positive if result else negative
+            if lifetime > 0:
+                _store_entry(backend, cache_key, func.__name__,
+                             {"value": result, "expires_at": time.time() + lifetime})
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def get_cache_stats() -> dict:
+    """Per-function hit/miss/error/bytes/latency counters recorded by this process."""
+    return stats.snapshot()
+
+
 def clear_cache():
-    """Clears all cached files."""
+    """Clears all cached entries."""
     try:
-        for filename in os.listdir(CACHE_DIR):
-            file_path = os.path.join(CACHE_DIR, filename)
-            if os.path.isfile(file_path):
-                os.unlink(file_path)
+        get_backend().clear()
         logger.info("Cache cleared successfully.")
     except Exception as e:
         logger.error(f"Error clearing cache: {e}")
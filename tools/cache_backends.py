@@ -0,0 +1,481 @@
+"""
+Cache Backends
+--------------
+Storage backends behind the `disk_cache` decorator (tools/cache.py).
+
+Every backend stores opaque bytes under a string key and can hold a
+per-key lock, so only one worker computes a missing entry:
+
+  - DiskBackend:   one file per entry in a local directory (default).
+  - SQLiteBackend: a single indexed SQLite database (WAL) in a local
+                   directory, with stats, LRU eviction and invalidation.
+  - RedisBackend:  a shared Redis server, so every node in a fleet of
+                   workers reuses the same LLM, search and image results.
+
+The active backend is chosen with Config.CACHE_BACKEND ("disk", "sqlite"
+or "redis"); see `create_backend`.
+"""
+import os
+import time
+import sqlite3
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Optional
+from utils.logger import get_logger
+from utils.config import Config
+from tools.cache_serialization import reencode_entry
+
+try:
+    import fcntl
+except ImportError:  # Windows — no advisory locks, writes are still atomic
+    fcntl = None
+
+logger = get_logger(__name__)
+
+_LOCK_POLL_INTERVAL = 0.05
+
+
+@contextmanager
+def file_lock(lock_path: str, timeout: float):
+    """
+    Hold an exclusive advisory lock on `lock_path` across processes.
+
+    Yields True if the lock was acquired, False if it timed out (or locking
+    is unsupported on this platform) — callers then proceed unlocked.
+    """
+    if fcntl is None:
+        yield False
+        return
+
+    os.makedirs(os.path.dirname(lock_path), exist_ok=True)
+    fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+    acquired = False
+    try:
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                acquired = True
+                break
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    logger.warning(
+                        f"Timed out after {timeout:.0f}s waiting for cache lock "
+                        f"{os.path.basename(lock_path)}. Proceeding without it."
+                    )
+                    break
+                time.sleep(_LOCK_POLL_INTERVAL)
+        yield acquired
+    finally:
+        if acquired:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
+
+
+class CacheBackend:
+    """Interface implemented by every cache backend."""
+
+    name = "base"
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the stored bytes for `key`, or None on a miss."""
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes, func_name: str = "") -> None:
+        """Store `value` under `key`. `func_name` is informational metadata."""
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        """Remove `key` if present."""
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        """
+        Summarize stored entries: {"entries": int, "bytes": int, "functions": {...}}.
+        "functions" is empty for backends that do not record function names.
+        """
+        raise NotImplementedError
+
+    @contextmanager
+    def lock(self, key: str, timeout: float):
+        """Hold a cross-process lock for `key`. Yields True if acquired."""
+        yield False
+
+
+class DiskBackend(CacheBackend):
+    """
+    One file per entry (`<key>.pkl`) in a local directory.
+
+    Writes go to a temp file in the same directory and are renamed into
+    place, so readers never see a partially written entry. Per-key locks
+    are fcntl locks on files under `<directory>/locks/`.
+    """
+
+    name = "disk"
+    LOCK_DIR_NAME = "locks"
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            with open(self._path(key), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def set(self, key: str, value: bytes, func_name: str = "") -> None:
+        path = self._path(key)
+        fd, tmp_path = tempfile.mkstemp(
+            dir=self.directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(value)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def delete(self, key: str) -> None:
+        try:
+            os.unlink(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def clear(self) -> None:
+        # Only `<key>.pkl` entries: CACHE_DIR also holds other stores (LLM cache,
+        # topic index, stats, warm progress, SQLite backend). Lock files live in
+        # a subdirectory and are left for active holders.
+        for filename in os.listdir(self.directory):
+            if not filename.endswith(".pkl") or filename.startswith("."):
+                continue
+            try:
+                os.unlink(os.path.join(self.directory, filename))
+            except FileNotFoundError:
+                pass
+
+    def stats(self) -> dict:
+        entries = total = 0
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith(".pkl") and not entry.name.startswith("."):
+                    entries += 1
+                    total += entry.stat().st_size
+        return {"entries": entries, "bytes": total, "functions": {}}
+
+    @contextmanager
+    def lock(self, key: str, timeout: float):
+        lock_path = os.path.join(self.directory, self.LOCK_DIR_NAME, f"{key}.lock")
+        with file_lock(lock_path, timeout) as acquired:
+            yield acquired
+
+
+class SQLiteBackend(CacheBackend):
+    """
+    All entries in a single SQLite database file (WAL mode).
+
+    Besides the value blob, each row records the function name, size and
+    created/accessed timestamps, so stats, LRU eviction and per-function
+    invalidation are indexed queries instead of directory scans over
+    thousands of small files.
+
+    Connections are per-thread; WAL lets readers proceed while another
+    process writes. Per-key locks reuse the disk lock files.
+    """
+
+    name = "sqlite"
+    DB_FILENAME = "cache.sqlite3"
+    _EVICT_CHECK_EVERY = 50  # sets between size checks when max_bytes is set
+
+    _SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS cache_entries ("
+        " key TEXT PRIMARY KEY,"
+        " value BLOB NOT NULL,"
+        " func_name TEXT NOT NULL DEFAULT '',"
+        " size INTEGER NOT NULL DEFAULT 0,"
+        " created_at REAL NOT NULL,"
+        " accessed_at REAL NOT NULL DEFAULT 0)",
+        "CREATE INDEX IF NOT EXISTS idx_cache_entries_func_name ON cache_entries (func_name)",
+        "CREATE INDEX IF NOT EXISTS idx_cache_entries_accessed_at ON cache_entries (accessed_at)",
+    )
+
+    def __init__(self, directory: str, db_filename: str = None, max_bytes: int = None):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.db_path = os.path.join(directory, db_filename or self.DB_FILENAME)
+        self.max_bytes = max_bytes or None
+        self._local = threading.local()
+        self._sets_since_check = 0
+
+        conn = self._connect()
+        conn.execute("PRAGMA journal_mode=WAL")
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(cache_entries)")}
+        if columns and not {"size", "accessed_at"} <= columns:
+            # Databases created before size/access tracking: add the columns in place
+            if "size" not in columns:
+                conn.execute("ALTER TABLE cache_entries ADD COLUMN size INTEGER NOT NULL DEFAULT 0")
+                conn.execute("UPDATE cache_entries SET size = length(value)")
+            if "accessed_at" not in columns:
+                conn.execute("ALTER TABLE cache_entries ADD COLUMN accessed_at REAL NOT NULL DEFAULT 0")
+                conn.execute("UPDATE cache_entries SET accessed_at = created_at")
+        for statement in self._SCHEMA:
+            conn.execute(statement)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[bytes]:
+        conn = self._connect()
+        row = conn.execute("SELECT value FROM cache_entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        conn.execute("UPDATE cache_entries SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        return bytes(row[0])
+
+    def set(self, key: str, value: bytes, func_name: str = "") -> None:
+        now = time.time()
+        self._connect().execute(
+            "INSERT OR REPLACE INTO cache_entries"
+            " (key, value, func_name, size, created_at, accessed_at)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (key, sqlite3.Binary(value), func_name, len(value), now, now),
+        )
+        if self.max_bytes:
+            self._sets_since_check += 1
+            if self._sets_since_check >= self._EVICT_CHECK_EVERY:
+                self._sets_since_check = 0
+                self.evict(max_bytes=self.max_bytes)
+
+    def delete(self, key: str) -> None:
+        self._connect().execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        self._connect().execute("DELETE FROM cache_entries")
+
+    def invalidate(self, func_name: str) -> int:
+        """Delete every entry produced by `func_name`. Returns the number removed."""
+        cursor = self._connect().execute("DELETE FROM cache_entries WHERE func_name = ?", (func_name,))
+        return cursor.rowcount
+
+    def evict(self, max_bytes: int = None, max_age: float = None) -> int:
+        """
+        Evict entries not accessed for `max_age` seconds, then least recently
+        used entries until the total size is at most `max_bytes`.
+
+        Returns:
+            The number of entries removed.
+        """
+        conn = self._connect()
+        removed = 0
+        if max_age:
+            removed += conn.execute(
+                "DELETE FROM cache_entries WHERE accessed_at < ?", (time.time() - max_age,)
+            ).rowcount
+        if max_bytes:
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache_entries").fetchone()[0]
+            if total > max_bytes:
+                # Walk entries oldest-access first (indexed) until enough space is freed
+                excess, victims = total - max_bytes, []
+                for key, size in conn.execute(
+                    "SELECT key, size FROM cache_entries ORDER BY accessed_at ASC"
+                ):
+                    victims.append((key,))
+                    excess -= size
+                    if excess <= 0:
+                        break
+                conn.executemany("DELETE FROM cache_entries WHERE key = ?", victims)
+                removed += len(victims)
+        if removed:
+            logger.info(f"Evicted {removed} SQLite cache entries.")
+        return removed
+
+    def stats(self) -> dict:
+        """
+        Summarize the cache contents.
+
+        Returns:
+            {"entries": int, "bytes": int,
+             "functions": {func_name: {"entries": int, "bytes": int,
+                                       "oldest": float, "last_access": float}}}
+        """
+        conn = self._connect()
+        functions = {}
+        entries = total = 0
+        for func_name, count, size, oldest, last_access in conn.execute(
+            "SELECT func_name, COUNT(*), COALESCE(SUM(size), 0), MIN(created_at), MAX(accessed_at)"
+            " FROM cache_entries GROUP BY func_name"
+        ):
+            functions[func_name] = {
+                "entries": count, "bytes": size, "oldest": oldest, "last_access": last_access,
+            }
+            entries += count
+            total += size
+        return {"entries": entries, "bytes": total, "functions": functions}
+
+    def entries(self, func_name: str, limit: int = 20) -> list:
+        """Most recently accessed entries for `func_name` (metadata only, no values)."""
+        rows = self._connect().execute(
+            "SELECT key, size, created_at, accessed_at FROM cache_entries"
+            " WHERE func_name = ? ORDER BY accessed_at DESC LIMIT ?",
+            (func_name, limit),
+        ).fetchall()
+        return [
+            {"key": key, "size": size, "created_at": created, "accessed_at": accessed}
+            for key, size, created, accessed in rows
+        ]
+
+    def import_directory(self, directory: str, allow_pickle: bool = False) -> dict:
+        """
+        Copy `<key>.pkl` entries from a DiskBackend directory into this store,
+        for switching an existing cache over without re-running the LLM calls.
+
+        Legacy raw-pickle entries (written before the JSON/msgpack format)
+        would be rejected on read, so they are re-encoded on the way in —
+        which means unpickling them, only done with `allow_pickle` (use it
+        for directories you trust). Otherwise they are skipped.
+
+        Returns:
+            {"imported": int, "skipped": int}
+        """
+        imported = skipped = 0
+        for filename in os.listdir(directory):
+            if not filename.endswith(".pkl") or filename.startswith("."):
+                continue
+            with open(os.path.join(directory, filename), "rb") as f:
+                data = f.read()
+            try:
+                data = reencode_entry(data, allow_pickle=allow_pickle)
+            except Exception as e:
+                logger.debug(f"Skipping legacy cache entry {filename}: {e}")
+                skipped += 1
+                continue
+            self.set(filename[: -len(".pkl")], data)
+            imported += 1
+        if skipped:
+            logger.warning(
+                f"Skipped {skipped} legacy pickle cache entries"
+                f"{'' if allow_pickle else ' (re-run with allow_pickle=True to convert them)'}."
+            )
+        return {"imported": imported, "skipped": skipped}
+
+    @contextmanager
+    def lock(self, key: str, timeout: float):
+        lock_path = os.path.join(self.directory, DiskBackend.LOCK_DIR_NAME, f"{key}.lock")
+        with file_lock(lock_path, timeout) as acquired:
+            yield acquired
+
+
+class RedisBackend(CacheBackend):
+    """
+    Entries stored in Redis under `<prefix><key>`, shared by every worker
+    that points at the same server. Per-key locks are Redis locks with an
+    expiry, so a crashed worker cannot hold a key forever.
+
+    Pass `client` to use an existing connection (e.g. fakeredis in tests).
+    """
+
+    name = "redis"
+
+    def __init__(self, url: str = None, client=None, prefix: str = "pptcache:", ttl: int = None):
+        if client is None:
+            from redis import Redis
+            client = Redis.from_url(url or Config.CACHE_REDIS_URL, socket_connect_timeout=1)
+        self.client = client
+        self.prefix = prefix
+        self.ttl = ttl or None
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(self.prefix + key)
+
+    def set(self, key: str, value: bytes, func_name: str = "") -> None:
+        self.client.set(self.prefix + key, value, ex=self.ttl)
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self.prefix + key)
+
+    def _entry_keys(self):
+        """Redis keys of the cache entries, skipping the per-key locks other workers may hold."""
+        lock_prefix = f"{self.prefix}lock:"
+        for redis_key in self.client.scan_iter(match=f"{self.prefix}*"):
+            if not redis_key.decode(errors="replace").startswith(lock_prefix):
+                yield redis_key
+
+    def clear(self) -> None:
+        keys = list(self._entry_keys())
+        if keys:
+            self.client.delete(*keys)
+
+    def stats(self) -> dict:
+        entries = total = 0
+        for redis_key in self._entry_keys():
+            entries += 1
+            total += self.client.strlen(redis_key)
+        return {"entries": entries, "bytes": total, "functions": {}}
+
+    @contextmanager
+    def lock(self, key: str, timeout: float):
+        # thread_local=False: async callers acquire and release from different threads
+        redis_lock = self.client.lock(
+            f"{self.prefix}lock:{key}", timeout=timeout, blocking_timeout=timeout, thread_local=False
+        )
+        try:
+            acquired = bool(redis_lock.acquire())
+            if not acquired:
+                logger.warning(f"Timed out waiting for Redis cache lock {key}. Proceeding without it.")
+        except Exception as e:
+            logger.warning(f"Redis cache lock unavailable ({e}). Proceeding without it.")
+            acquired = False
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                try:
+                    redis_lock.release()
+                except Exception as e:
+                    logger.warning(f"Failed to release Redis cache lock {key}: {e}")
+
+
+def create_backend(name: str = None, directory: str = None) -> CacheBackend:
+    """
+    Build the backend selected by `name` (default: Config.CACHE_BACKEND).
+
+    Falls back to the disk backend if Redis is requested but unreachable,
+    so a missing server degrades to per-node caching instead of failing.
+    """
+    name = (name or Config.CACHE_BACKEND).lower()
+    directory = directory or Config.CACHE_DIR
+
+    if name == "redis":
+        try:
+            backend = RedisBackend(ttl=Config.CACHE_TTL)
+            backend.client.ping()
+            logger.info("Using Redis cache backend.")
+            return backend
+        except Exception as e:
+            logger.warning(f"Redis cache backend not available ({e}). Falling back to disk cache.")
+            return DiskBackend(directory)
+    if name == "sqlite":
+        return SQLiteBackend(directory, max_bytes=Config.CACHE_MAX_BYTES)
+    if name != "disk":
+        logger.warning(f"Unknown CACHE_BACKEND '{name}'. Using disk cache.")
+    return DiskBackend(directory)
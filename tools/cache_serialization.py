@@ -0,0 +1,159 @@
+"""
+Cache Serialization
+-------------------
+Encodes values for the cache backends (tools/cache_backends.py).
+
+Plain data — outlines, slide lists, keywords, URLs — is stored as JSON or
+msgpack and optionally compressed with zlib or zstd. Pickle is bulky and
+unsafe to load from a cache directory shared between hosts, so it is only
+used (and only loaded) when Config.CACHE_ALLOW_PICKLE is enabled.
+
+Entry format: MAGIC + serializer id + compression id + payload.
+Entries without the header are legacy raw pickles from older releases.
+"""
+import json
+import zlib
+import pickle
+from typing import Any
+from utils.config import Config
+
+try:
+    import msgpack
+except ImportError:  # optional — JSON is used instead
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # optional — zlib is used instead
+    zstandard = None
+
+MAGIC = b"PPC"
+
+SERIALIZERS = {"pickle": 0, "json": 1, "msgpack": 2}
+COMPRESSORS = {"none": 0, "zlib": 1, "zstd": 2}
+
+# Payloads smaller than this are stored uncompressed (headers would dominate)
+COMPRESS_MIN_BYTES = 256
+
+
+class UnsupportedValueError(TypeError):
+    """Raised when a value is not plain data and pickle is not allowed."""
+
+
+def _is_plain(value: Any) -> bool:
+    """True if the value survives a JSON/msgpack round trip unchanged."""
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return True
+    if isinstance(value, list):
+        return all(_is_plain(v) for v in value)
+    if isinstance(value, dict):
+        return all(isinstance(k, str) and _is_plain(v) for k, v in value.items())
+    return False
+
+
+def _serializer_name() -> str:
+    name = Config.CACHE_SERIALIZER
+    if name == "msgpack" and msgpack is None:
+        return "json"
+    return name if name in ("json", "msgpack") else "json"
+
+
+def _compressor_name() -> str:
+    name = Config.CACHE_COMPRESSION
+    if name == "zstd" and zstandard is None:
+        return "zlib"
+    return name if name in COMPRESSORS else "none"
+
+
+def _compress(payload: bytes, name: str) -> bytes:
+    if name == "zlib":
+        return zlib.compress(payload, 6)
+    if name == "zstd":
+        return zstandard.ZstdCompressor(level=3).compress(payload)
+    return payload
+
+
+def _decompress(payload: bytes, compression_id: int) -> bytes:
+    if compression_id == COMPRESSORS["none"]:
+        return payload
+    if compression_id == COMPRESSORS["zlib"]:
+        return zlib.decompress(payload)
+    if compression_id == COMPRESSORS["zstd"]:
+        if zstandard is None:
+            raise ValueError("Cache entry is zstd-compressed but zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompress(payload)
+    raise ValueError(f"Unknown cache compression id {compression_id}")
+
+
+def encode_value(value: Any) -> bytes:
+    """
+    Serialize a value into a cache entry.
+
+    Raises:
+        UnsupportedValueError: If the value is not plain data and
+            Config.CACHE_ALLOW_PICKLE is off.
+    """
+    if _is_plain(value):
+        serializer = _serializer_name()
+        if serializer == "msgpack":
+            payload = msgpack.packb(value, use_bin_type=True)
+        else:
+            payload = json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    elif Config.CACHE_ALLOW_PICKLE:
+        serializer = "pickle"
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    else:
+        raise UnsupportedValueError(
+            f"{type(value).__name__} is not plain data; set CACHE_ALLOW_PICKLE=true to cache it."
+        )
+
+    compression = _compressor_name() if len(payload) >= COMPRESS_MIN_BYTES else "none"
+    header = MAGIC + bytes([SERIALIZERS[serializer], COMPRESSORS[compression]])
+    return header + _compress(payload, compression)
+
+
+def decode_value(data: bytes) -> Any:
+    """
+    Inverse of `encode_value`.
+
+    Raises:
+        ValueError: If the entry is pickled (or a legacy headerless pickle)
+            and Config.CACHE_ALLOW_PICKLE is off, or the format is unknown.
+    """
+    if not data.startswith(MAGIC):
+        if not Config.CACHE_ALLOW_PICKLE:
+            raise ValueError("Legacy pickle cache entry ignored (CACHE_ALLOW_PICKLE is off)")
+        return pickle.loads(data)
+
+    serializer_id, compression_id = data[3], data[4]
+    payload = _decompress(data[5:], compression_id)
+    if serializer_id == SERIALIZERS["json"]:
+        return json.loads(payload.decode("utf-8"))
+    if serializer_id == SERIALIZERS["msgpack"]:
+        if msgpack is None:
+            raise ValueError("Cache entry is msgpack-encoded but msgpack is not installed")
+        return msgpack.unpackb(payload, raw=False)
+    if serializer_id == SERIALIZERS["pickle"]:
+        if not Config.CACHE_ALLOW_PICKLE:
+            raise ValueError("Pickled cache entry ignored (CACHE_ALLOW_PICKLE is off)")
+        return pickle.loads(payload)
+    raise ValueError(f"Unknown cache serializer id {serializer_id}")
+
+
+def reencode_entry(data: bytes, allow_pickle: bool = False) -> bytes:
+    """
+    Convert a stored entry to the current format, e.g. when migrating an old
+    cache directory. Entries with the header are returned unchanged; legacy
+    headerless pickles are loaded (only with `allow_pickle`) and re-encoded
+    with `encode_value`.
+
+    Raises:
+        ValueError: If the entry is a legacy pickle and `allow_pickle` is off.
+        UnsupportedValueError: If the unpickled value is not plain data and
+            Config.CACHE_ALLOW_PICKLE is off.
+    """
+    if data.startswith(MAGIC):
+        return data
+    if not allow_pickle:
+        raise ValueError("Legacy pickle cache entry (allow_pickle is off)")
+    return encode_value(pickle.loads(data))
@@ -0,0 +1,154 @@
+"""
+Cache Statistics
+----------------
+Per-function counters for the `disk_cache` decorator (tools/cache.py):
+hits, misses, errors, bytes read/written and load/store latency.
+
+Counters live in memory per process. They are merged into a shared JSON
+file (`<CACHE_DIR>/cache_stats.json`) periodically and at exit, so
+`python main.py cache stats` can report on traffic from every worker that
+shares the cache directory. Set Config.CACHE_STATS_INTERVAL to also log a
+summary every N seconds.
+"""
+import os
+import json
+import time
+import atexit
+import threading
+from collections import defaultdict
+from typing import Dict, Any
+from utils.logger import get_logger
+from utils.config import Config
+from tools.cache_backends import file_lock
+
+logger = get_logger(__name__)
+
+STATS_FILENAME = "cache_stats.json"
+
+COUNTER_FIELDS = (
+    "hits", "misses", "errors", "bytes_read", "bytes_written",
+    "load_seconds", "loads", "store_seconds", "stores",
+)
+
+
+def _new_counters() -> Dict[str, float]:
+    return {field: 0 for field in COUNTER_FIELDS}
+
+
+def summarize(counters: Dict[str, float]) -> Dict[str, Any]:
+    """Add derived fields (hit rate, average latencies) to a raw counter dict."""
+    lookups = counters["hits"] + counters["misses"]
+    return {
+        **counters,
+        "hit_rate": counters["hits"] / lookups if lookups else 0.0,
+        "avg_load_ms": 1000 * counters["load_seconds"] / counters["loads"] if counters["loads"] else 0.0,
+        "avg_store_ms": 1000 * counters["store_seconds"] / counters["stores"] if counters["stores"] else 0.0,
+    }
+
+
+class CacheStats:
+    """Thread-safe per-function cache counters with a pending delta for flushing."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals = defaultdict(_new_counters)
+        self._pending = defaultdict(_new_counters)
+
+    def _add(self, func_name: str, **increments) -> None:
+        with self._lock:
+            for counters in (self._totals[func_name], self._pending[func_name]):
+                for field, value in increments.items():
+                    counters[field] += value
+
+    def record_hit(self, func_name: str, nbytes: int, seconds: float) -> None:
+        self._add(func_name, hits=1, bytes_read=nbytes, load_seconds=seconds, loads=1)
+
+    def record_miss(self, func_name: str, seconds: float) -> None:
+        self._add(func_name, misses=1, load_seconds=seconds, loads=1)
+
+    def record_store(self, func_name: str, nbytes: int, seconds: float) -> None:
+        self._add(func_name, bytes_written=nbytes, store_seconds=seconds, stores=1)
+
+    def record_error(self, func_name: str) -> None:
+        self._add(func_name, errors=1)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Counters recorded by this process, keyed by function name."""
+        with self._lock:
+            return {name: summarize(dict(c)) for name, c in self._totals.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._totals.clear()
+            self._pending.clear()
+
+    def flush(self, path: str = None) -> None:
+        """Merge counters recorded since the last flush into the shared stats file."""
+        path = path or os.path.join(Config.CACHE_DIR, STATS_FILENAME)
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(_new_counters)
+        if not pending:
+            return
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            with file_lock(path + ".lock", timeout=5):
+                merged = load_persisted(path)
+                for name, counters in pending.items():
+                    target = merged.setdefault(name, _new_counters())
+                    for field in COUNTER_FIELDS:
+                        target[field] = target.get(field, 0) + counters[field]
+                tmp_path = f"{path}.{os.getpid()}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(merged, f)
+                os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Failed to persist cache stats: {e}")
+
+    def log_summary(self) -> None:
+        for name, s in sorted(self.snapshot().items()):
+            logger.info(
+                f"[CacheStats] {name}: hits={s['hits']} misses={s['misses']} errors={s['errors']} "
+                f"hit_rate={s['hit_rate']:.0%} read={s['bytes_read']}B written={s['bytes_written']}B "
+                f"load={s['avg_load_ms']:.1f}ms store={s['avg_store_ms']:.1f}ms"
+            )
+
+
+def load_persisted(path: str = None) -> Dict[str, Dict[str, float]]:
+    """Read the shared stats file written by `CacheStats.flush` (raw counters)."""
+    path = path or os.path.join(Config.CACHE_DIR, STATS_FILENAME)
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+stats = CacheStats()
+atexit.register(stats.flush)
+
+_reporter = None
+_reporter_lock = threading.Lock()
+
+
+def start_periodic_reporting(interval: float = None) -> None:
+    """
+    Start a daemon thread that logs and persists the counters every
+    `interval` seconds (default: Config.CACHE_STATS_INTERVAL; 0 disables).
+    Safe to call repeatedly — only one reporter runs per process.
+    """
+    global _reporter
+    interval = Config.CACHE_STATS_INTERVAL if interval is None else interval
+    if not interval or interval <= 0:
+        return
+    with _reporter_lock:
+        if _reporter is not None:
+            return
+
+        def report():
+            while True:
+                time.sleep(interval)
+                stats.log_summary()
+                stats.flush()
+
+        _reporter = threading.Thread(target=report, name="cache-stats-reporter", daemon=True)
+        _reporter.start()
@@ -0,0 +1,220 @@
+"""
+Circuit Breakers
+----------------
+One breaker per outbound provider (groq, ddgs, unsplash, dalle), so when a
+provider is down callers go straight to their existing fallbacks instead
+of paying the full timeout plus retries on every slide.
+
+  closed     calls pass through; consecutive transient failures are counted.
+  open       after Config.CIRCUIT_FAILURE_THRESHOLD failures, calls raise
+             CircuitOpenError immediately for Config.CIRCUIT_RESET_TIMEOUT s.
+  half_open  after the timeout, a single probe call is let through: success
+             closes the circuit, failure re-opens it.
+
+Only transport / rate-limit / 5xx errors (tools.retry.is_retryable) count as
+failures — a parse error means the provider answered.
+
+Breakers live in the process that makes the calls. Every open/close
+transition is also written to `<CACHE_DIR>/circuit_state.json`, so the
+/health server (health.py, a separate process) can report them; with
+several workers, the latest transition per provider wins.
+
+Usage:
+    with get_breaker("unsplash"):
+        response = requests.get(url, timeout=5)
+"""
+import os
+import json
+import time
+import threading
+from typing import Any, Callable, Dict
+from utils.logger import get_logger
+from utils.config import Config
+from tools.retry import is_retryable
+from tools.cache_backends import file_lock
+
+logger = get_logger(__name__)
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+STATE_FILENAME = "circuit_state.json"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a provider whose circuit is open."""
+
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"Circuit '{name}' is open; next probe in {retry_in:.0f}s")
+        self.name = name
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """Thread-safe consecutive-failure circuit breaker with single-probe half-open state."""
+
+    def __init__(self, name: str, failure_threshold: int = None, reset_timeout: float = None):
+        self.name = name
+        self.failure_threshold = failure_threshold or Config.CIRCUIT_FAILURE_THRESHOLD
+        self.reset_timeout = Config.CIRCUIT_RESET_TIMEOUT if reset_timeout is None else reset_timeout
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._opened_at_wall = 0.0  # time.time() of the last opening, for other processes
+        self._probing = False
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = HALF_OPEN
+            self._probing = False
+        return self._state
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def allow(self) -> bool:
+        """Whether a call may go through now (claims the probe slot when half-open)."""
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            recovered = self._state != CLOSED
+            if recovered:
+                logger.info(f"Circuit '{self.name}' closed — provider recovered.")
+            self._state = CLOSED
+            self._failures = 0
+            self._probing = False
+        if recovered:
+            publish_state(self)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            opened = False
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    logger.warning(
+                        f"Circuit '{self.name}' opened after {self._failures} failures; "
+                        f"skipping calls for {self.reset_timeout:.0f}s."
+                    )
+                    opened = True
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+                self._opened_at_wall = time.time()
+        if opened:
+            publish_state(self)
+
+    def __enter__(self):
+        if not self.allow():
+            with self._lock:
+                retry_in = max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+            raise CircuitOpenError(self.name, retry_in)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc is not None and is_retryable(exc):
+            self.record_failure()
+        else:
+            self.record_success()
+        return False
+
+    def call(self, func: Callable, *args, **kwargs) -> Any:
+        """Run `func(*args, **kwargs)` through the breaker."""
+        with self:
+            return func(*args, **kwargs)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            state = self._current_state()
+            info = {"state": state, "failures": self._failures}
+            if state == OPEN:
+                info["retry_in"] = round(max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at)), 1)
+            return info
+
+
+def _state_path() -> str:
+    return os.path.join(Config.CACHE_DIR, STATE_FILENAME)
+
+
+def _load_shared(path: str) -> Dict[str, Dict[str, Any]]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def publish_state(breaker: CircuitBreaker) -> None:
+    """Record `breaker`'s state in the shared state file; failures are logged and never raised."""
+    with breaker._lock:
+        entry = {"state": breaker._state, "failures": breaker._failures,
+                 "opened_at": breaker._opened_at_wall, "reset_timeout": breaker.reset_timeout,
+                 "updated_at": time.time(), "pid": os.getpid()}
+    path = _state_path()
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with file_lock(path + ".lock", timeout=5):
+            states = _load_shared(path)
+            states[breaker.name] = entry
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(states, f)
+            os.replace(tmp_path, path)
+    except Exception as e:
+        logger.warning(f"Failed to publish circuit state for '{breaker.name}': {e}")
+
+
+def shared_breaker_states() -> Dict[str, Dict[str, Any]]:
+    """
+    Breaker states published by every process sharing Config.CACHE_DIR,
+    in the same shape as `breaker_states()` plus the publishing "pid".
+    """
+    now = time.time()
+    states = {}
+    for name, entry in _load_shared(_state_path()).items():
+        state = entry.get("state", CLOSED)
+        info = {"state": state, "failures": entry.get("failures", 0), "pid": entry.get("pid")}
+        if state == OPEN:
+            retry_in = entry.get("reset_timeout", 0) - (now - entry.get("opened_at", 0))
+            if retry_in <= 0:
+                info["state"] = HALF_OPEN
+            else:
+                info["retry_in"] = round(retry_in, 1)
+        states[name] = info
+    return states
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_registry_lock = threading.Lock()
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """Return the process-wide breaker for provider `name`, creating it on first use."""
+    with _registry_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = _breakers[name] = CircuitBreaker(name)
+        return breaker
+
+
+def breaker_states() -> Dict[str, Dict[str, Any]]:
+    """State of every breaker created so far, keyed by provider name."""
+    with _registry_lock:
+        breakers = list(_breakers.values())
+    return {b.name: b.snapshot() for b in breakers}
+
+
+def reset_breakers() -> None:
+    """Forget all breakers (all circuits closed)."""
+    with _registry_lock:
+        _breakers.clear()
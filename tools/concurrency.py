@@ -0,0 +1,98 @@
+"""
+Concurrent Tasks
+----------------
+Runs a batch of independent, blocking tasks (web searches, per-slide image
+lookups) on a thread pool, each bounded by a timeout counted from the
+moment it starts, and the whole batch bounded by one overall deadline.
+
+  - Worker threads run in a copy of the caller's context, so they charge
+    the current run's retry budget (utils/error_handler.py).
+  - Tasks that fail are logged and left out of the result; so are tasks
+    that time out. A thread cannot be interrupted, so timed-out tasks are
+    abandoned and finish in the background — still holding their worker.
+  - The batch deadline covers that case: if hung tasks occupy every
+    worker, queued tasks never start, so per-task timeouts alone could
+    wait forever. At the deadline every unfinished task is abandoned.
+
+Usage:
+    results = run_concurrently({title: lambda q=q: web_search(q) for title, q in queries.items()},
+                               max_workers=5, timeout=10, name="Search")
+"""
+import math
+import time
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Dict, Hashable, TypeVar
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+K = TypeVar("K", bound=Hashable)
+T = TypeVar("T")
+
+
+def run_concurrently(tasks: Dict[K, Callable[[], T]], max_workers: int, timeout: float,
+                     deadline: float = None, name: str = "Task", label: Callable[[K], str] = str,
+                     thread_name_prefix: str = "task") -> Dict[K, T]:
+    """
+    Run every zero-argument task in `tasks` concurrently.
+
+    Args:
+        tasks: {key: callable}.
+        max_workers: Size of the thread pool.
+        timeout: Seconds each task gets from the moment it starts.
+        deadline: Seconds the whole batch gets from this call (default: the
+            time the queue needs if every task uses its full timeout,
+            timeout x ceil(len(tasks) / max_workers)).
+        name: What a task is, for log messages (e.g. "Search").
+        label: Describes a key in log messages (default: str).
+        thread_name_prefix: Name prefix of the worker threads.
+
+    Returns:
+        {key: result} for the tasks that finished in time without raising,
+        in completion order.
+    """
+    if deadline is None:
+        deadline = timeout * math.ceil(len(tasks) / max_workers) if tasks else 0.0
+    batch_end = time.monotonic() + deadline
+    started: Dict[K, float] = {}
+
+    def run(key: K, task: Callable[[], T]) -> T:
+        started[key] = time.monotonic()
+        return task()
+
+    results: Dict[K, T] = {}
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+    try:
+        # copy_context() carries the run's retry budget into the worker threads
+        futures = {
+            executor.submit(contextvars.copy_context().run, run, key, task): key
+            for key, task in tasks.items()
+        }
+        pending = set(futures)
+        while pending:
+            now = time.monotonic()
+            deadlines = {f: min(started.get(futures[f], now) + timeout, batch_end) for f in pending}
+            done, pending = wait(pending, timeout=max(0.0, min(deadlines.values()) - now),
+                                 return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    results[futures[future]] = future.result()
+                except Exception as e:
+                    logger.warning(f"{name} failed for '{label(futures[future])}': {type(e).__name__}: {e}")
+            now = time.monotonic()
+            if pending and now >= batch_end:
+                logger.warning(f"{len(pending)} {name} task(s) abandoned at the {deadline:.0f}s batch deadline: "
+                               f"{', '.join(str(label(futures[f])) for f in pending)}.")
+                break
+            # Tasks may have started during the wait, so their deadlines are computed afresh
+            for future in [f for f in pending
+                           if futures[f] in started and min(started[futures[f]] + timeout, batch_end) <= now]:
+                logger.warning(f"{name} for '{label(futures[future])}' timed out after {timeout:.0f}s.")
+                future.cancel()
+                pending.discard(future)
+    finally:
+        # Do not wait for abandoned tasks; they finish in the background
+        executor.shutdown(wait=False, cancel_futures=True)
+    return results
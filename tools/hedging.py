@@ -0,0 +1,203 @@
+"""
+Hedged Requests
+---------------
+Tail-latency guard for idempotent lookups (DuckDuckGo text search, Unsplash
+search). When Config.HEDGING_ENABLED, a call that has not returned within
+the provider's rolling p90 latency (Config.HEDGE_PERCENTILE) gets a
+duplicate, and whichever finishes first wins.
+
+  - Latency percentiles are tracked per provider over the last
+    Config.HEDGE_WINDOW calls; no hedging until Config.HEDGE_MIN_SAMPLES
+    have been seen.
+  - A per-provider budget caps hedges at Config.HEDGE_MAX_EXTRA_LOAD
+    (e.g. 0.1 = at most 10% extra requests).
+  - The hedge delay is counted from when the primary call starts running
+    on the shared executor, so time spent queued behind other calls does
+    not trigger hedges; and no hedge is sent while the executor has no idle
+    worker, since a saturated pool is when extra load hurts most.
+  - A call never waits for a worker: with the executor saturated it runs
+    unhedged in the caller's thread, and a primary still queued after the
+    hedge delay is withdrawn and run there too, so the caller's own
+    timeouts and deadlines keep applying.
+  - The losing call is cancelled if it has not started yet; a call already
+    in flight cannot be interrupted from another thread, so its result is
+    simply discarded.
+
+Usage:
+    response = hedged("unsplash", requests.get, url, timeout=5)
+"""
+import time
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+
+from utils.logger import get_logger
+from utils.config import Config
+
+logger = get_logger(__name__)
+
+
+class Hedger:
+    """Rolling latency tracker plus hedge budget for one provider."""
+
+    def __init__(self, name: str, window: int = None, percentile: float = None,
+                 min_samples: int = None, max_extra_load: float = None):
+        self.name = name
+        self.percentile = percentile or Config.HEDGE_PERCENTILE
+        self.min_samples = Config.HEDGE_MIN_SAMPLES if min_samples is None else min_samples
+        self.max_extra_load = Config.HEDGE_MAX_EXTRA_LOAD if max_extra_load is None else max_extra_load
+        self._latencies = deque(maxlen=window or Config.HEDGE_WINDOW)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def record_latency(self, seconds: float) -> None:
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds to wait before hedging, or None while there are too few samples."""
+        with self._lock:
+            if len(self._latencies) < max(self.min_samples, 1):
+                return None
+            return float(np.percentile(self._latencies, self.percentile))
+
+    def _start_call(self) -> None:
+        with self._lock:
+            self.calls += 1
+
+    def _acquire_hedge(self) -> bool:
+        """Take one hedge from the budget if it keeps hedges <= max_extra_load * calls."""
+        with self._lock:
+            if self.hedges + 1 > self.max_extra_load * self.calls:
+                return False
+            self.hedges += 1
+            return True
+
+    def stats(self) -> Dict[str, Any]:
+        delay = self.hedge_delay()
+        with self._lock:
+            return {"calls": self.calls, "hedges": self.hedges, "hedge_wins": self.hedge_wins,
+                    "hedge_delay": None if delay is None else round(delay, 3)}
+
+    def _call_inline(self, func: Callable, *args, **kwargs) -> Any:
+        start = time.monotonic()
+        result = func(*args, **kwargs)
+        self.record_latency(time.monotonic() - start)
+        return result
+
+    def call(self, func: Callable, *args, **kwargs) -> Any:
+        """Run `func`, hedging with a duplicate call if it is slower than the tracked percentile."""
+        self._start_call()
+        delay = self.hedge_delay()
+        if delay is None or not _has_idle_worker():
+            return self._call_inline(func, *args, **kwargs)
+
+        running = threading.Event()
+
+        def primary_call():
+            running.set()
+            return func(*args, **kwargs)
+
+        primary = _submit(primary_call)
+        if not running.wait(timeout=delay) and primary.cancel():
+            # The pool filled up before the primary got a worker
+            return self._call_inline(func, *args, **kwargs)
+        running.wait()  # queueing time is not provider latency
+        start = time.monotonic()
+        done, _ = wait([primary], timeout=delay)
+        if done or not _has_idle_worker() or not self._acquire_hedge():
+            result = primary.result()
+            self.record_latency(time.monotonic() - start)
+            return result
+
+        logger.debug(f"Hedging {self.name} call after {delay:.2f}s.")
+        hedge = _submit(func, *args, **kwargs)
+        pending = {primary, hedge}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    error = future.exception()
+                    continue
+                for loser in pending:
+                    loser.cancel()
+                if future is hedge:
+                    with self._lock:
+                        self.hedge_wins += 1
+                self.record_latency(time.monotonic() - start)
+                return future.result()
+        raise error
+
+
+_hedgers: Dict[str, Hedger] = {}
+_registry_lock = threading.Lock()
+_executor = None
+_busy = 0  # calls submitted to the executor and not yet finished
+_busy_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _registry_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=Config.HEDGE_MAX_WORKERS, thread_name_prefix="hedge")
+        return _executor
+
+
+def _finished(_future) -> None:
+    global _busy
+    with _busy_lock:
+        _busy -= 1
+
+
+def _submit(func: Callable, *args, **kwargs) -> Future:
+    """Submit to the shared executor, tracking how many of its workers are busy."""
+    global _busy
+    with _busy_lock:
+        _busy += 1
+    future = _get_executor().submit(func, *args, **kwargs)
+    future.add_done_callback(_finished)
+    return future
+
+
+def _has_idle_worker() -> bool:
+    with _busy_lock:
+        return _busy < Config.HEDGE_MAX_WORKERS
+
+
+def get_hedger(name: str) -> Hedger:
+    """Return the process-wide hedger for provider `name`, creating it on first use."""
+    with _registry_lock:
+        hedger = _hedgers.get(name)
+        if hedger is None:
+            hedger = _hedgers[name] = Hedger(name)
+        return hedger
+
+
+def hedged(name: str, func: Callable, *args, **kwargs) -> Any:
+    """
+    Call `func(*args, **kwargs)`, hedged under provider `name` when
+    Config.HEDGING_ENABLED (a plain call otherwise). `func` must be idempotent.
+    """
+    if not Config.HEDGING_ENABLED:
+        return func(*args, **kwargs)
+    return get_hedger(name).call(func, *args, **kwargs)
+
+
+def hedging_stats() -> Dict[str, Dict[str, Any]]:
+    """Calls, hedges and hedge wins per provider."""
+    with _registry_lock:
+        hedgers = list(_hedgers.values())
+    return {h.name: h.stats() for h in hedgers}
+
+
+def reset_hedgers() -> None:
+    """Forget all latency samples and budgets."""
+    with _registry_lock:
+        _hedgers.clear()
@@ -0,0 +1,168 @@
+"""
+Image Downloads
+---------------
+Prefetches slide images for the BuilderAgent, so rendering the deck never
+waits on the network.
+
+  - All images are downloaded concurrently (Config.IMAGE_DOWNLOAD_MAX_WORKERS)
+    through pooled keep-alive requests.Sessions (tools/session_pool.py),
+    with at most Config.IMAGE_DOWNLOAD_PER_HOST requests per host.
+  - The whole batch shares one deadline (Config.IMAGE_DOWNLOAD_DEADLINE);
+    images still downloading then are left out, and their slides are
+    rendered without a picture.
+  - Bodies are streamed and abandoned above Config.IMAGE_MAX_BYTES.
+  - With Config.IMAGE_STORE_ENABLED, images already in the local image
+    store (tools/image_store.py) are read from it instead of the network,
+    and new downloads are added to it, so repeat decks need no image
+    downloads at all.
+"""
+import mmap
+import time
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, Iterable, Optional, Union
+
+import requests
+
+from utils.logger import get_logger
+from utils.config import Config
+from tools.session_pool import get_pool, host_slot
+from tools.image_store import get_image_store
+
+logger = get_logger(__name__)
+
+# Some image hosts answer 403 to the default python-requests User-Agent
+USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+              "(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
+
+
+def _new_session() -> requests.Session:
+    session = requests.Session()
+    session.headers["User-Agent"] = USER_AGENT
+    return session
+
+
+def download_image(url: str, deadline: float) -> Optional[bytes]:
+    """
+    Download one image before `deadline` (time.monotonic()).
+
+    Returns:
+        The image bytes, or None on HTTP errors, oversized bodies or timeouts.
+    """
+    slot = host_slot("images", url, Config.IMAGE_DOWNLOAD_PER_HOST)
+    if not slot.acquire(timeout=max(0.0, deadline - time.monotonic())):
+        logger.warning(f"Image download skipped (deadline reached): {url}")
+        return None
+    try:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        pool = get_pool("images", _new_session, size=Config.IMAGE_DOWNLOAD_MAX_WORKERS)
+        with pool.session() as session:
+            with session.get(url, stream=True, timeout=min(Config.IMAGE_DOWNLOAD_TIMEOUT, remaining)) as response:
+                if response.status_code != 200:
+                    logger.warning(f"Image download failed code {response.status_code} for {url}")
+                    return None
+                body = bytearray()
+                for chunk in response.iter_content(chunk_size=65536):
+                    body.extend(chunk)
+                    if len(body) > Config.IMAGE_MAX_BYTES:
+                        logger.warning(f"Image larger than {Config.IMAGE_MAX_BYTES} bytes skipped: {url}")
+                        return None
+                    if time.monotonic() >= deadline:
+                        logger.warning(f"Image download ran past the deadline: {url}")
+                        return None
+                return bytes(body)
+    except Exception as e:
+        logger.error(f"Failed to download image {url}: {e}")
+        return None
+    finally:
+        slot.release()
+
+
+def fetch_image(url: str, deadline: float) -> Optional[Union[bytes, mmap.mmap]]:
+    """
+    The image at `url`: from the image store when present (a read-only
+    mmap), otherwise downloaded before `deadline` and added to the store.
+
+    Store errors (e.g. a locked index or a corrupt blob) count as a miss.
+
+    Returns:
+        Image bytes or a file-like mmap of them; None if unavailable.
+    """
+    store = get_image_store()
+    if store is not None:
+        try:
+            stored = store.get(url)
+        except Exception as e:
+            logger.warning(f"Could not read {url} from the image store: {e}")
+            stored = None
+        if stored is not None:
+            return stored
+    data = download_image(url, deadline)
+    if data and store is not None:
+        try:
+            store.put(url, data)
+        except Exception as e:
+            logger.warning(f"Could not add {url} to the image store: {e}")
+    return data
+
+
+def store_image(url: str, timeout: float = None) -> bool:
+    """
+    Make sure `url` is in the image store, downloading it if needed, so a
+    later download_images() reads it locally.
+
+    Returns:
+        True if the image is stored; False if it could not be fetched or the
+        store is disabled.
+    """
+    if not url or get_image_store() is None:
+        return False
+    image = fetch_image(url, time.monotonic() + (Config.IMAGE_DOWNLOAD_TIMEOUT if timeout is None else timeout))
+    if isinstance(image, mmap.mmap):
+        image.close()
+    return image is not None
+
+
+def download_images(urls: Iterable[str], deadline: float = None,
+                    max_workers: int = None) -> Dict[str, Union[bytes, mmap.mmap]]:
+    """
+    Fetch `urls` (image store first, then network) concurrently within one overall deadline.
+
+    Args:
+        urls: Image URLs; empty values and duplicates are ignored.
+        deadline: Seconds allowed for the whole batch (default: Config.IMAGE_DOWNLOAD_DEADLINE).
+        max_workers: Concurrent downloads (default: Config.IMAGE_DOWNLOAD_MAX_WORKERS).
+
+    Returns:
+        {url: image bytes or read-only mmap} for the images available in time.
+    """
+    urls = list(dict.fromkeys(u for u in urls if u))
+    if not urls:
+        return {}
+    seconds = Config.IMAGE_DOWNLOAD_DEADLINE if deadline is None else deadline
+    until = time.monotonic() + seconds
+
+    images: Dict[str, Union[bytes, mmap.mmap]] = {}
+    executor = ThreadPoolExecutor(max_workers=min(max_workers or Config.IMAGE_DOWNLOAD_MAX_WORKERS, len(urls)),
+                                  thread_name_prefix="image-dl")
+    try:
+        futures = {executor.submit(contextvars.copy_context().run, fetch_image, url, until): url
+                   for url in urls}
+        done, pending = wait(futures, timeout=seconds)
+        for future in done:
+            try:
+                data = future.result()
+            except Exception as e:
+                logger.error(f"Failed to fetch image {futures[future]}: {e}")
+                data = None
+            if data:
+                images[futures[future]] = data
+        if pending:
+            logger.warning(f"{len(pending)} image downloads missed the {seconds:.0f}s deadline.")
+    finally:
+        # Do not wait for downloads past the deadline; they stop at their next chunk
+        executor.shutdown(wait=False, cancel_futures=True)
+    logger.info(f"Prefetched {len(images)}/{len(urls)} images.")
+    return images
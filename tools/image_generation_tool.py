@@ -11,6 +11,9 @@ import requests
 from utils.logger import get_logger
 from utils.config import Config
 from utils.error_handler import safe_run
+from tools.circuit_breaker import get_breaker
+from tools.retry import RETRYABLE_STATUS
+from tools.hedging import hedged
 
 logger = get_logger(__name__)
 
@@ -21,12 +24,13 @@ def _generate_dalle_image(prompt: str) -> str:
     """Generate an image using OpenAI DALL-E 3."""
     from openai import OpenAI
     client = OpenAI(api_key=Config.OPENAI_API_KEY)
-    response = client.images.generate(
-        model="dall-e-3",
-        prompt=prompt,
-        n=1,
-        size="1024x1024",
-    )
+    with get_breaker("dalle"):
+        response = client.images.generate(
+            model="dall-e-3",
+            prompt=prompt,
+            n=1,
+            size="1024x1024",
+        )
     url = response.data[0].url
     logger.info(f"DALL-E generated image for prompt: '{prompt[:50]}...'")
     return url
@@ -40,7 +44,10 @@ def _fetch_unsplash_image(query: str) -> str:
         return ""
 
     url = f"https://api.unsplash.com/search/photos?page=1&query={query}&client_id={api_key}"
-    response = requests.get(url, timeout=5)
+    with get_breaker("unsplash"):
+        response = hedged("unsplash", requests.get, url, timeout=5)
+        if response.status_code in RETRYABLE_STATUS:
+            response.raise_for_status()
     if response.status_code == 200:
         data = response.json()
         if data.get("results"):
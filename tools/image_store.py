@@ -0,0 +1,173 @@
+"""
+Image Store
+-----------
+Content-addressed local store for downloaded images, shared by every deck
+and every worker process using the same Config.CACHE_DIR:
+
+  <CACHE_DIR>/images/blobs/ab/abcdef…   image bytes, named by SHA-256
+  <CACHE_DIR>/images/index.sqlite3     url -> digest, blob sizes, last access
+
+  - Writes are atomic (temp file + os.replace) and de-duplicated: the same
+    image reached through different URLs is stored once.
+  - Reads map the blob read-only (mmap), so renderers get a file-like view
+    without copying the image into the Python heap first.
+  - When the blobs exceed Config.IMAGE_STORE_MAX_BYTES, the least recently
+    used ones are evicted together with the URLs pointing at them.
+
+The index uses SQLite in WAL mode with per-thread connections, like the
+SQLite cache backend, so several processes can share one store.
+"""
+import os
+import mmap
+import time
+import sqlite3
+import hashlib
+import tempfile
+import threading
+from typing import Optional
+
+from utils.logger import get_logger
+from utils.config import Config
+
+logger = get_logger(__name__)
+
+
+class ImageStore:
+    """Content-addressed blob store with a URL index and LRU size cap."""
+
+    _SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS blobs ("
+        " digest TEXT PRIMARY KEY,"
+        " size INTEGER NOT NULL,"
+        " accessed_at REAL NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS idx_blobs_accessed_at ON blobs (accessed_at)",
+        "CREATE TABLE IF NOT EXISTS urls ("
+        " url TEXT PRIMARY KEY,"
+        " digest TEXT NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS idx_urls_digest ON urls (digest)",
+    )
+
+    def __init__(self, directory: str = None, max_bytes: int = None):
+        self.directory = directory or os.path.join(Config.CACHE_DIR, "images")
+        self.blob_dir = os.path.join(self.directory, "blobs")
+        os.makedirs(self.blob_dir, exist_ok=True)
+        self.db_path = os.path.join(self.directory, "index.sqlite3")
+        self.max_bytes = Config.IMAGE_STORE_MAX_BYTES if max_bytes is None else max_bytes
+        self._local = threading.local()
+
+        conn = self._connect()
+        conn.execute("PRAGMA journal_mode=WAL")
+        for statement in self._SCHEMA:
+            conn.execute(statement)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.blob_dir, digest[:2], digest)
+
+    def get(self, url: str) -> Optional[mmap.mmap]:
+        """
+        Read-only memory map of the image stored for `url`, or None.
+
+        The map is a file-like object (read/seek), usable directly as an
+        image stream; close it when done.
+        """
+        conn = self._connect()
+        row = conn.execute("SELECT digest FROM urls WHERE url = ?", (url,)).fetchone()
+        if row is None:
+            return None
+        try:
+            with open(self._blob_path(row[0]), "rb") as f:
+                view = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):  # evicted by another process, or empty
+            conn.execute("DELETE FROM urls WHERE url = ?", (url,))
+            return None
+        conn.execute("UPDATE blobs SET accessed_at = ? WHERE digest = ?", (time.time(), row[0]))
+        return view
+
+    def put(self, url: str, data: bytes) -> str:
+        """
+        Store `data` as the image for `url`.
+
+        Returns:
+            The content digest (SHA-256 hex). Identical content is written once.
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._blob_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(tmp, path)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+        now = time.time()
+        conn = self._connect()
+        conn.execute(
+            "INSERT INTO blobs (digest, size, accessed_at) VALUES (?, ?, ?)"
+            " ON CONFLICT(digest) DO UPDATE SET accessed_at = excluded.accessed_at",
+            (digest, len(data), now),
+        )
+        conn.execute("INSERT OR REPLACE INTO urls (url, digest) VALUES (?, ?)", (url, digest))
+        if self.max_bytes:
+            self.evict(self.max_bytes)
+        return digest
+
+    def evict(self, max_bytes: int) -> int:
+        """
+        Remove least recently used blobs (and their URLs) until the total size
+        is at most `max_bytes`.
+
+        Returns:
+            The number of blobs removed.
+        """
+        conn = self._connect()
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+        if total <= max_bytes:
+            return 0
+        excess, victims = total - max_bytes, []
+        for digest, size in conn.execute("SELECT digest, size FROM blobs ORDER BY accessed_at ASC"):
+            victims.append(digest)
+            excess -= size
+            if excess <= 0:
+                break
+        for digest in victims:
+            conn.execute("DELETE FROM urls WHERE digest = ?", (digest,))
+            conn.execute("DELETE FROM blobs WHERE digest = ?", (digest,))
+            try:
+                os.unlink(self._blob_path(digest))
+            except FileNotFoundError:
+                pass
+        logger.info(f"Evicted {len(victims)} images from the image store.")
+        return len(victims)
+
+    def stats(self) -> dict:
+        """{"urls": int, "blobs": int, "bytes": int}"""
+        conn = self._connect()
+        blobs, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM blobs").fetchone()
+        urls = conn.execute("SELECT COUNT(*) FROM urls").fetchone()[0]
+        return {"urls": urls, "blobs": blobs, "bytes": size}
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_image_store() -> Optional[ImageStore]:
+    """The process-wide image store, or None when Config.IMAGE_STORE_ENABLED is off."""
+    global _store
+    if not Config.IMAGE_STORE_ENABLED:
+        return None
+    with _store_lock:
+        if _store is None:
+            _store = ImageStore()
+        return _store
@@ -0,0 +1,230 @@
+"""
+LLM Response Cache
+------------------
+Provider-level cache installed as LangChain's global LLM cache, so every
+ChatGroq call is served from it — including call sites that are not
+wrapped in `disk_cache`, and calls whose Python arguments differ but
+render the same prompt.
+
+Entries are keyed by the model/sampling-parameter string LangChain builds
+for the model plus the rendered messages, and stored in a single SQLite
+database (WAL mode) under Config.CACHE_DIR. Each entry records its token
+usage and the latency of the original call, so `savings()` can report
+the tokens, dollars and seconds that cache hits avoided.
+
+The cache stores the raw reply before any output parser sees it, so call
+sites that parse replies run the chain inside `discard_on_error()`: if
+parsing (or anything else in the block) fails, the entries it used are
+deleted and the next call asks the model again instead of replaying the
+malformed reply.
+"""
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from langchain_core.caches import BaseCache
+from langchain_core.globals import get_llm_cache, set_llm_cache
+from langchain_core.load import dumps, loads
+from langchain_core.outputs import Generation
+
+from utils.logger import get_logger
+from utils.config import Config
+
+logger = get_logger(__name__)
+
+DB_FILENAME = "llm_cache.sqlite3"
+
+# Lookups older than this are not matched to a later update() when measuring latency
+_PENDING_TTL = 600
+
+# Keys read or written inside the current discard_on_error() block
+_used_keys: contextvars.ContextVar[Optional[List[str]]] = contextvars.ContextVar("llm_cache_used_keys", default=None)
+
+
+def _note_used(key: str) -> None:
+    used = _used_keys.get()
+    if used is not None:
+        used.append(key)
+
+
+def _usage(generations: Sequence[Generation]) -> tuple:
+    """Sum input/output token counts from the generations' usage metadata."""
+    input_tokens = output_tokens = 0
+    for gen in generations:
+        message = getattr(gen, "message", None)
+        usage = getattr(message, "usage_metadata", None) or {}
+        if not usage:
+            usage = (getattr(message, "response_metadata", None) or {}).get("token_usage", {}) or {}
+            input_tokens += usage.get("prompt_tokens", 0) or 0
+            output_tokens += usage.get("completion_tokens", 0) or 0
+            continue
+        input_tokens += usage.get("input_tokens", 0) or 0
+        output_tokens += usage.get("output_tokens", 0) or 0
+    return input_tokens, output_tokens
+
+
+class PromptCache(BaseCache):
+    """SQLite-backed LangChain cache with per-entry token and latency accounting."""
+
+    def __init__(self, db_path: str = None):
+        self.db_path = db_path or os.path.join(Config.CACHE_DIR, DB_FILENAME)
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        self._local = threading.local()
+        self._pending: Dict[str, float] = {}
+        self._pending_lock = threading.Lock()
+
+        conn = self._connect()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            " key TEXT PRIMARY KEY,"
+            " llm_string TEXT NOT NULL,"
+            " generations TEXT NOT NULL,"
+            " input_tokens INTEGER NOT NULL DEFAULT 0,"
+            " output_tokens INTEGER NOT NULL DEFAULT 0,"
+            " latency_seconds REAL NOT NULL DEFAULT 0,"
+            " hits INTEGER NOT NULL DEFAULT 0,"
+            " created_at REAL NOT NULL,"
+            " last_hit_at REAL)"
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        return hashlib.sha256(f"{llm_string}\x00{prompt}".encode("utf-8")).hexdigest()
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[Sequence[Generation]]:
+        key = self._key(prompt, llm_string)
+        conn = self._connect()
+        row = conn.execute("SELECT generations FROM llm_cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            # Remember when the miss happened so update() can record the call's latency
+            now = time.monotonic()
+            with self._pending_lock:
+                self._pending = {k: t for k, t in self._pending.items() if now - t < _PENDING_TTL}
+                self._pending[key] = now
+            return None
+        try:
+            generations = [loads(g, allowed_objects="core") for g in json.loads(row[0])]
+        except Exception as e:
+            logger.warning(f"Unreadable LLM cache entry {key[:12]}: {e}. Calling the model.")
+            return None
+        conn.execute(
+            "UPDATE llm_cache SET hits = hits + 1, last_hit_at = ? WHERE key = ?", (time.time(), key)
+        )
+        _note_used(key)
+        logger.debug(f"LLM cache hit (Key: {key[:12]})")
+        return generations
+
+    def update(self, prompt: str, llm_string: str, return_val: Sequence[Generation]) -> None:
+        key = self._key(prompt, llm_string)
+        with self._pending_lock:
+            started = self._pending.pop(key, None)
+        latency = time.monotonic() - started if started is not None else 0.0
+        input_tokens, output_tokens = _usage(return_val)
+        try:
+            self._connect().execute(
+                "INSERT OR REPLACE INTO llm_cache"
+                " (key, llm_string, generations, input_tokens, output_tokens, latency_seconds, hits, created_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, 0, ?)",
+                (key, llm_string, json.dumps([dumps(g) for g in return_val]),
+                 input_tokens, output_tokens, latency, time.time()),
+            )
+            _note_used(key)
+        except Exception as e:
+            logger.warning(f"Failed to save LLM cache entry: {e}")
+
+    def invalidate(self, keys: Iterable[str]) -> int:
+        """Delete the entries with the given keys; returns how many existed."""
+        keys = list(keys)
+        if not keys:
+            return 0
+        cursor = self._connect().executemany("DELETE FROM llm_cache WHERE key = ?", [(k,) for k in keys])
+        return cursor.rowcount
+
+    def clear(self, **kwargs: Any) -> None:
+        self._connect().execute("DELETE FROM llm_cache")
+
+    def savings(self) -> Dict[str, float]:
+        """
+        Totals avoided by cache hits: tokens, dollars (at Config.LLM_*_COST_PER_MTOK)
+        and seconds of model latency.
+        """
+        row = self._connect().execute(
+            "SELECT COUNT(*), COALESCE(SUM(hits), 0),"
+            " COALESCE(SUM(hits * input_tokens), 0), COALESCE(SUM(hits * output_tokens), 0),"
+            " COALESCE(SUM(hits * latency_seconds), 0) FROM llm_cache"
+        ).fetchone()
+        entries, hits, input_saved, output_saved, seconds_saved = row
+        dollars = (input_saved * Config.LLM_INPUT_COST_PER_MTOK
+                   + output_saved * Config.LLM_OUTPUT_COST_PER_MTOK) / 1_000_000
+        return {
+            "entries": entries,
+            "hits": hits,
+            "input_tokens_saved": input_saved,
+            "output_tokens_saved": output_saved,
+            "dollars_saved": round(dollars, 4),
+            "seconds_saved": round(seconds_saved, 2),
+        }
+
+
+@contextmanager
+def discard_on_error():
+    """
+    Delete the LLM cache entries read or written inside the block if it raises.
+
+    Wrap chains whose replies are parsed, so a reply that fails to parse is
+    not served from the cache on every later call:
+
+        with discard_on_error():
+            response = (prompt | llm | JsonOutputParser()).invoke(inputs)
+    """
+    used: List[str] = []
+    token = _used_keys.set(used)
+    try:
+        yield
+    except BaseException:
+        cache = get_llm_cache()
+        if isinstance(cache, PromptCache) and used:
+            try:
+                cache.invalidate(used)
+                logger.info(f"Discarded {len(used)} LLM cache entr{'y' if len(used) == 1 else 'ies'} "
+                            f"from a failed call.")
+            except Exception as e:
+                logger.warning(f"Failed to discard LLM cache entries: {e}")
+        raise
+    finally:
+        _used_keys.reset(token)
+
+
+def install_llm_cache() -> Optional[PromptCache]:
+    """
+    Install PromptCache as LangChain's global LLM cache (if Config.LLM_CACHE_ENABLED).
+    Safe to call repeatedly; returns the active PromptCache or None.
+    """
+    current = get_llm_cache()
+    if isinstance(current, PromptCache):
+        return current
+    if not Config.LLM_CACHE_ENABLED:
+        return None
+    try:
+        cache = PromptCache()
+    except Exception as e:
+        logger.warning(f"LLM response cache unavailable ({e}). Calling the model directly.")
+        return None
+    set_llm_cache(cache)
+    logger.info(f"LLM response cache installed at {cache.db_path}")
+    return cache
@@ -0,0 +1,276 @@
+"""
+Local Research Corpus
+---------------------
+Offline search over a directory of Markdown / text documents, for
+deployments without internet access (see the "local" search provider in
+tools/web_search_tool.py).
+
+Documents are split into paragraph-sized passages and indexed into an
+on-disk inverted index. Every build is written to its own version
+directory under <CACHE_DIR>/corpus_index, and the CURRENT file names the
+live one; replacing CURRENT switches all files at once, so readers never
+combine files of two builds. Each version directory holds:
+
+  vocab.json          term -> [postings offset, document frequency]
+  postings.npy        passage ids, concatenated per term (int32)
+  frequencies.npy     term frequency for each posting (int32)
+  lengths.npy         token count per passage (int32)
+  passages.jsonl      passage text and source file, one per line
+  terms.jsonl         tokenized passages (aligned with passages.jsonl), so
+                      re-indexing never re-tokenizes unchanged files
+  manifest.json       size / mtime of every indexed file
+
+The .npy arrays are opened with `mmap_mode="r"`, so a query only touches
+the postings of its own terms. Scoring is BM25 (k1=1.5, b=0.75).
+
+Searches re-read CURRENT, so a rebuild by another process is picked up.
+The previous version is kept for readers still loading it; older ones
+are removed.
+
+`update()` is incremental: unchanged files (same size and mtime) keep their
+passages from the previous build; only new or modified files are re-read.
+"""
+import os
+import json
+import time
+import shutil
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from utils.logger import get_logger
+from utils.config import Config
+from tools.text_similarity import tokenize
+
+logger = get_logger(__name__)
+
+EXTENSIONS = (".md", ".markdown", ".txt")
+MAX_PASSAGE_CHARS = 800
+K1, B = 1.5, 0.75
+CURRENT_FILENAME = "CURRENT"
+
+
+def split_passages(text: str, max_chars: int = MAX_PASSAGE_CHARS) -> List[str]:
+    """Split a document on blank lines, merging short paragraphs up to `max_chars`."""
+    passages, current = [], ""
+    for para in (p.strip() for p in text.split("\n\n")):
+        if not para:
+            continue
+        para = " ".join(line.strip().lstrip("#").strip() for line in para.splitlines())
+        if current and len(current) + len(para) + 1 > max_chars:
+            passages.append(current)
+            current = ""
+        current = f"{current} {para}".strip()
+        while len(current) > max_chars:
+            cut = current.rfind(" ", 0, max_chars)
+            cut = cut if cut > 0 else max_chars
+            passages.append(current[:cut])
+            current = current[cut:].strip()
+    if current:
+        passages.append(current)
+    return passages
+
+
+class CorpusIndex:
+    """Memory-mapped BM25 inverted index over a document directory."""
+
+    def __init__(self, index_dir: str = None):
+        self.index_dir = index_dir or os.path.join(Config.CACHE_DIR, "corpus_index")
+        self._lock = threading.Lock()
+        self._version: Optional[str] = None
+        self._vocab: Dict[str, Tuple[int, int]] = {}
+        self._postings = self._frequencies = self._lengths = None
+        self._passages: List[Dict[str, str]] = []
+        self._avg_length = 1.0
+
+    def _current(self) -> Optional[str]:
+        """Name of the live version directory, or None if nothing is indexed yet."""
+        try:
+            with open(os.path.join(self.index_dir, CURRENT_FILENAME), encoding="utf-8") as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def _path(self, version: str, name: str) -> str:
+        return os.path.join(self.index_dir, version, name)
+
+    def _read_manifest(self, version: Optional[str]) -> Dict[str, Dict]:
+        if version is None:
+            return {}
+        try:
+            with open(self._path(version, "manifest.json"), encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _read_lines(self, version: Optional[str], name: str) -> List:
+        if version is None:
+            return []
+        try:
+            with open(self._path(version, name), encoding="utf-8") as f:
+                return [json.loads(line) for line in f]
+        except FileNotFoundError:
+            return []
+
+    def update(self, corpus_dir: str = None) -> Dict[str, int]:
+        """
+        (Re)index `corpus_dir` (default: Config.LOCAL_CORPUS_DIR), re-reading
+        only files that are new or changed since the last build.
+
+        Returns:
+            {"files": int, "passages": int, "reindexed": int, "removed": int}
+        """
+        corpus_dir = corpus_dir or Config.LOCAL_CORPUS_DIR
+        version = self._current()
+        old_manifest = self._read_manifest(version)
+        old_passages: Dict[str, List[Dict]] = {}
+        old_terms = self._read_lines(version, "terms.jsonl")
+        for p, terms in zip(self._read_lines(version, "passages.jsonl"), old_terms):
+            old_passages.setdefault(p["source"], []).append(dict(p, terms=terms))
+
+        manifest, passages, reindexed = {}, [], 0
+        for root, _, files in os.walk(corpus_dir):
+            for name in sorted(files):
+                if not name.lower().endswith(EXTENSIONS):
+                    continue
+                path = os.path.join(root, name)
+                source = os.path.relpath(path, corpus_dir)
+                st = os.stat(path)
+                signature = {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+                manifest[source] = signature
+                if old_manifest.get(source) == signature and source in old_passages:
+                    passages.extend(old_passages[source])
+                    continue
+                reindexed += 1
+                with open(path, encoding="utf-8", errors="replace") as f:
+                    text = f.read()
+                passages.extend({"source": source, "text": t} for t in split_passages(text))
+
+        removed = len(set(old_manifest) - set(manifest))
+        if reindexed or removed or version is None:
+            self._write(passages, manifest)
+            logger.info(f"Indexed local corpus '{corpus_dir}': {len(manifest)} files, {len(passages)} passages "
+                        f"({reindexed} re-read, {removed} removed).")
+        return {"files": len(manifest), "passages": len(passages), "reindexed": reindexed, "removed": removed}
+
+    def _write(self, passages: List[Dict], manifest: Dict[str, Dict]) -> None:
+        term_ids: Dict[str, int] = {}
+        token_ids: List[int] = []
+        lengths = np.zeros(len(passages), dtype=np.int32)
+        for pid, passage in enumerate(passages):
+            if "terms" not in passage:
+                passage["terms"] = tokenize(passage["text"])
+            lengths[pid] = len(passage["terms"])
+            token_ids.extend(term_ids.setdefault(t, len(term_ids)) for t in passage["terms"])
+
+        # Sorting (term id, passage id) pairs groups the postings by term, passage order within each
+        n = max(len(passages), 1)
+        pairs, freqs = np.unique(np.asarray(token_ids, dtype=np.int64) * n
+                                 + np.repeat(np.arange(len(passages), dtype=np.int64), lengths),
+                                 return_counts=True)
+        ids = pairs % n
+        dfs = np.bincount(pairs // n, minlength=len(term_ids))
+        offsets = np.concatenate(([0], np.cumsum(dfs)[:-1])) if len(dfs) else dfs
+        vocab = {term: [int(offsets[tid]), int(dfs[tid])] for term, tid in term_ids.items()}
+
+        # Each build gets its own directory; replacing CURRENT switches readers over atomically
+        previous = self._current()
+        version = f"v{time.time_ns()}-{os.getpid()}"
+        os.makedirs(os.path.join(self.index_dir, version))
+        np.save(self._path(version, "postings.npy"), np.asarray(ids, dtype=np.int32))
+        np.save(self._path(version, "frequencies.npy"), np.asarray(freqs, dtype=np.int32))
+        np.save(self._path(version, "lengths.npy"), lengths)
+        with open(self._path(version, "passages.jsonl"), "w", encoding="utf-8") as f, \
+             open(self._path(version, "terms.jsonl"), "w", encoding="utf-8") as t:
+            for passage in passages:
+                f.write(json.dumps({"source": passage["source"], "text": passage["text"]}) + "\n")
+                t.write(json.dumps(passage["terms"]) + "\n")
+        with open(self._path(version, "vocab.json"), "w", encoding="utf-8") as f:
+            json.dump(vocab, f)
+        with open(self._path(version, "manifest.json"), "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+
+        pointer = os.path.join(self.index_dir, CURRENT_FILENAME)
+        tmp = f"{pointer}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(version)
+        os.replace(tmp, pointer)
+        self._remove_versions_before(previous)
+
+    def _remove_versions_before(self, version: Optional[str]) -> None:
+        """Delete version directories older than `version` (which stays, for readers still loading it)."""
+        if version is None:
+            return
+        for entry in os.scandir(self.index_dir):
+            if entry.is_dir() and entry.name.startswith("v") and entry.name < version:
+                shutil.rmtree(entry.path, ignore_errors=True)
+
+    def _load(self, version: str) -> None:
+        with open(self._path(version, "vocab.json"), encoding="utf-8") as f:
+            self._vocab = {term: tuple(v) for term, v in json.load(f).items()}
+        self._postings = np.load(self._path(version, "postings.npy"), mmap_mode="r")
+        self._frequencies = np.load(self._path(version, "frequencies.npy"), mmap_mode="r")
+        self._lengths = np.load(self._path(version, "lengths.npy"), mmap_mode="r")
+        self._passages = self._read_lines(version, "passages.jsonl")
+        self._avg_length = float(self._lengths.mean()) if len(self._lengths) else 1.0
+        self._version = version
+
+    def search(self, query: str, max_results: int = 5) -> List[Dict[str, str]]:
+        """
+        BM25 search over the indexed passages.
+
+        Returns:
+            Up to `max_results` dicts with "title" (source file), "body" (passage)
+            and "score", best first. Empty if nothing matches or there is no index.
+        """
+        with self._lock:
+            version = self._current()
+            if version is None:
+                return []
+            if version != self._version:
+                self._load(version)
+            vocab, postings, frequencies = self._vocab, self._postings, self._frequencies
+            lengths, passages, avg_length = self._lengths, self._passages, self._avg_length
+
+        n = len(lengths)
+        if n == 0:
+            return []
+        scores = np.zeros(n, dtype=np.float32)
+        norm = None
+        for term in set(tokenize(query)):
+            entry = vocab.get(term)
+            if entry is None:
+                continue
+            offset, df = entry
+            ids = postings[offset:offset + df]
+            tf = frequencies[offset:offset + df].astype(np.float32)
+            if norm is None:
+                norm = K1 * (1 - B + B * np.asarray(lengths, dtype=np.float32) / avg_length)
+            idf = np.log(1 + (n - df + 0.5) / (df + 0.5))
+            scores[ids] += idf * tf * (K1 + 1) / (tf + norm[ids])
+
+        matched = np.flatnonzero(scores)
+        if not len(matched):
+            return []
+        top = matched[np.argsort(-scores[matched], kind="stable")[:max_results]]
+        return [{"title": passages[i]["source"], "body": passages[i]["text"], "score": float(scores[i])}
+                for i in top]
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_corpus_index() -> CorpusIndex:
+    """Return the process-wide corpus index, bringing it up to date on first use."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            index = CorpusIndex()
+            if os.path.isdir(Config.LOCAL_CORPUS_DIR):
+                index.update()
+            else:
+                logger.warning(f"Local corpus directory '{Config.LOCAL_CORPUS_DIR}' not found.")
+            _index = index
+        return _index
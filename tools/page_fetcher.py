@@ -0,0 +1,193 @@
+"""
+Page Fetcher
+------------
+Downloads result pages and extracts their main text, for the deep research
+mode (Config.RESEARCH_FETCH_PAGES) where search teasers are too thin.
+
+  - Pages are fetched concurrently (Config.PAGE_FETCH_MAX_WORKERS) through
+    pooled requests.Sessions (tools/session_pool.py), with at most
+    Config.PAGE_FETCH_PER_HOST requests in flight per host. The batch runs
+    on tools/concurrency.py, so fetches carry the run's retry budget and
+    the whole batch can be bounded by one deadline.
+  - Bodies are streamed and cut off at Config.PAGE_FETCH_MAX_BYTES or after
+    Config.PAGE_FETCH_TIMEOUT seconds, whichever comes first; non-HTML/text
+    responses are skipped without downloading the body.
+  - Main text is extracted with the standard-library HTML parser: scripts,
+    navigation, headers, footers and forms are dropped, <article>/<main>
+    content is preferred, and short blocks (menus, bylines) are ignored.
+  - Extracted text is cached in the shared cache backend for
+    Config.PAGE_CACHE_TTL; failed fetches are not cached.
+"""
+import re
+import time
+from html.parser import HTMLParser
+from typing import Dict, List, Tuple
+from urllib.parse import urlsplit
+
+import requests
+
+from utils.logger import get_logger
+from utils.config import Config
+from tools.cache import ttl_cache
+from tools.session_pool import get_pool, host_slot
+from tools.concurrency import run_concurrently
+
+logger = get_logger(__name__)
+
+USER_AGENT = "Mozilla/5.0 (compatible; AgenticPPTBuilder/1.0; research)"
+TEXT_TYPES = ("text/html", "application/xhtml+xml", "text/plain")
+MIN_BLOCK_WORDS = 8
+
+_SKIP_TAGS = frozenset({"script", "style", "noscript", "svg", "nav", "header", "footer", "aside",
+                        "form", "button", "select", "template", "iframe"})
+_BLOCK_TAGS = frozenset({"p", "div", "section", "article", "main", "li", "ul", "ol", "h1", "h2", "h3",
+                         "h4", "h5", "h6", "blockquote", "pre", "td", "th", "tr", "table", "br", "dd", "dt"})
+_MAIN_TAGS = frozenset({"article", "main"})
+_VOID_TAGS = frozenset({"br", "img", "hr", "meta", "link", "input", "source", "wbr"})
+
+
+class _TextExtractor(HTMLParser):
+    """Collects text blocks, remembering which ones were inside <article>/<main>."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.blocks: List[tuple] = []  # (text, in_main)
+        self._parts: List[str] = []
+        self._skip_depth = 0
+        self._main_depth = 0
+
+    def _flush(self):
+        text = " ".join("".join(self._parts).split())
+        if text:
+            self.blocks.append((text, self._main_depth > 0))
+        self._parts = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _VOID_TAGS:
+            if tag == "br":
+                self._parts.append(" ")
+            return
+        if tag in _SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag in _BLOCK_TAGS and not self._skip_depth:
+            self._flush()
+        if tag in _MAIN_TAGS:
+            self._main_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag in _SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag in _BLOCK_TAGS and not self._skip_depth:
+            self._flush()
+        if tag in _MAIN_TAGS:
+            self._flush()
+            self._main_depth = max(0, self._main_depth - 1)
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self._parts.append(data)
+
+
+def extract_main_text(html: str) -> str:
+    """
+    Main text of an HTML document as paragraphs separated by blank lines.
+
+    Blocks shorter than MIN_BLOCK_WORDS words are dropped; if the page has an
+    <article> or <main> element, only its blocks are kept.
+    """
+    parser = _TextExtractor()
+    try:
+        parser.feed(html)
+        parser.close()
+    except Exception as e:  # malformed markup: keep whatever was parsed
+        logger.debug(f"HTML parse error: {e}")
+    parser._flush()
+    blocks = [(text, in_main) for text, in_main in parser.blocks if len(text.split()) >= MIN_BLOCK_WORDS]
+    if any(in_main for _, in_main in blocks):
+        blocks = [b for b in blocks if b[1]]
+    return "\n\n".join(dict.fromkeys(text for text, _ in blocks))
+
+
+def _plain_text(text: str) -> str:
+    return "\n\n".join(" ".join(p.split()) for p in re.split(r"\n\s*\n", text) if p.strip())
+
+
+def _new_session() -> requests.Session:
+    session = requests.Session()
+    session.headers["User-Agent"] = USER_AGENT
+    return session
+
+
+def _download(url: str) -> Tuple[str, str]:
+    """Stream `url` within the size and time caps; returns (decoded body, content type), body '' if not text."""
+    deadline = time.monotonic() + Config.PAGE_FETCH_TIMEOUT
+    slot = host_slot("pages", url, Config.PAGE_FETCH_PER_HOST)
+    if not slot.acquire(timeout=Config.PAGE_FETCH_TIMEOUT):
+        raise TimeoutError(f"Too many concurrent fetches for {urlsplit(url).netloc}")
+    try:
+        with get_pool("pages", _new_session, size=Config.PAGE_FETCH_MAX_WORKERS).session() as session:
+            with session.get(url, stream=True, timeout=(3, Config.PAGE_FETCH_TIMEOUT)) as response:
+                response.raise_for_status()
+                content_type, _, params = response.headers.get("Content-Type", "").partition(";")
+                content_type = content_type.strip().lower()
+                if content_type and content_type not in TEXT_TYPES:
+                    logger.debug(f"Skipping {url}: content type {content_type}")
+                    return "", content_type
+                body = bytearray()
+                for chunk in response.iter_content(chunk_size=65536):
+                    body.extend(chunk)
+                    if len(body) >= Config.PAGE_FETCH_MAX_BYTES or time.monotonic() >= deadline:
+                        logger.debug(f"Truncated {url} at {len(body)} bytes.")
+                        break
+                charset = re.search(r"charset=[\"']?([\w.:-]+)", params, re.IGNORECASE)
+                try:
+                    text = bytes(body[:Config.PAGE_FETCH_MAX_BYTES]).decode(
+                        charset.group(1) if charset else "utf-8", errors="replace")
+                except LookupError:  # unknown charset name
+                    text = bytes(body[:Config.PAGE_FETCH_MAX_BYTES]).decode("utf-8", errors="replace")
+                return text, content_type
+    finally:
+        slot.release()
+
+
+@ttl_cache(ttl=lambda: Config.PAGE_CACHE_TTL)
+def fetch_page_text(url: str) -> str:
+    """
+    Download `url` and return its extracted main text (raises on network/HTTP errors).
+
+    Returns:
+        Paragraphs separated by blank lines; '' for non-text pages.
+    """
+    body, content_type = _download(url)
+    if not body:
+        return ""
+    text = _plain_text(body) if content_type == "text/plain" else extract_main_text(body)
+    logger.info(f"Fetched {url}: {len(text)} characters of text.")
+    return text
+
+
+def fetch_pages(urls: List[str], max_workers: int = None, deadline: float = None) -> Dict[str, str]:
+    """
+    Fetch and extract `urls` concurrently.
+
+    Args:
+        urls: Page URLs; duplicates are fetched once.
+        max_workers: Concurrent fetches (default: Config.PAGE_FETCH_MAX_WORKERS).
+        deadline: Seconds allowed for the whole batch (default: enough for
+            every fetch to use its full Config.PAGE_FETCH_TIMEOUT).
+
+    Returns:
+        {url: extracted text} for every URL; '' where the fetch failed or
+        missed the deadline.
+    """
+    urls = list(dict.fromkeys(u for u in urls if u and u.startswith(("http://", "https://"))))
+    if not urls:
+        return {}
+
+    texts = run_concurrently(
+        {url: (lambda url=url: fetch_page_text(url)) for url in urls},
+        max_workers=min(max_workers or Config.PAGE_FETCH_MAX_WORKERS, len(urls)),
+        timeout=Config.PAGE_FETCH_TIMEOUT, deadline=deadline,
+        name="Page fetch", thread_name_prefix="fetch",
+    )
+    return {url: texts.get(url, "") for url in urls}
@@ -1,19 +1,137 @@
+"""
+Retry Policy
+------------
+`api_retry` retries only failures that a second attempt can fix:
+
+  - transport errors (timeouts, dropped connections),
+  - rate limits and transient server errors (HTTP 408/425/429/5xx).
+
+Deterministic failures — malformed JSON, schema validation errors, bad
+requests, auth errors — are re-raised immediately so callers reach their
+fallback path without sleeping through the backoff schedule.
+
+Backoff is exponential with full jitter (a random wait between 0 and the
+exponential cap), so concurrent callers that failed together do not retry
+together. A server `Retry-After` hint takes precedence over the computed
+wait; hints longer than Config.RETRY_AFTER_MAX fail fast instead.
+
+`api_retry` is a utils.error_handler.RetryPolicy, so it wraps coroutine
+functions too (retrying with asyncio.sleep), and every retry is charged to
+the current run's RetryBudget; an exhausted budget stops retrying.
+"""
+import re
+import time
+import random
 import logging
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
 import requests
+from utils.config import Config
+from utils.error_handler import RetryPolicy
 
 logger = logging.getLogger(__name__)
 
+RETRYABLE_STATUS = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+# Deterministic: the same input fails the same way. Includes json.JSONDecodeError,
+# pydantic ValidationError and LangChain's OutputParserException (all ValueErrors).
+NON_RETRYABLE = (ValueError, TypeError, KeyError, IndexError, AttributeError)
+
+# Transport / rate-limit exception names across groq, openai, httpx and ddgs,
+# matched by name so this module does not import every client library.
+_TRANSIENT_NAME = re.compile(r"Timeout|Connect|RateLimit|Ratelimit|Unavailable|Overloaded")
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """True if `exc` is a transport, rate-limit or transient server error."""
+    if isinstance(exc, NON_RETRYABLE):
+        return False
+    status = _status_code(exc)
+    if status is not None:
+        return status in RETRYABLE_STATUS
+    if isinstance(exc, (requests.Timeout, requests.ConnectionError, TimeoutError, ConnectionError)):
+        return True
+    return any(_TRANSIENT_NAME.search(cls.__name__) for cls in type(exc).__mro__)
+
+
+def retry_after_seconds(exc: BaseException) -> Optional[float]:
+    """
+    The server's backoff hint from the exception's HTTP response, in seconds.
+
+    Reads `retry-after-ms` (OpenAI/Groq) and `Retry-After` (delta-seconds or
+    HTTP date). Returns None when there is no usable hint.
+    """
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        ms = headers.get("retry-after-ms")
+        if ms is not None:
+            return max(0.0, float(ms) / 1000)
+    except (TypeError, ValueError):
+        pass
+    value = headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def full_jitter(attempt: int, base: float = None, cap: float = None) -> float:
+    """Random wait in [0, min(cap, base * 2**(attempt-1))]."""
+    base = Config.RETRY_BASE_DELAY if base is None else base
+    cap = Config.RETRY_MAX_DELAY if cap is None else cap
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+
+
+def should_retry(retry_state) -> bool:
+    """tenacity `retry` predicate: retryable errors whose backoff hint is acceptable."""
+    exc = retry_state.outcome.exception()
+    if exc is None or not is_retryable(exc):
+        return False
+    hint = retry_after_seconds(exc)
+    if hint is not None and hint > Config.RETRY_AFTER_MAX:
+        logger.warning(f"Not retrying {retry_state.fn.__name__}: server asked to wait {hint:.0f}s.")
+        return False
+    return True
+
+
+def wait_for_retry(retry_state) -> float:
+    """tenacity `wait` strategy: honor Retry-After, otherwise full-jitter backoff."""
+    hint = retry_after_seconds(retry_state.outcome.exception())
+    if hint is not None:
+        return hint
+    return full_jitter(retry_state.attempt_number)
+
+
 def log_retry_attempt(retry_state):
     """Log retry attempts."""
-    logger.warning(f"Retrying {retry_state.fn.__name__} due to error: {retry_state.outcome.exception()} (Attempt {retry_state.attempt_number})")
-
-# Standard retry configuration for API calls
-# Retries up to 3 times with exponential backoff starting at 1s up to 10s
-api_retry = retry(
-    stop=stop_after_attempt(3),
-    wait=wait_exponential(multiplier=1, min=2, max=10),
-    retry=retry_if_exception_type((requests.RequestException, Exception)), # Broad exception for now, ideally specific
+    logger.warning(
+        f"Retrying {retry_state.fn.__name__} in {retry_state.next_action.sleep:.1f}s due to error: "
+        f"{retry_state.outcome.exception()} (Attempt {retry_state.attempt_number})"
+    )
+
+
+# Standard retry configuration for API calls: up to Config.RETRY_MAX_ATTEMPTS
+# attempts, retrying transient errors only, within the run's retry budget.
+# Decorates both sync services and coroutine functions (non-blocking sleeps).
+api_retry = RetryPolicy(
+    max_attempts=Config.RETRY_MAX_ATTEMPTS,
+    wait=wait_for_retry,
+    retry=should_retry,
     before_sleep=log_retry_attempt,
-    reraise=True
 )
@@ -0,0 +1,154 @@
+"""
+Session Pool
+------------
+Thread-safe pool of long-lived client sessions (DDGS clients, requests
+sessions), so repeated calls reuse warm HTTP connections instead of paying
+session setup and TLS handshakes on every query.
+
+  - At most `size` sessions exist; callers block (up to `acquire_timeout`)
+    when all are checked out.
+  - Sessions are recycled — closed and replaced on next use — after
+    `max_failures` consecutive transient errors (tools.retry.is_retryable),
+    `max_uses` calls or `max_age` seconds.
+
+`host_slot()` adds per-host concurrency limits for pools that talk to
+arbitrary sites (result pages, image CDNs).
+
+Usage:
+    pool = get_pool("ddgs", lambda: DDGS(timeout=10))
+    with pool.session() as ddgs:
+        results = ddgs.text(query)
+"""
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Tuple
+from urllib.parse import urlsplit
+from utils.logger import get_logger
+from utils.config import Config
+from tools.retry import is_retryable
+
+logger = get_logger(__name__)
+
+
+class _PooledSession:
+    __slots__ = ("client", "created_at", "uses", "failures")
+
+    def __init__(self, client: Any):
+        self.client = client
+        self.created_at = time.monotonic()
+        self.uses = 0
+        self.failures = 0
+
+
+class SessionPool:
+    """Bounded LIFO pool of reusable client sessions with health-based recycling."""
+
+    def __init__(self, name: str, factory: Callable[[], Any], size: int = None, max_uses: int = None,
+                 max_age: float = None, max_failures: int = None, acquire_timeout: float = None):
+        self.name = name
+        self.factory = factory
+        self.size = size or Config.SESSION_POOL_SIZE
+        self.max_uses = Config.SESSION_MAX_USES if max_uses is None else max_uses
+        self.max_age = Config.SESSION_MAX_AGE if max_age is None else max_age
+        self.max_failures = Config.SESSION_MAX_FAILURES if max_failures is None else max_failures
+        self.acquire_timeout = Config.SESSION_ACQUIRE_TIMEOUT if acquire_timeout is None else acquire_timeout
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._idle = deque()
+        self._lock = threading.Lock()
+        self.created = 0
+        self.recycled = 0
+
+    def _expired(self, entry: _PooledSession) -> bool:
+        return ((self.max_uses and entry.uses >= self.max_uses)
+                or (self.max_age and time.monotonic() - entry.created_at >= self.max_age)
+                or entry.failures >= self.max_failures)
+
+    def _discard(self, entry: _PooledSession) -> None:
+        self.recycled += 1
+        close = getattr(entry.client, "close", None)
+        if callable(close):
+            try:
+                close()
+            except Exception as e:
+                logger.debug(f"Closing {self.name} session failed: {e}")
+
+    @contextmanager
+    def session(self):
+        """Check out a session for one call; it returns to the pool afterwards."""
+        if not self._slots.acquire(timeout=self.acquire_timeout):
+            raise TimeoutError(f"No {self.name} session free after {self.acquire_timeout:.0f}s")
+        try:
+            with self._lock:
+                entry = self._idle.pop() if self._idle else None
+            if entry is None:
+                entry = _PooledSession(self.factory())
+                with self._lock:
+                    self.created += 1
+            entry.uses += 1
+            try:
+                yield entry.client
+            except Exception as exc:
+                if is_retryable(exc):
+                    entry.failures += 1
+                raise
+            else:
+                entry.failures = 0
+            finally:
+                if self._expired(entry):
+                    logger.debug(f"Recycling {self.name} session after {entry.uses} uses.")
+                    with self._lock:
+                        self._discard(entry)
+                else:
+                    with self._lock:
+                        self._idle.append(entry)
+        finally:
+            self._slots.release()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"size": self.size, "idle": len(self._idle), "created": self.created, "recycled": self.recycled}
+
+    def close(self) -> None:
+        """Close all idle sessions."""
+        with self._lock:
+            while self._idle:
+                self._discard(self._idle.pop())
+
+
+_pools: Dict[str, SessionPool] = {}
+_host_slots: Dict[Tuple[str, str], threading.BoundedSemaphore] = {}
+_registry_lock = threading.Lock()
+
+
+def get_pool(name: str, factory: Callable[[], Any], **kwargs) -> SessionPool:
+    """Return the process-wide pool `name`, creating it with `factory` on first use."""
+    with _registry_lock:
+        pool = _pools.get(name)
+        if pool is None:
+            pool = _pools[name] = SessionPool(name, factory, **kwargs)
+        return pool
+
+
+def host_slot(name: str, url: str, limit: int) -> threading.BoundedSemaphore:
+    """
+    Semaphore bounding pool `name`'s concurrent requests to the host of `url`
+    at `limit` (fixed when the host is first seen).
+    """
+    key = (name, urlsplit(url).netloc.lower())
+    with _registry_lock:
+        slot = _host_slots.get(key)
+        if slot is None:
+            slot = _host_slots[key] = threading.BoundedSemaphore(limit)
+        return slot
+
+
+def reset_pools() -> None:
+    """Close and forget every pool and per-host limit."""
+    with _registry_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+        _host_slots.clear()
+    for pool in pools:
+        pool.close()
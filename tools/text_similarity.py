@@ -0,0 +1,159 @@
+"""
+Text Similarity Utilities
+-------------------------
+Lightweight text normalization and vectorized TF-IDF cosine similarity,
+used to match near-duplicate topics and score text against queries
+without an extra NLP dependency.
+
+  - tokenize(): case folding, acronym expansion, stop-word removal, stemming.
+  - TfidfIndex: NumPy TF-IDF matrix over a set of documents with
+    cosine-similarity lookup.
+  - bm25_scores(): Okapi BM25 relevance of documents to a query.
+"""
+import re
+from collections import Counter
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+STOP_WORDS = frozenset("""
+a about above after again against all am an and any are as at be because been before being
+below between both but by can could did do does doing down during each few for from further
+had has have having he her here hers herself him himself his how i if in into is it its itself
+just me more most my myself no nor not now of off on once only or other our ours ourselves out
+over own same she should so some such than that the their theirs them themselves then there
+these they this those through to too under until up very was we were what when where which
+while who whom why will with would you your yours yourself yourselves
+""".split())
+
+# Common acronyms in presentation topics, expanded so "AI" matches "Artificial Intelligence"
+ACRONYMS: Dict[str, str] = {
+    "ai": "artificial intelligence",
+    "ml": "machine learning",
+    "dl": "deep learning",
+    "llm": "large language model",
+    "llms": "large language models",
+    "nlp": "natural language processing",
+    "iot": "internet of things",
+    "vr": "virtual reality",
+    "ar": "augmented reality",
+    "ev": "electric vehicle",
+    "evs": "electric vehicles",
+    "esg": "environmental social governance",
+}
+
+_SUFFIXES = (
+    "ational", "tional", "ization", "fulness", "ousness", "iveness", "ations", "ation",
+    "ments", "ment", "ness", "ities", "ity", "ings", "ing", "ies", "ied", "ers", "er",
+    "ences", "ence", "ances", "ance", "ents", "ent", "ed", "es", "ly", "al", "ic", "s", "y",
+)
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def stem(word: str) -> str:
+    """Strip one common English suffix, keeping a stem of at least 3 characters."""
+    if len(word) <= 3:
+        return word
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[: -len(suffix)]
+    return word
+
+
+def tokenize(text: str) -> List[str]:
+    """Case-fold, expand acronyms, drop stop words and stem the remaining words."""
+    words = []
+    for word in _WORD_RE.findall(text.casefold()):
+        words.extend(ACRONYMS.get(word, word).split())
+    return [stem(w) for w in words if w not in STOP_WORDS]
+
+
+def normalize_text(text: str) -> str:
+    """Canonical form of a short text (e.g. a topic) for exact-match lookups."""
+    return " ".join(tokenize(text))
+
+
+class TfidfIndex:
+    """
+    TF-IDF matrix over a list of token lists, with L2-normalized rows so a
+    single matrix-vector product gives cosine similarity to a query.
+    """
+
+    def __init__(self, documents: Iterable[List[str]]):
+        documents = list(documents)
+        self.vocab: Dict[str, int] = {}
+        for tokens in documents:
+            for token in tokens:
+                self.vocab.setdefault(token, len(self.vocab))
+
+        counts = np.zeros((len(documents), len(self.vocab)), dtype=np.float32)
+        for row, tokens in enumerate(documents):
+            for token in tokens:
+                counts[row, self.vocab[token]] += 1
+
+        df = np.count_nonzero(counts, axis=0)
+        self.idf = np.log((1 + len(documents)) / (1 + df)) + 1.0
+        self.matrix = self._normalize(np.log1p(counts) * self.idf)
+
+    @staticmethod
+    def _normalize(matrix: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    def similarities(self, tokens: List[str]) -> np.ndarray:
+        """
+        Cosine similarity of the query to every indexed document.
+
+        Query words missing from the vocabulary still count towards the
+        query's norm (with the maximum IDF), so extra words lower the score.
+        """
+        vec = np.zeros(len(self.vocab), dtype=np.float32)
+        oov_idf = np.log(1 + self.matrix.shape[0]) + 1.0
+        oov_sq = 0.0
+        for token, count in Counter(tokens).items():
+            weight = np.log1p(count)
+            col = self.vocab.get(token)
+            if col is None:
+                oov_sq += float(weight * oov_idf) ** 2
+            else:
+                vec[col] = weight * self.idf[col]
+        norm = np.sqrt(float(vec @ vec) + oov_sq)
+        if norm == 0:
+            return np.zeros(self.matrix.shape[0], dtype=np.float32)
+        return self.matrix @ (vec / norm)
+
+    def pairwise(self) -> np.ndarray:
+        """Cosine similarity between every pair of indexed documents."""
+        return self.matrix @ self.matrix.T
+
+
+def bm25_scores(query: List[str], documents: List[List[str]], k1: float = 1.5, b: float = 0.75) -> np.ndarray:
+    """
+    Okapi BM25 score of each tokenized document against a tokenized query,
+    computed as one vectorized pass over the documents' term-frequency matrix.
+    """
+    if not documents:
+        return np.zeros(0, dtype=np.float32)
+    vocab: Dict[str, int] = {}
+    for token in query:
+        vocab.setdefault(token, len(vocab))
+    if not vocab:
+        return np.zeros(len(documents), dtype=np.float32)
+
+    tf = np.zeros((len(documents), len(vocab)), dtype=np.float32)
+    lengths = np.empty(len(documents), dtype=np.float32)
+    for row, tokens in enumerate(documents):
+        lengths[row] = len(tokens)
+        for token in tokens:
+            col = vocab.get(token)
+            if col is not None:
+                tf[row, col] += 1
+
+    n = len(documents)
+    df = np.count_nonzero(tf, axis=0)
+    idf = np.log(1 + (n - df + 0.5) / (df + 0.5))
+    avg_len = float(lengths.mean()) or 1.0
+    norm = k1 * (1 - b + b * lengths / avg_len)
+    return ((tf * (k1 + 1)) / (tf + norm[:, None]) * idf).sum(axis=1)
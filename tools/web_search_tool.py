@@ -3,44 +3,189 @@ Tool 1: Web Search Tool
 -----------------------
 Provides web search capability to agents using DuckDuckGo (no API key required).
 Falls back to empty results with a warning if the search fails.
+
+Search backends are pluggable SearchProviders, selected by
+Config.SEARCH_PROVIDER:
+
+  ddgs   DuckDuckGo (default)
+  local  BM25 over the offline document corpus in Config.LOCAL_CORPUS_DIR
+         (tools/local_corpus.py), for air-gapped deployments
+
+A comma-separated value ("ddgs,local") is a fallback chain: providers are
+tried in order until one returns results; an error from any but the last
+provider falls through to the next. Extra backends can be added with
+register_provider().
+
+Callers that must respect a request rate (e.g. the cache warmer) wrap
+their work in `throttled_searches(acquire)`: every search that reaches a
+provider first calls `acquire()`, in worker threads too, while cache hits
+stay free.
+
+DDGS clients come from a shared SessionPool, so their HTTP sessions stay
+warm across queries and runs. Results are cached in the shared cache
+backend by normalized query for Config.WEB_SEARCH_CACHE_TTL (empty results
+for Config.WEB_SEARCH_NEGATIVE_TTL); failed searches are not cached.
 """
-from typing import List
+import re
+import contextvars
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Type
 from utils.logger import get_logger
+from utils.config import Config
 from utils.error_handler import safe_run
+from tools.circuit_breaker import get_breaker
+from tools.hedging import hedged
+from tools.session_pool import get_pool
+from tools.cache import ttl_cache
 
 logger = get_logger(__name__)
 
+# Called before every provider search inside a throttled_searches() block
+_search_throttle: contextvars.ContextVar[Optional[Callable[[], None]]] = contextvars.ContextVar(
+    "search_throttle", default=None)
 
-def web_search(query: str, max_results: int = 5) -> List[str]:
+
+@contextmanager
+def throttled_searches(acquire: Callable[[], None]):
+    """Call `acquire()` before each uncached search run inside the block (e.g. RateLimiter.acquire)."""
+    token = _search_throttle.set(acquire)
+    try:
+        yield
+    finally:
+        _search_throttle.reset(token)
+
+
+def _new_ddgs():
+    from ddgs import DDGS
+    return DDGS(timeout=Config.WEB_SEARCH_TIMEOUT)
+
+
+def _ddgs_text(query: str, max_results: int) -> List[dict]:
+    with get_pool("ddgs", _new_ddgs).session() as ddgs:
+        return list(ddgs.text(query, max_results=max_results))
+
+
+_NON_WORD = re.compile(r"[^\w\s]+")
+
+
+def normalize_query(query: str) -> str:
+    """Case-fold, drop punctuation and collapse whitespace, so trivially different queries share a cache entry."""
+    return " ".join(_NON_WORD.sub(" ", query.casefold()).split())
+
+
+class SearchProvider:
+    """A search backend: returns raw hits as dicts with at least a "body" text."""
+
+    name = ""
+
+    def search(self, query: str, max_results: int) -> List[dict]:
+        raise NotImplementedError
+
+
+class DDGSProvider(SearchProvider):
+    """DuckDuckGo text search through the pooled, hedged DDGS clients."""
+
+    name = "ddgs"
+
+    def search(self, query: str, max_results: int) -> List[dict]:
+        with get_breaker("ddgs"):
+            return hedged("ddgs", _ddgs_text, query, max_results)
+
+
+class LocalCorpusProvider(SearchProvider):
+    """BM25 search over the local document corpus (no network)."""
+
+    name = "local"
+
+    def search(self, query: str, max_results: int) -> List[dict]:
+        from tools.local_corpus import get_corpus_index
+        return get_corpus_index().search(query, max_results)
+
+
+_PROVIDERS: Dict[str, Type[SearchProvider]] = {
+    DDGSProvider.name: DDGSProvider,
+    LocalCorpusProvider.name: LocalCorpusProvider,
+}
+
+
+def register_provider(provider_cls: Type[SearchProvider]) -> Type[SearchProvider]:
+    """Make `provider_cls` selectable by its `name` in Config.SEARCH_PROVIDER (usable as a decorator)."""
+    _PROVIDERS[provider_cls.name] = provider_cls
+    return provider_cls
+
+
+def get_providers() -> List[SearchProvider]:
+    """The configured provider chain, in fallback order."""
+    names = [n.strip() for n in Config.SEARCH_PROVIDER.split(",") if n.strip()]
+    unknown = [n for n in names if n not in _PROVIDERS]
+    if unknown:
+        raise ValueError(f"Unknown SEARCH_PROVIDER {unknown}; expected one of {sorted(_PROVIDERS)}.")
+    return [_PROVIDERS[n]() for n in names or [DDGSProvider.name]]
+
+
+@ttl_cache(
+    ttl=lambda: Config.WEB_SEARCH_CACHE_TTL,
+    negative_ttl=lambda: Config.WEB_SEARCH_NEGATIVE_TTL,
+    key=lambda query, max_results: (Config.SEARCH_PROVIDER, normalize_query(query), max_results),
+)
+def _search_hits(query: str, max_results: int) -> List[dict]:
+    """Run the configured providers (raises if the last one fails, so errors are never cached)."""
+    providers = get_providers()
+    throttle = _search_throttle.get()
+    if throttle is not None:
+        throttle()
+    results = []
+    for i, provider in enumerate(providers):
+        try:
+            hits = provider.search(query, max_results)
+        except Exception as e:
+            if i == len(providers) - 1:
+                raise
+            logger.warning(f"{provider.name} search failed for '{query}' ({e}); trying {providers[i + 1].name}.")
+            continue
+        results = [{"title": r.get("title", ""), "body": r.get("body", "") or r.get("snippet", ""),
+                    "href": r.get("href", "") or r.get("url", "")} for r in hits]
+        results = [r for r in results if r["body"]]
+        if results:
+            break
+    logger.info(f"Search for '{query}' via {Config.SEARCH_PROVIDER} returned {len(results)} results.")
+    return results
+
+
+def web_search_results(query: str, max_results: int = 5) -> List[dict]:
     """
-    Search the web using DuckDuckGo and return a list of text snippets.
+    Search with the configured provider(s) and return full results.
 
     Args:
         query: The search query string.
         max_results: Maximum number of results to return.
 
     Returns:
-        A list of text snippets relevant to the query.
-        Returns an empty list if the search fails.
+        A list of {"title", "body", "href"} dicts ("href" is '' for local
+        corpus passages). Returns an empty list if the search fails.
     """
-    def _do_search():
-        from ddgs import DDGS
-        results = []
-        with DDGS() as ddgs:
-            for r in ddgs.text(query, max_results=max_results):
-                snippet = r.get("body", "") or r.get("snippet", "")
-                if snippet:
-                    results.append(snippet)
-        logger.info(f"Web search for '{query}' returned {len(results)} results.")
-        return results
-
     return safe_run(
-        _do_search,
+        lambda: _search_hits(query, max_results),
         fallback=[],
         error_msg=f"Web search failed for query: '{query}'. Falling back to LLM knowledge only."
     )
 
 
+def web_search(query: str, max_results: int = 5) -> List[str]:
+    """
+    Search with the configured provider(s) and return a list of text snippets.
+
+    Args:
+        query: The search query string.
+        max_results: Maximum number of results to return.
+
+    Returns:
+        A list of text snippets relevant to the query.
+        Returns an empty list if the search fails.
+    """
+    return [r["body"] for r in web_search_results(query, max_results=max_results)]
+
+
 def web_search_formatted(query: str, max_results: int = 5) -> str:
     """
     Search the web and return results as a formatted string block.
@@ -21,6 +21,86 @@ class Config:
     OUTPUT_DIR = os.getenv("OUTPUT_DIR", "outputs")
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
 
+    # Research Settings
+    SEARCH_PROVIDER = os.getenv("SEARCH_PROVIDER", "ddgs").lower()  # ddgs | local | comma-separated fallback chain, e.g. "ddgs,local"
+    LOCAL_CORPUS_DIR = os.getenv("LOCAL_CORPUS_DIR", "corpus")  # Markdown/text documents for the "local" provider
+    WEB_SEARCH_TIMEOUT = float(os.getenv("WEB_SEARCH_TIMEOUT", "10"))  # seconds per slide search
+    RESEARCH_MAX_WORKERS = int(os.getenv("RESEARCH_MAX_WORKERS", "5"))  # concurrent slide searches
+    RESEARCH_STRATEGY = os.getenv("RESEARCH_STRATEGY", "pooled").lower()  # pooled | per_slide
+    RESEARCH_MIN_COVERAGE = int(os.getenv("RESEARCH_MIN_COVERAGE", "2"))  # pooled snippets a slide needs to skip its own search
+    RESEARCH_COVERAGE_THRESHOLD = float(os.getenv("RESEARCH_COVERAGE_THRESHOLD", "0.15"))  # TF-IDF cosine counted as coverage
+    RESEARCH_MAX_TARGETED_SEARCHES = int(os.getenv("RESEARCH_MAX_TARGETED_SEARCHES", "3"))  # per deck, pooled strategy
+    SPECULATIVE_RESEARCH = os.getenv("SPECULATIVE_RESEARCH", "true").lower() in ("1", "true", "yes")  # topic searches run alongside the planner
+    RESEARCH_CANDIDATES = int(os.getenv("RESEARCH_CANDIDATES", "8"))  # search results fetched per slide before ranking
+    RESEARCH_SNIPPETS_PER_SLIDE = int(os.getenv("RESEARCH_SNIPPETS_PER_SLIDE", "3"))  # best snippets kept per slide
+    RESEARCH_DUPLICATE_THRESHOLD = float(os.getenv("RESEARCH_DUPLICATE_THRESHOLD", "0.8"))  # cosine; near-duplicates dropped deck-wide
+    RESEARCH_FETCH_PAGES = os.getenv("RESEARCH_FETCH_PAGES", "false").lower() in ("1", "true", "yes")  # deep mode: read the top result pages
+    RESEARCH_PAGES_PER_QUERY = int(os.getenv("RESEARCH_PAGES_PER_QUERY", "2"))  # result pages fetched per search, deep mode
+    RESEARCH_PASSAGES_PER_PAGE = int(os.getenv("RESEARCH_PASSAGES_PER_PAGE", "3"))  # most relevant passages kept per page
+    RESEARCH_PASSAGE_CHARS = int(os.getenv("RESEARCH_PASSAGE_CHARS", "400"))  # passage length pages are split into
+    PAGE_FETCH_TIMEOUT = float(os.getenv("PAGE_FETCH_TIMEOUT", "8"))  # seconds per page, including the download
+    PAGE_FETCH_MAX_BYTES = int(os.getenv("PAGE_FETCH_MAX_BYTES", "2000000"))  # bodies are cut off at this size
+    PAGE_FETCH_MAX_WORKERS = int(os.getenv("PAGE_FETCH_MAX_WORKERS", "8"))  # concurrent page fetches
+    PAGE_FETCH_PER_HOST = int(os.getenv("PAGE_FETCH_PER_HOST", "2"))  # concurrent fetches per host
+    PAGE_CACHE_TTL = float(os.getenv("PAGE_CACHE_TTL", "604800"))  # seconds to reuse extracted page text, 0 = off
+    WEB_SEARCH_CACHE_TTL = float(os.getenv("WEB_SEARCH_CACHE_TTL", "86400"))  # seconds; 0 = don't cache results
+    WEB_SEARCH_NEGATIVE_TTL = float(os.getenv("WEB_SEARCH_NEGATIVE_TTL", "600"))  # seconds to remember empty results
+
+    # Image Settings
+    IMAGE_MAX_WORKERS = int(os.getenv("IMAGE_MAX_WORKERS", "5"))  # slides whose images are sourced concurrently
+    IMAGE_SLIDE_TIMEOUT = float(os.getenv("IMAGE_SLIDE_TIMEOUT", "30"))  # seconds per slide (keyword + image lookup)
+    IMAGE_DOWNLOAD_MAX_WORKERS = int(os.getenv("IMAGE_DOWNLOAD_MAX_WORKERS", "8"))  # concurrent image downloads in the builder
+    IMAGE_DOWNLOAD_PER_HOST = int(os.getenv("IMAGE_DOWNLOAD_PER_HOST", "4"))  # concurrent downloads per image host
+    IMAGE_DOWNLOAD_TIMEOUT = float(os.getenv("IMAGE_DOWNLOAD_TIMEOUT", "10"))  # seconds per image request
+    IMAGE_DOWNLOAD_DEADLINE = float(os.getenv("IMAGE_DOWNLOAD_DEADLINE", "20"))  # seconds for all of a deck's images
+    IMAGE_MAX_BYTES = int(os.getenv("IMAGE_MAX_BYTES", "10000000"))  # larger images are skipped
+    IMAGE_STORE_ENABLED = os.getenv("IMAGE_STORE_ENABLED", "true").lower() in ("1", "true", "yes")  # content-addressed image store in CACHE_DIR
+    IMAGE_STORE_MAX_BYTES = int(os.getenv("IMAGE_STORE_MAX_BYTES", "500000000"))  # LRU-evict stored images above this size, 0 = unbounded
+
+    # HTTP Session Pooling (tools/session_pool.py)
+    SESSION_POOL_SIZE = int(os.getenv("SESSION_POOL_SIZE", "5"))  # sessions kept per provider
+    SESSION_MAX_USES = int(os.getenv("SESSION_MAX_USES", "200"))  # recycle after this many calls, 0 = never
+    SESSION_MAX_AGE = float(os.getenv("SESSION_MAX_AGE", "600"))  # seconds; recycle older sessions, 0 = never
+    SESSION_MAX_FAILURES = int(os.getenv("SESSION_MAX_FAILURES", "2"))  # consecutive transient errors before recycling
+    SESSION_ACQUIRE_TIMEOUT = float(os.getenv("SESSION_ACQUIRE_TIMEOUT", "30"))  # seconds to wait for a free session
+
+    # Cache Settings
+    CACHE_BACKEND = os.getenv("CACHE_BACKEND", "disk").lower()  # disk | sqlite | redis
+    CACHE_DIR = os.getenv("CACHE_DIR", ".cache")
+    CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", os.getenv("REDIS_URL", "redis://localhost:6379"))
+    CACHE_TTL = int(os.getenv("CACHE_TTL", "0"))  # seconds, Redis only; 0 = never expire
+    CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", "0"))  # SQLite only; LRU-evict above this size, 0 = unbounded
+    CACHE_SERIALIZER = os.getenv("CACHE_SERIALIZER", "json").lower()  # json | msgpack
+    CACHE_COMPRESSION = os.getenv("CACHE_COMPRESSION", "zlib").lower()  # none | zlib | zstd
+    CACHE_ALLOW_PICKLE = os.getenv("CACHE_ALLOW_PICKLE", "false").lower() in ("1", "true", "yes")  # only for trusted cache dirs
+    CACHE_LOCK_TIMEOUT = float(os.getenv("CACHE_LOCK_TIMEOUT", "120"))  # seconds to wait for another process's computation
+    LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")  # prompt-level LangChain cache
+    LLM_INPUT_COST_PER_MTOK = float(os.getenv("LLM_INPUT_COST_PER_MTOK", "0.59"))  # USD, for cache savings reports
+    LLM_OUTPUT_COST_PER_MTOK = float(os.getenv("LLM_OUTPUT_COST_PER_MTOK", "0.79"))
+    TOPIC_SIMILARITY_ENABLED = os.getenv("TOPIC_SIMILARITY_ENABLED", "false").lower() in ("1", "true", "yes")  # reuse outlines of near-duplicate topics
+    TOPIC_SIMILARITY_THRESHOLD = float(os.getenv("TOPIC_SIMILARITY_THRESHOLD", "0.85"))  # TF-IDF cosine, 0-1
+    CACHE_STATS_INTERVAL = float(os.getenv("CACHE_STATS_INTERVAL", "0"))  # seconds between hit/miss log summaries, 0 = off
+
+    # Retry Settings (tools/retry.py)
+    RETRY_MAX_ATTEMPTS = int(os.getenv("RETRY_MAX_ATTEMPTS", "3"))  # including the first call
+    RETRY_BASE_DELAY = float(os.getenv("RETRY_BASE_DELAY", "1"))  # seconds; full-jitter cap doubles per attempt
+    RETRY_MAX_DELAY = float(os.getenv("RETRY_MAX_DELAY", "10"))  # seconds, upper bound of the jittered wait
+    RETRY_AFTER_MAX = float(os.getenv("RETRY_AFTER_MAX", "30"))  # seconds; longer Retry-After hints fail fast
+    RETRY_BUDGET_MAX_RETRIES = int(os.getenv("RETRY_BUDGET_MAX_RETRIES", "10"))  # retries per pipeline run, all services
+    RETRY_BUDGET_MAX_SECONDS = float(os.getenv("RETRY_BUDGET_MAX_SECONDS", "30"))  # backoff seconds per pipeline run
+
+    # Circuit Breaker Settings (tools/circuit_breaker.py)
+    CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))  # consecutive transient failures
+    CIRCUIT_RESET_TIMEOUT = float(os.getenv("CIRCUIT_RESET_TIMEOUT", "30"))  # seconds open before a probe call
+
+    # Request Hedging (tools/hedging.py) — duplicate slow search calls, first response wins
+    HEDGING_ENABLED = os.getenv("HEDGING_ENABLED", "false").lower() in ("1", "true", "yes")
+    HEDGE_PERCENTILE = float(os.getenv("HEDGE_PERCENTILE", "90"))  # hedge calls slower than this latency percentile
+    HEDGE_MAX_EXTRA_LOAD = float(os.getenv("HEDGE_MAX_EXTRA_LOAD", "0.1"))  # hedges per call, e.g. 0.1 = +10% requests
+    HEDGE_WINDOW = int(os.getenv("HEDGE_WINDOW", "100"))  # latency samples kept per provider
+    HEDGE_MIN_SAMPLES = int(os.getenv("HEDGE_MIN_SAMPLES", "20"))  # no hedging before this many samples
+    HEDGE_MAX_WORKERS = int(os.getenv("HEDGE_MAX_WORKERS", "16"))
+
     # Validation
     @classmethod
     def validate_keys(cls):
@@ -5,15 +5,94 @@ Provides centralized error handling, safe execution wrappers, and
 fallback strategies for all agents and tools in the pipeline.
 """
 import logging
-import time
-from functools import wraps
-from typing import Any, Callable, TypeVar
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Optional, TypeVar
+
+from tenacity import (
+    AsyncRetrying, Retrying, retry, retry_if_exception_type,
+    stop_after_attempt, wait_exponential, wait_none,
+)
+
+from utils.config import Config
 
 logger = logging.getLogger(__name__)
 
 T = TypeVar("T")
 
 
+class RetryBudget:
+    """
+    Retries and backoff seconds one pipeline run may spend across all of its
+    retry wrappers (`api_retry`, `with_retry`). Once either is used up,
+    further failures are raised immediately so callers take their fallbacks.
+    """
+
+    def __init__(self, max_retries: int = None, max_backoff_seconds: float = None):
+        self.max_retries = Config.RETRY_BUDGET_MAX_RETRIES if max_retries is None else max_retries
+        self.max_backoff_seconds = (Config.RETRY_BUDGET_MAX_SECONDS
+                                    if max_backoff_seconds is None else max_backoff_seconds)
+        self.retries = 0
+        self.backoff_seconds = 0.0
+        self.denied = 0
+        self._lock = threading.Lock()
+
+    def try_consume(self, sleep: float) -> bool:
+        """Reserve one retry preceded by `sleep` seconds; False if that would exceed the budget."""
+        with self._lock:
+            if (self.retries + 1 > self.max_retries
+                    or self.backoff_seconds + sleep > self.max_backoff_seconds):
+                if not self.denied:
+                    logger.warning(
+                        f"Retry budget exhausted ({self.retries} retries, {self.backoff_seconds:.1f}s backoff); "
+                        f"failing fast for the rest of this run."
+                    )
+                self.denied += 1
+                return False
+            self.retries += 1
+            self.backoff_seconds += sleep
+            return True
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {"retries": self.retries, "backoff_seconds": round(self.backoff_seconds, 2),
+                    "denied": self.denied, "max_retries": self.max_retries,
+                    "max_backoff_seconds": self.max_backoff_seconds}
+
+
+_retry_budget: ContextVar[Optional[RetryBudget]] = ContextVar("retry_budget", default=None)
+
+
+@contextmanager
+def retry_budget(max_retries: int = None, max_backoff_seconds: float = None):
+    """
+    Attach a fresh RetryBudget to the current context (one pipeline run).
+
+    Example:
+        with retry_budget() as budget:
+            app.invoke(state)
+        logger.info(budget.snapshot())
+    """
+    budget = RetryBudget(max_retries, max_backoff_seconds)
+    token = _retry_budget.set(budget)
+    try:
+        yield budget
+    finally:
+        _retry_budget.reset(token)
+
+
+def current_retry_budget() -> Optional[RetryBudget]:
+    """The budget of the run in progress, or None outside a run (unbounded)."""
+    return _retry_budget.get()
+
+
+def consume_retry_budget(sleep: float) -> bool:
+    """Charge one retry and `sleep` seconds to the current run; True if allowed."""
+    budget = _retry_budget.get()
+    return budget is None or budget.try_consume(sleep)
+
+
 def safe_run(func: Callable, fallback: Any, error_msg: str = "", *args, **kwargs) -> Any:
     """
     Execute a callable safely. If any exception is raised, log the error
@@ -39,10 +118,75 @@ def safe_run(func: Callable, fallback: Any, error_msg: str = "", *args, **kwargs
         return fallback
 
 
+class RetryPolicy:
+    """
+    Retry settings that decorate sync and async callables alike.
+
+    Coroutine functions are retried with non-blocking `asyncio.sleep`
+    (tenacity's AsyncRetrying), plain functions with `time.sleep`, so the
+    same policy object can wrap both kinds of service. Every retry is charged
+    to the current run's RetryBudget.
+
+    Args:
+        max_attempts: Maximum number of attempts (including the first).
+        wait: tenacity wait strategy — `retry_state -> seconds`.
+        retry: tenacity retry predicate — `retry_state -> bool`.
+        before_sleep: Optional callback run before each backoff sleep.
+
+    Example:
+        policy = RetryPolicy(max_attempts=3, wait=wait_exponential(multiplier=1))
+
+        @policy
+        async def fetch():
+            ...
+    """
+
+    def __init__(self, max_attempts: int = 3, wait: Callable = None, retry: Callable = None,
+                 before_sleep: Callable = None, after_failure: Callable = None):
+        self.max_attempts = max_attempts
+        self.wait = wait or wait_none()
+        self.retry = retry or retry_if_exception_type(Exception)
+        self.before_sleep = before_sleep
+        self.after_failure = after_failure
+
+    def _kwargs(self) -> dict:
+        def give_up(retry_state):
+            if self.after_failure:
+                self.after_failure(retry_state)
+            raise retry_state.outcome.exception()
+
+        return dict(
+            stop=stop_after_attempt(self.max_attempts) | _stop_when_budget_exhausted,
+            wait=self.wait,
+            retry=self.retry,
+            before_sleep=self.before_sleep,
+            retry_error_callback=give_up,
+        )
+
+    def __call__(self, func: Callable) -> Callable:
+        # tenacity.retry picks AsyncRetrying (asyncio.sleep) for coroutine functions
+        return retry(**self._kwargs())(func)
+
+    def call(self, func: Callable, *args, **kwargs) -> Any:
+        """Call a sync function under this policy."""
+        return Retrying(**self._kwargs())(func, *args, **kwargs)
+
+    async def acall(self, func: Callable, *args, **kwargs) -> Any:
+        """Await a coroutine function under this policy without blocking the event loop."""
+        return await AsyncRetrying(**self._kwargs())(func, *args, **kwargs)
+
+
+def _stop_when_budget_exhausted(retry_state) -> bool:
+    """tenacity `stop` condition: charge the upcoming retry to the run's budget."""
+    return not consume_retry_budget(retry_state.upcoming_sleep)
+
+
 def with_retry(retries: int = 3, delay: float = 2.0, backoff: float = 2.0):
     """
     Decorator factory: retry a function up to `retries` times with exponential
-    backoff before raising the final exception.
+    backoff before raising the final exception. Works on sync and async
+    functions (see RetryPolicy). Retries are charged to the current run's
+    RetryBudget; once it is exhausted the error is raised at once.
 
     Args:
         retries: Maximum number of attempts (including the first).
@@ -54,27 +198,21 @@ def with_retry(retries: int = 3, delay: float = 2.0, backoff: float = 2.0):
         def call_api():
             ...
     """
-    def decorator(func: Callable) -> Callable:
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            wait = delay
-            last_exc = None
-            for attempt in range(1, retries + 1):
-                try:
-                    return func(*args, **kwargs)
-                except Exception as exc:
-                    last_exc = exc
-                    logger.warning(
-                        f"[Retry {attempt}/{retries}] {func.__name__} failed: "
-                        f"{type(exc).__name__}: {exc}. "
-                        f"{'Retrying in {:.1f}s...'.format(wait) if attempt < retries else 'No more retries.'}"
-                    )
-                    if attempt < retries:
-                        time.sleep(wait)
-                        wait *= backoff
-            raise last_exc  # Re-raise after exhausting retries
-        return wrapper
-    return decorator
+    def log_failure(retry_state, will_retry: bool):
+        exc = retry_state.outcome.exception()
+        wait = retry_state.upcoming_sleep
+        logger.warning(
+            f"[Retry {retry_state.attempt_number}/{retries}] {retry_state.fn.__name__} failed: "
+            f"{type(exc).__name__}: {exc}. "
+            f"{'Retrying in {:.1f}s...'.format(wait) if will_retry else 'No more retries.'}"
+        )
+
+    return RetryPolicy(
+        max_attempts=retries,
+        wait=wait_exponential(multiplier=delay, exp_base=backoff, max=float("inf")),
+        before_sleep=lambda rs: log_failure(rs, True),
+        after_failure=lambda rs: log_failure(rs, False),
+    )
 
 
 def handle_agent_error(agent_name: str, exc: Exception, fallback_state: dict) -> dict: